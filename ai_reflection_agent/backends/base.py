@@ -1,7 +1,15 @@
 """Base backend adapter interface."""
 
+import asyncio
+import functools
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Iterator
+
+from .streaming import RESPONSE, StreamChunk
+
+
+# Name prefixes of adapter methods that send a request to the backend
+REQUEST_METHOD_PREFIXES = ("generate", "agenerate", "stream", "astream")
 
 
 class BackendAdapter(ABC):
@@ -12,11 +20,40 @@ class BackendAdapter(ABC):
         self.api_key = api_key
         self.config = kwargs
     
+    @property
+    def max_concurrency(self) -> int:
+        """How many requests callers should have in flight at once.
+        
+        Set with the ``max_concurrency`` option; defaults to 4.
+        """
+        return self.config.get("max_concurrency", 4)
+    
     @abstractmethod
     def generate_response(self, prompt: str, **kwargs) -> str:
         """Generate a response from the AI model."""
         pass
     
+    async def agenerate_response(self, prompt: str, **kwargs) -> str:
+        """Generate a response without blocking the event loop.
+        
+        Adapters with a native async client override this; by default the
+        blocking call runs in the loop's thread pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.generate_response, prompt, **kwargs))
+    
+    def stream_response(self, prompt: str, **kwargs) -> Iterator[StreamChunk]:
+        """Generate a response, yielding thinking and response text as it arrives.
+        
+        Adapters that can stream override this; by default the whole
+        response is yielded as one chunk once it is complete.
+        """
+        yield StreamChunk(RESPONSE, self.generate_response(prompt, **kwargs))
+    
+    async def astream_response(self, prompt: str, **kwargs) -> AsyncIterator[StreamChunk]:
+        """Async version of ``stream_response``."""
+        yield StreamChunk(RESPONSE, await self.agenerate_response(prompt, **kwargs))
+    
     @abstractmethod
     def get_model_name(self) -> str:
         """Get the name of the model being used."""
@@ -0,0 +1,309 @@
+"""On-disk cache of backend responses, keyed by request content."""
+
+import asyncio
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from .base import BackendAdapter, REQUEST_METHOD_PREFIXES
+from .streaming import RESPONSE, THINKING, StreamChunk, collect
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed);
+"""
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Adapter attributes that change what a request returns
+_SAMPLING_PARAMS = ("temperature", "max_tokens", "is_thinking_model")
+
+
+class ResponseCache:
+    """Backend responses keyed by request hash, in a small SQLite database.
+
+    Values are stored zlib-compressed as JSON. When the stored values
+    exceed ``max_bytes`` the least recently used ones are evicted; values
+    older than ``ttl`` seconds (if set) count as missing. ``hits`` and
+    ``misses`` count lookups since the cache was opened.
+    """
+
+    def __init__(self, cache_file: Path, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl: Optional[float] = None):
+        """Initialize the cache for the given database path."""
+        self.cache_file = Path(cache_file)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.cache_file, timeout=30, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None (counted as a miss)."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT data, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                with conn:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            with conn:
+                conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def put(self, key: str, value: Any):
+        """Store a JSON-serializable value, evicting old values if the cache is full."""
+        data = zlib.compress(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, data, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                    (key, data, len(data), now, now)
+                )
+                self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired values, then least recently used ones until under ``max_bytes``."""
+        if self.ttl is not None:
+            conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+        excess = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        evict = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            evict.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", evict)
+
+    def clear(self):
+        """Remove every cached value."""
+        with self._lock:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and the number and size of cached values."""
+        with self._lock:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size
+        }
+
+
+class CachingAdapter(BackendAdapter):
+    """Wraps another adapter and answers repeated requests from a ``ResponseCache``.
+
+    Requests are keyed by a hash of the wrapped adapter's type (that of the
+    innermost adapter, through other wrappers) and model, the prompt and the
+    sampling parameters (the adapter's defaults unless overridden per call).
+    Pass ``bypass_cache=True`` to a call to always go to the backend; with
+    ``cache_sampled=False`` requests sampled at a temperature above 0 bypass
+    the cache as well, since their responses are not meant to repeat. Other
+    attributes are the wrapped adapter's, except request methods this class
+    does not cache. Created by the factory as the ``cached`` backend, wrapping the adapter
+    named by ``backend``::
+
+        BackendFactory.create_adapter("cached", backend="lmstudio", model="qwen3",
+                                      cache_file="logs/backend_cache.db")
+    """
+
+    def __init__(self, backend: Optional[str] = None, adapter: Optional[BackendAdapter] = None,
+                 cache_file: Path = Path("backend_cache.db"),
+                 max_bytes: int = DEFAULT_MAX_BYTES, ttl: Optional[float] = None,
+                 cache_sampled: bool = True, **kwargs):
+        """Initialize the cache around ``adapter``, or a new adapter of type ``backend``."""
+        if adapter is None:
+            if backend is None:
+                raise ValueError("CachingAdapter needs a backend type or an adapter to wrap")
+            from .factory import BackendFactory
+            adapter = BackendFactory.create_adapter(backend, **kwargs)
+        super().__init__(adapter.api_key, **adapter.config)
+        self.adapter = adapter
+        self.cache = ResponseCache(cache_file, max_bytes=max_bytes, ttl=ttl)
+        self.cache_sampled = cache_sampled
+        self.bypassed = 0
+
+    def _key(self, method: str, prompt: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Cache key of a request, or None if it bypasses the cache (counted in ``bypassed``)."""
+        bypass = kwargs.pop("bypass_cache", False)
+        params = {name: getattr(self.adapter, name, None) for name in _SAMPLING_PARAMS}
+        params.update(kwargs)
+        temperature = params.get("temperature")
+        if bypass or (not self.cache_sampled and (temperature is None or temperature > 0)):
+            self.bypassed += 1
+            return None
+        material = json.dumps(
+            [type(_innermost(self.adapter)).__name__, self.adapter.get_model_name(), method, prompt, params],
+            sort_keys=True, default=str
+        )
+        return hashlib.blake2b(material.encode('utf-8'), digest_size=16).hexdigest()
+
+    def generate_response(self, prompt: str, **kwargs) -> str:
+        """Generate a response, answering from the cache when possible."""
+        key = self._key("response", prompt, kwargs)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            return cached
+        response = self.adapter.generate_response(prompt, **kwargs)
+        if key:
+            self.cache.put(key, response)
+        return response
+
+    async def agenerate_response(self, prompt: str, **kwargs) -> str:
+        """Async version of ``generate_response``."""
+        key = self._key("response", prompt, kwargs)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            return cached
+        response = await self.adapter.agenerate_response(prompt, **kwargs)
+        if key:
+            self.cache.put(key, response)
+        return response
+
+    def generate_with_thinking(self, prompt: str, **kwargs) -> Dict[str, str]:
+        """Thinking process and final answer, as the wrapped adapter's ``generate_with_thinking``.
+
+        Adapters without thinking support return no thinking.
+        """
+        key = self._key("with_thinking", prompt, kwargs)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            return cached
+        if hasattr(self.adapter, "generate_with_thinking"):
+            result = self.adapter.generate_with_thinking(prompt, **kwargs)
+        else:
+            response = self.adapter.generate_response(prompt, **kwargs)
+            result = {"thinking": "", "response": response, "full_response": response}
+        if key:
+            self.cache.put(key, result)
+        return result
+
+    async def agenerate_with_thinking(self, prompt: str, **kwargs) -> Dict[str, str]:
+        """Async version of ``generate_with_thinking``."""
+        key = self._key("with_thinking", prompt, kwargs)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            return cached
+        if hasattr(self.adapter, "agenerate_with_thinking"):
+            result = await self.adapter.agenerate_with_thinking(prompt, **kwargs)
+        elif hasattr(self.adapter, "generate_with_thinking"):
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                None, functools.partial(self.adapter.generate_with_thinking, prompt, **kwargs)
+            )
+        else:
+            response = await self.adapter.agenerate_response(prompt, **kwargs)
+            result = {"thinking": "", "response": response, "full_response": response}
+        if key:
+            self.cache.put(key, result)
+        return result
+    
+    def stream_response(self, prompt: str, **kwargs) -> Iterator[StreamChunk]:
+        """Stream a response; a cached one is yielded as one thinking and one response chunk.
+
+        A streamed response is only cached once it has been read to the end.
+        """
+        key = self._key("stream", prompt, kwargs)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            yield from _cached_chunks(cached)
+            return
+        chunks = []
+        for chunk in self.adapter.stream_response(prompt, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        if key:
+            self.cache.put(key, collect(chunks))
+
+    async def astream_response(self, prompt: str, **kwargs) -> AsyncIterator[StreamChunk]:
+        """Async version of ``stream_response``."""
+        key = self._key("stream", prompt, kwargs)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            for chunk in _cached_chunks(cached):
+                yield chunk
+            return
+        chunks = []
+        async for chunk in self.adapter.astream_response(prompt, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        if key:
+            self.cache.put(key, collect(chunks))
+
+    @property
+    def max_concurrency(self) -> int:
+        """Concurrent requests of the wrapped adapter."""
+        return self.adapter.max_concurrency
+
+    def get_model_name(self) -> str:
+        """Get the wrapped adapter's model name."""
+        return self.adapter.get_model_name()
+
+    def estimate_tokens(self, text: str) -> int:
+        """Estimate tokens as the wrapped adapter does."""
+        return self.adapter.estimate_tokens(text)
+
+    def test_connection(self) -> Dict[str, Any]:
+        """Test the wrapped adapter's connection (never cached)."""
+        return self.adapter.test_connection()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Cache counters, including requests that bypassed the cache."""
+        return dict(self.cache.stats(), bypassed=self.bypassed)
+
+    def __getattr__(self, name: str):
+        # Everything else (close, get_usage_info, endpoint, ...) is the wrapped
+        # adapter's, but request methods not defined here would bypass the cache
+        if name == "adapter" or name.startswith(REQUEST_METHOD_PREFIXES):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        return getattr(self.adapter, name)
+
+
+def _innermost(adapter: BackendAdapter) -> BackendAdapter:
+    """The adapter that actually talks to the backend, below any wrappers."""
+    while isinstance(getattr(adapter, "adapter", None), BackendAdapter):
+        adapter = adapter.adapter
+    return adapter
+
+
+def _cached_chunks(cached: Dict[str, str]) -> Iterator[StreamChunk]:
+    if cached.get("thinking"):
+        yield StreamChunk(THINKING, cached["thinking"])
+    if cached.get("response"):
+        yield StreamChunk(RESPONSE, cached["response"])
@@ -1,7 +1,7 @@
 """Claude backend adapter using Anthropic's API."""
 
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Iterator
 
 try:
     import anthropic
@@ -10,6 +10,7 @@ except ImportError:
     ANTHROPIC_AVAILABLE = False
 
 from .base import BackendAdapter
+from .streaming import RESPONSE, THINKING, StreamChunk
 
 
 class ClaudeAdapter(BackendAdapter):
@@ -28,6 +29,7 @@ class ClaudeAdapter(BackendAdapter):
         
         self.model = model
         self.client = anthropic.Anthropic(api_key=self.api_key)
+        self._async_client = None
         
         # Default parameters
         self.max_tokens = kwargs.get("max_tokens", 4000)
@@ -36,20 +38,57 @@ class ClaudeAdapter(BackendAdapter):
     def generate_response(self, prompt: str, **kwargs) -> str:
         """Generate a response using Claude."""
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=kwargs.get("max_tokens", self.max_tokens),
-                temperature=kwargs.get("temperature", self.temperature),
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            response = self.client.messages.create(**self._message_params(prompt, **kwargs))
             
             return response.content[0].text
             
         except Exception as e:
             raise RuntimeError(f"Claude API error: {str(e)}")
     
+    def stream_response(self, prompt: str, **kwargs) -> Iterator[StreamChunk]:
+        """Stream a response from Claude; extended thinking is yielded as thinking."""
+        try:
+            with self.client.messages.stream(**self._message_params(prompt, **kwargs)) as stream:
+                for event in stream:
+                    chunk = self._stream_event(event)
+                    if chunk:
+                        yield chunk
+        except Exception as e:
+            raise RuntimeError(f"Claude API error: {str(e)}")
+    
+    async def astream_response(self, prompt: str, **kwargs) -> AsyncIterator[StreamChunk]:
+        """Async version of ``stream_response``."""
+        if self._async_client is None:
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
+        try:
+            async with self._async_client.messages.stream(**self._message_params(prompt, **kwargs)) as stream:
+                async for event in stream:
+                    chunk = self._stream_event(event)
+                    if chunk:
+                        yield chunk
+        except Exception as e:
+            raise RuntimeError(f"Claude API error: {str(e)}")
+    
+    def _message_params(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "max_tokens": kwargs.get("max_tokens", self.max_tokens),
+            "temperature": kwargs.get("temperature", self.temperature),
+            "messages": [
+                {"role": "user", "content": prompt}
+            ]
+        }
+    
+    def _stream_event(self, event) -> Optional[StreamChunk]:
+        """The text delta carried by a raw stream event, if any."""
+        if event.type != "content_block_delta":
+            return None
+        if event.delta.type == "text_delta":
+            return StreamChunk(RESPONSE, event.delta.text)
+        if event.delta.type == "thinking_delta":
+            return StreamChunk(THINKING, event.delta.thinking)
+        return None
+    
     def get_model_name(self) -> str:
         """Get the Claude model name."""
         return self.model
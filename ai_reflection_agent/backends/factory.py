@@ -7,6 +7,8 @@ from .openai_backend import OpenAIAdapter
 from .local import LocalAdapter
 from .mock import MockAdapter
 from .lmstudio import LMStudioAdapter
+from .cache import CachingAdapter
+from .limiter import RateLimitedAdapter
 
 
 class BackendFactory:
@@ -18,6 +20,8 @@ class BackendFactory:
         "local": LocalAdapter,
         "mock": MockAdapter,
         "lmstudio": LMStudioAdapter,
+        "cached": CachingAdapter,
+        "limited": RateLimitedAdapter,
     }
     
     @classmethod
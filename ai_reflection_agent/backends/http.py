@@ -0,0 +1,118 @@
+"""Pooled HTTP clients shared by the adapters for local model servers."""
+
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+class HTTPClient:
+    """JSON requests over keep-alive connection pools, blocking or async.
+
+    Blocking calls share one ``requests.Session``; async calls share one
+    ``aiohttp.ClientSession``, created on first use inside the running event
+    loop. Both keep at most ``pool_size`` connections per host open, so many
+    concurrent generations reuse a few TCP connections instead of opening
+    one per request. Call ``close()`` / ``await aclose()`` when done.
+    """
+
+    def __init__(self, pool_size: int = 10):
+        """Initialize the client; connections are opened on first use."""
+        self.pool_size = pool_size
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._async_session = None
+        self._async_loop = None
+
+    @property
+    def session(self) -> requests.Session:
+        """The pooled session used for blocking requests."""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def post_json(self, url: str, payload: Dict[str, Any], timeout: float) -> Any:
+        """POST a JSON payload and return the decoded JSON response."""
+        response = self.session.post(url, json=payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def get_json(self, url: str, timeout: float) -> Any:
+        """GET a URL and return the decoded JSON response."""
+        response = self.session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def apost_json(self, url: str, payload: Dict[str, Any], timeout: float) -> Any:
+        """POST a JSON payload without blocking the event loop."""
+        session = self._get_async_session()
+        async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def aget_json(self, url: str, timeout: float) -> Any:
+        """GET a URL without blocking the event loop."""
+        session = self._get_async_session()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    def stream_lines(self, url: str, payload: Dict[str, Any], timeout: float) -> Iterator[bytes]:
+        """POST a JSON payload and yield the non-empty lines of the response as they arrive.
+
+        ``timeout`` bounds each wait for data, not the whole stream.
+        """
+        with self.session.post(url, json=payload, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(chunk_size=None):
+                if line:
+                    yield line
+
+    async def astream_lines(self, url: str, payload: Dict[str, Any], timeout: float) -> AsyncIterator[bytes]:
+        """Async version of ``stream_lines``."""
+        session = self._get_async_session()
+        async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=None, sock_read=timeout)) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                line = line.strip()
+                if line:
+                    yield line
+
+    def close(self):
+        """Close the blocking session's connections."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    async def aclose(self):
+        """Close the async session's connections (and the blocking session's)."""
+        if self._async_session is not None:
+            await self._async_session.close()
+            self._async_session = None
+            self._async_loop = None
+        self.close()
+
+    def _get_async_session(self):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp package is required for async requests")
+        # aiohttp sessions are bound to the event loop they were created in
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session.closed or self._async_loop is not loop:
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_size)
+            )
+            self._async_loop = loop
+        return self._async_session
@@ -0,0 +1,295 @@
+"""Client-side rate limiting of backend requests."""
+
+import asyncio
+import functools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .base import BackendAdapter, REQUEST_METHOD_PREFIXES
+from .streaming import StreamChunk
+
+
+class _TokenBucket:
+    """Refills continuously at ``per_minute`` units a minute, holding at most that many."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.stamp = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (0 if they are)."""
+        return max(0.0, (amount - self.level) / self.rate)
+
+
+class RateLimiter:
+    """Requests/minute, tokens/minute and in-flight limits shared by sync and async callers.
+
+    Each limit is optional. Quotas are token buckets refilling continuously,
+    so short bursts up to a minute's quota pass immediately and sustained
+    load is spread evenly. A caller takes a request slot with its prompt
+    tokens up front (``request`` / ``arequest``) and charges the tokens of
+    the response with ``charge`` once they are known, which may push the
+    token bucket below zero and delay later requests. Blocked threads and
+    coroutines wake as soon as quota refills or a slot is released.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 max_in_flight: Optional[int] = None):
+        """Initialize the limiter; a limit of None is not enforced."""
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._requests = _TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def _try_acquire(self, tokens: float) -> Optional[float]:
+        """Take a slot and quota if available (returning 0); else the seconds to wait.
+
+        None means waiting for a slot to be released. Called with the lock held.
+        """
+        now = time.monotonic()
+        if self._paused_until > now:
+            return self._paused_until - now
+        if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+            return None
+        wait = 0.0
+        for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+            if bucket:
+                bucket.refill(now)
+                # A request larger than the whole quota waits for a full bucket
+                wait = max(wait, bucket.wait_time(min(amount, bucket.capacity)))
+        if wait > 0:
+            return wait
+        for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+            if bucket:
+                bucket.level -= amount
+        self.in_flight += 1
+        return 0.0
+
+    def acquire(self, tokens: float = 0):
+        """Block until a request of ``tokens`` prompt tokens may be sent."""
+        with self._cond:
+            while True:
+                wait = self._try_acquire(tokens)
+                if wait == 0:
+                    return
+                self._cond.wait(wait)
+
+    async def aacquire(self, tokens: float = 0):
+        """Wait without blocking the event loop until a request may be sent."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                wait = self._try_acquire(tokens)
+                if wait == 0:
+                    return
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await asyncio.wait({waiter}, timeout=wait)
+            finally:
+                with self._cond:
+                    self._waiters.remove((loop, waiter))
+
+    def release(self):
+        """Give back the slot of a finished request."""
+        with self._cond:
+            self.in_flight -= 1
+            self._wake()
+
+    def charge(self, tokens: float):
+        """Count tokens used beyond those taken up front (e.g. the response's)."""
+        if self._tokens and tokens:
+            with self._cond:
+                self._tokens.level -= tokens
+
+    def backoff(self, seconds: float):
+        """Hold back all requests for ``seconds``, e.g. after the provider rejected one."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    @contextmanager
+    def request(self, tokens: float = 0) -> Iterator[None]:
+        """Hold a request slot for the duration of a ``with`` block."""
+        self.acquire(tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def arequest(self, tokens: float = 0) -> AsyncIterator[None]:
+        """Async version of ``request``."""
+        await self.aacquire(tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _wake(self):
+        self._cond.notify_all()
+        for loop, waiter in self._waiters:
+            loop.call_soon_threadsafe(_resolve, waiter)
+
+
+def _resolve(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Whether an adapter error is the provider rejecting a request for its rate."""
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "rate_limit" in message or "too many requests" in message
+
+
+class RateLimitedAdapter(BackendAdapter):
+    """Wraps another adapter and keeps its requests within a ``RateLimiter``'s limits.
+
+    Prompt tokens are estimated with the wrapped adapter's
+    ``estimate_tokens`` and taken before a request, response tokens are
+    charged after it. ``max_in_flight`` defaults to the wrapped adapter's
+    ``max_concurrency``, and is reported as this adapter's
+    ``max_concurrency`` so batch jobs size their worker pools to it. A
+    request the provider rejects for its rate (HTTP 429) pauses every
+    caller for an exponentially growing delay and is retried up to
+    ``retries`` times; streams are not retried. Other attributes are the
+    wrapped adapter's, except request methods this class does not limit.
+    Created by the factory as the ``limited`` backend::
+
+        BackendFactory.create_adapter("limited", backend="claude",
+                                      requests_per_minute=50, tokens_per_minute=40000)
+    """
+
+    def __init__(self, backend: Optional[str] = None, adapter: Optional[BackendAdapter] = None,
+                 requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 max_in_flight: Optional[int] = None,
+                 retries: int = 3, **kwargs):
+        """Initialize the limiter around ``adapter``, or a new adapter of type ``backend``."""
+        if adapter is None:
+            if backend is None:
+                raise ValueError("RateLimitedAdapter needs a backend type or an adapter to wrap")
+            from .factory import BackendFactory
+            adapter = BackendFactory.create_adapter(backend, **kwargs)
+        super().__init__(adapter.api_key, **adapter.config)
+        self.adapter = adapter
+        self.limiter = RateLimiter(
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            max_in_flight=max_in_flight or adapter.max_concurrency
+        )
+        self.retries = retries
+
+    def _limited(self, prompt: str, call: Callable[[], Any]) -> Any:
+        tokens = self.adapter.estimate_tokens(prompt)
+        for attempt in range(self.retries + 1):
+            with self.limiter.request(tokens):
+                try:
+                    result = call()
+                except Exception as e:
+                    if attempt == self.retries or not _is_rate_limited(e):
+                        raise
+                    self.limiter.backoff(2 ** attempt)
+                    continue
+                self.limiter.charge(self.adapter.estimate_tokens(_text(result)))
+                return result
+
+    async def _alimited(self, prompt: str, call: Callable[[], Any]) -> Any:
+        tokens = self.adapter.estimate_tokens(prompt)
+        for attempt in range(self.retries + 1):
+            async with self.limiter.arequest(tokens):
+                try:
+                    result = await call()
+                except Exception as e:
+                    if attempt == self.retries or not _is_rate_limited(e):
+                        raise
+                    self.limiter.backoff(2 ** attempt)
+                    continue
+                self.limiter.charge(self.adapter.estimate_tokens(_text(result)))
+                return result
+
+    def generate_response(self, prompt: str, **kwargs) -> str:
+        """Generate a response once the limits allow it."""
+        return self._limited(prompt, lambda: self.adapter.generate_response(prompt, **kwargs))
+
+    async def agenerate_response(self, prompt: str, **kwargs) -> str:
+        """Async version of ``generate_response``."""
+        return await self._alimited(prompt, lambda: self.adapter.agenerate_response(prompt, **kwargs))
+
+    def generate_with_thinking(self, prompt: str, **kwargs) -> Dict[str, str]:
+        """Thinking process and final answer, as the wrapped adapter's ``generate_with_thinking``.
+
+        Adapters without thinking support return no thinking.
+        """
+        if not hasattr(self.adapter, "generate_with_thinking"):
+            response = self.generate_response(prompt, **kwargs)
+            return {"thinking": "", "response": response, "full_response": response}
+        return self._limited(prompt, lambda: self.adapter.generate_with_thinking(prompt, **kwargs))
+
+    async def agenerate_with_thinking(self, prompt: str, **kwargs) -> Dict[str, str]:
+        """Async version of ``generate_with_thinking``."""
+        if hasattr(self.adapter, "agenerate_with_thinking"):
+            return await self._alimited(prompt, lambda: self.adapter.agenerate_with_thinking(prompt, **kwargs))
+        if hasattr(self.adapter, "generate_with_thinking"):
+            loop = asyncio.get_running_loop()
+            call = functools.partial(self.adapter.generate_with_thinking, prompt, **kwargs)
+            return await self._alimited(prompt, lambda: loop.run_in_executor(None, call))
+        response = await self.agenerate_response(prompt, **kwargs)
+        return {"thinking": "", "response": response, "full_response": response}
+    
+    def stream_response(self, prompt: str, **kwargs) -> Iterator[StreamChunk]:
+        """Stream a response, holding a request slot until the stream ends."""
+        with self.limiter.request(self.adapter.estimate_tokens(prompt)):
+            for chunk in self.adapter.stream_response(prompt, **kwargs):
+                self.limiter.charge(self.adapter.estimate_tokens(chunk.text))
+                yield chunk
+
+    async def astream_response(self, prompt: str, **kwargs) -> AsyncIterator[StreamChunk]:
+        """Async version of ``stream_response``."""
+        async with self.limiter.arequest(self.adapter.estimate_tokens(prompt)):
+            async for chunk in self.adapter.astream_response(prompt, **kwargs):
+                self.limiter.charge(self.adapter.estimate_tokens(chunk.text))
+                yield chunk
+
+    @property
+    def max_concurrency(self) -> int:
+        """The in-flight limit."""
+        return self.limiter.max_in_flight
+
+    def get_model_name(self) -> str:
+        """Get the wrapped adapter's model name."""
+        return self.adapter.get_model_name()
+
+    def estimate_tokens(self, text: str) -> int:
+        """Estimate tokens as the wrapped adapter does."""
+        return self.adapter.estimate_tokens(text)
+
+    def test_connection(self) -> Dict[str, Any]:
+        """Test the wrapped adapter's connection (not rate limited)."""
+        return self.adapter.test_connection()
+
+    def __getattr__(self, name: str):
+        # Everything else (close, get_usage_info, endpoint, ...) is the wrapped
+        # adapter's, but request methods not defined here would bypass the limits
+        if name == "adapter" or name.startswith(REQUEST_METHOD_PREFIXES):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        return getattr(self.adapter, name)
+
+
+def _text(result: Any) -> str:
+    """Generated text of a ``generate_*`` result."""
+    if isinstance(result, dict):
+        return result.get("full_response") or result.get("response") or ""
+    return result or ""
@@ -1,15 +1,22 @@
 """LM Studio backend adapter with support for thinking models like Qwen3."""
 
-import re
-from typing import Optional, Dict, Any, Tuple
-import requests
 import json
+import re
+from typing import Optional, Dict, Any, Tuple, List, AsyncIterator, Iterator
 
 from .base import BackendAdapter
+from .http import HTTPClient
+from .streaming import RESPONSE, THINKING, StreamChunk, ThinkParser
 
 
 class LMStudioAdapter(BackendAdapter):
-    """Backend adapter for LM Studio with thinking model support."""
+    """Backend adapter for LM Studio with thinking model support.
+    
+    Requests go over a keep-alive connection pool (``pool_size``
+    connections); the ``agenerate_*`` methods are native async versions of
+    the blocking ones. ``stream_response`` / ``astream_response`` yield
+    thinking and response text as the model generates it.
+    """
     
     def __init__(self, endpoint: str = "http://localhost:1234", model: str = "qwen3", **kwargs):
         """Initialize LM Studio adapter."""
@@ -22,44 +29,116 @@ class LMStudioAdapter(BackendAdapter):
         # Default parameters
         self.max_tokens = kwargs.get("max_tokens", 4000)
         self.temperature = kwargs.get("temperature", 0.7)
+        self.http = HTTPClient(pool_size=kwargs.get("pool_size", 10))
         
         print(f"LM Studio adapter initialized: {self.endpoint}")
         print(f"Model: {model} (thinking model: {self.is_thinking_model})")
     
-    def generate_response(self, prompt: str, **kwargs) -> str:
-        """Generate response using LM Studio's OpenAI-compatible API."""
+    def _chat_payload(self, prompt: str, stream: bool = False, **kwargs) -> Dict[str, Any]:
+        """Request body for a single-turn chat completion."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": kwargs.get("max_tokens", self.max_tokens),
+            "temperature": kwargs.get("temperature", self.temperature),
+            "stream": stream
+        }
+    
+    def _complete(self, prompt: str, **kwargs) -> str:
+        """Return the raw completion text for a prompt."""
         try:
-            response = requests.post(
-                f"{self.endpoint}/v1/chat/completions",
-                headers={"Content-Type": "application/json"},
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": kwargs.get("max_tokens", self.max_tokens),
-                    "temperature": kwargs.get("temperature", self.temperature),
-                    "stream": False
-                },
-                timeout=120
+            data = self.http.post_json(
+                f"{self.endpoint}/v1/chat/completions", self._chat_payload(prompt, **kwargs), timeout=120
             )
-            response.raise_for_status()
-            
-            data = response.json()
-            full_response = data["choices"][0]["message"]["content"]
-            
-            # If this is a thinking model, extract both thinking and final response
-            if self.is_thinking_model:
-                thinking, final_response = self._parse_thinking_response(full_response)
-                # Store thinking process in metadata for later analysis
-                if hasattr(self, '_last_thinking'):
-                    self._last_thinking = thinking
-                return final_response
-            else:
-                return full_response
-            
+            return data["choices"][0]["message"]["content"]
+        except Exception as e:
+            raise RuntimeError(f"LM Studio API error: {str(e)}")
+    
+    async def _acomplete(self, prompt: str, **kwargs) -> str:
+        """Async version of ``_complete``."""
+        try:
+            data = await self.http.apost_json(
+                f"{self.endpoint}/v1/chat/completions", self._chat_payload(prompt, **kwargs), timeout=120
+            )
+            return data["choices"][0]["message"]["content"]
+        except Exception as e:
+            raise RuntimeError(f"LM Studio API error: {str(e)}")
+    
+    def stream_response(self, prompt: str, **kwargs) -> Iterator[StreamChunk]:
+        """Stream a completion as thinking and response chunks.
+        
+        For thinking models ``<think>`` blocks are split off as they stream
+        in; reasoning LM Studio sends separately (``reasoning_content``) is
+        thinking as well.
+        """
+        parser = ThinkParser()
+        try:
+            lines = self.http.stream_lines(
+                f"{self.endpoint}/v1/chat/completions", self._chat_payload(prompt, stream=True, **kwargs), timeout=120
+            )
+            for line in lines:
+                yield from self._stream_event(line, parser)
         except Exception as e:
             raise RuntimeError(f"LM Studio API error: {str(e)}")
+        yield from parser.close()
+    
+    async def astream_response(self, prompt: str, **kwargs) -> AsyncIterator[StreamChunk]:
+        """Async version of ``stream_response``."""
+        parser = ThinkParser()
+        try:
+            lines = self.http.astream_lines(
+                f"{self.endpoint}/v1/chat/completions", self._chat_payload(prompt, stream=True, **kwargs), timeout=120
+            )
+            async for line in lines:
+                for chunk in self._stream_event(line, parser):
+                    yield chunk
+        except Exception as e:
+            raise RuntimeError(f"LM Studio API error: {str(e)}")
+        for chunk in parser.close():
+            yield chunk
+    
+    def _stream_event(self, line: bytes, parser: ThinkParser) -> List[StreamChunk]:
+        """Chunks of one server-sent event line of a streamed completion."""
+        data = line[5:].strip()
+        if not line.startswith(b"data:") or data == b"[DONE]":
+            return []
+        event = json.loads(data)
+        if "error" in event:
+            raise RuntimeError(event["error"])
+        if not event.get("choices"):
+            return []
+        delta = event["choices"][0].get("delta") or {}
+        chunks = []
+        if delta.get("reasoning_content"):
+            chunks.append(StreamChunk(THINKING, delta["reasoning_content"]))
+        if delta.get("content"):
+            if self.is_thinking_model:
+                chunks += parser.feed(delta["content"])
+            else:
+                chunks.append(StreamChunk(RESPONSE, delta["content"]))
+        return chunks
+    
+    def generate_response(self, prompt: str, **kwargs) -> str:
+        """Generate response using LM Studio's OpenAI-compatible API."""
+        return self._final_response(self._complete(prompt, **kwargs))
+    
+    async def agenerate_response(self, prompt: str, **kwargs) -> str:
+        """Async version of ``generate_response``."""
+        return self._final_response(await self._acomplete(prompt, **kwargs))
+    
+    def _final_response(self, full_response: str) -> str:
+        """The answer part of a completion."""
+        # If this is a thinking model, extract both thinking and final response
+        if self.is_thinking_model:
+            thinking, final_response = self._parse_thinking_response(full_response)
+            # Store thinking process in metadata for later analysis
+            if hasattr(self, '_last_thinking'):
+                self._last_thinking = thinking
+            return final_response
+        else:
+            return full_response
     
     def _parse_thinking_response(self, response: str) -> Tuple[str, str]:
         """Parse thinking tokens from Qwen3 response."""
@@ -77,42 +156,27 @@ class LMStudioAdapter(BackendAdapter):
     
     def generate_with_thinking(self, prompt: str, **kwargs) -> Dict[str, str]:
         """Generate response and return both thinking process and final answer."""
-        try:
-            response = requests.post(
-                f"{self.endpoint}/v1/chat/completions",
-                headers={"Content-Type": "application/json"},
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": kwargs.get("max_tokens", self.max_tokens),
-                    "temperature": kwargs.get("temperature", self.temperature),
-                    "stream": False
-                },
-                timeout=120
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            full_response = data["choices"][0]["message"]["content"]
-            
-            if self.is_thinking_model:
-                thinking, final_response = self._parse_thinking_response(full_response)
-                return {
-                    "thinking": thinking,
-                    "response": final_response,
-                    "full_response": full_response
-                }
-            else:
-                return {
-                    "thinking": "",
-                    "response": full_response,
-                    "full_response": full_response
-                }
-                
-        except Exception as e:
-            raise RuntimeError(f"LM Studio API error: {str(e)}")
+        return self._split_thinking(self._complete(prompt, **kwargs))
+    
+    async def agenerate_with_thinking(self, prompt: str, **kwargs) -> Dict[str, str]:
+        """Async version of ``generate_with_thinking``."""
+        return self._split_thinking(await self._acomplete(prompt, **kwargs))
+    
+    def _split_thinking(self, full_response: str) -> Dict[str, str]:
+        """Thinking process, final answer and raw text of a completion."""
+        if self.is_thinking_model:
+            thinking, final_response = self._parse_thinking_response(full_response)
+            return {
+                "thinking": thinking,
+                "response": final_response,
+                "full_response": full_response
+            }
+        else:
+            return {
+                "thinking": "",
+                "response": full_response,
+                "full_response": full_response
+            }
     
     def get_model_name(self) -> str:
         """Get the model name."""
@@ -126,10 +190,9 @@ class LMStudioAdapter(BackendAdapter):
         """Test connection to LM Studio."""
         try:
             # Test with a simple prompt
-            response = requests.post(
+            data = self.http.post_json(
                 f"{self.endpoint}/v1/chat/completions",
-                headers={"Content-Type": "application/json"},
-                json={
+                {
                     "model": self.model,
                     "messages": [
                         {"role": "user", "content": "Hello! This is a connection test."}
@@ -139,9 +202,6 @@ class LMStudioAdapter(BackendAdapter):
                 },
                 timeout=30
             )
-            response.raise_for_status()
-            
-            data = response.json()
             test_response = data["choices"][0]["message"]["content"]
             
             return {
@@ -168,4 +228,17 @@ class LMStudioAdapter(BackendAdapter):
             "is_thinking_model": self.is_thinking_model,
             "max_tokens": self.max_tokens,
             "temperature": self.temperature
-        }
\ No newline at end of file
+        }
+    
+    @property
+    def max_concurrency(self) -> int:
+        """Concurrent requests; defaults to the connection pool size."""
+        return self.config.get("max_concurrency", self.http.pool_size)
+    
+    def close(self):
+        """Close pooled connections."""
+        self.http.close()
+    
+    async def aclose(self):
+        """Close pooled connections, including the async session."""
+        await self.http.aclose()
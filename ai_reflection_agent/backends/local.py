@@ -1,15 +1,26 @@
 """Local model backend adapter for running models locally."""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, List, AsyncIterator, Iterator
 import subprocess
 import json
-import requests
 
 from .base import BackendAdapter
+from .http import HTTPClient
+from .streaming import RESPONSE, THINKING, StreamChunk, ThinkParser, collect
 
 
 class LocalAdapter(BackendAdapter):
-    """Backend adapter for local AI models via various interfaces."""
+    """Backend adapter for local AI models via various interfaces.
+    
+    Requests go over a keep-alive connection pool (``pool_size``
+    connections); ``agenerate_response`` is a native async version of
+    ``generate_response``. Ollama responses can be streamed
+    (``stream_response`` / ``astream_response``), with Ollama's separate
+    thinking output yielded as thinking. With ``is_thinking_model``,
+    ``<think>`` blocks are thinking too: split off while streaming and
+    removed from ``generate_response``'s text, so both return the same
+    response.
+    """
     
     def __init__(self, endpoint: str = "http://localhost:11434", model: str = "llama2", **kwargs):
         """Initialize local adapter."""
@@ -18,65 +29,113 @@ class LocalAdapter(BackendAdapter):
         self.endpoint = endpoint
         self.model = model
         self.interface_type = kwargs.get("interface_type", "ollama")  # ollama, text-generation-webui, etc.
+        self.is_thinking_model = kwargs.get("is_thinking_model", False)
         
         # Default parameters
         self.max_tokens = kwargs.get("max_tokens", 4000)
         self.temperature = kwargs.get("temperature", 0.7)
+        self.http = HTTPClient(pool_size=kwargs.get("pool_size", 10))
     
     def generate_response(self, prompt: str, **kwargs) -> str:
         """Generate a response using the local model."""
+        url, payload = self._request(prompt, **kwargs)
+        try:
+            return self._final_response(self._parse_result(self.http.post_json(url, payload, timeout=300)))
+        except Exception as e:
+            raise RuntimeError(f"{self._api_name()} API error: {str(e)}")
+    
+    async def agenerate_response(self, prompt: str, **kwargs) -> str:
+        """Async version of ``generate_response``."""
+        url, payload = self._request(prompt, **kwargs)
+        try:
+            return self._final_response(self._parse_result(await self.http.apost_json(url, payload, timeout=300)))
+        except Exception as e:
+            raise RuntimeError(f"{self._api_name()} API error: {str(e)}")
+    
+    def stream_response(self, prompt: str, **kwargs) -> Iterator[StreamChunk]:
+        """Stream the response of an Ollama model as thinking and response chunks."""
+        if self.interface_type != "ollama":
+            yield from super().stream_response(prompt, **kwargs)
+            return
+        url, payload = self._request(prompt, stream=True, **kwargs)
+        parser = ThinkParser()
+        try:
+            for line in self.http.stream_lines(url, payload, timeout=300):
+                yield from self._stream_event(line, parser)
+        except Exception as e:
+            raise RuntimeError(f"{self._api_name()} API error: {str(e)}")
+        yield from parser.close()
+    
+    async def astream_response(self, prompt: str, **kwargs) -> AsyncIterator[StreamChunk]:
+        """Async version of ``stream_response``."""
+        if self.interface_type != "ollama":
+            async for chunk in super().astream_response(prompt, **kwargs):
+                yield chunk
+            return
+        url, payload = self._request(prompt, stream=True, **kwargs)
+        parser = ThinkParser()
+        try:
+            async for line in self.http.astream_lines(url, payload, timeout=300):
+                for chunk in self._stream_event(line, parser):
+                    yield chunk
+        except Exception as e:
+            raise RuntimeError(f"{self._api_name()} API error: {str(e)}")
+        for chunk in parser.close():
+            yield chunk
+    
+    def _stream_event(self, line: bytes, parser: ThinkParser) -> List[StreamChunk]:
+        """Chunks of one line of Ollama's streamed (newline-delimited JSON) output."""
+        event = json.loads(line)
+        if "error" in event:
+            raise RuntimeError(event["error"])
+        chunks = []
+        if event.get("thinking"):
+            chunks.append(StreamChunk(THINKING, event["thinking"]))
+        if event.get("response"):
+            if self.is_thinking_model:
+                chunks += parser.feed(event["response"])
+            else:
+                chunks.append(StreamChunk(RESPONSE, event["response"]))
+        return chunks
+    
+    def _final_response(self, text: str) -> str:
+        """Generated text without its ``<think>`` blocks if this is a thinking model."""
+        if not self.is_thinking_model:
+            return text
+        parser = ThinkParser()
+        return collect(parser.feed(text) + parser.close())["response"]
+    
+    def _request(self, prompt: str, stream: bool = False, **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """URL and JSON body of a generation request for the configured interface."""
         if self.interface_type == "ollama":
-            return self._generate_ollama(prompt, **kwargs)
+            return f"{self.endpoint}/api/generate", {
+                "model": self.model,
+                "prompt": prompt,
+                "stream": stream,
+                "options": {
+                    "temperature": kwargs.get("temperature", self.temperature),
+                    "num_predict": kwargs.get("max_tokens", self.max_tokens)
+                }
+            }
         elif self.interface_type == "text-generation-webui":
-            return self._generate_textgen_webui(prompt, **kwargs)
+            return f"{self.endpoint}/api/v1/generate", {
+                "prompt": prompt,
+                "max_new_tokens": kwargs.get("max_tokens", self.max_tokens),
+                "temperature": kwargs.get("temperature", self.temperature),
+                "do_sample": True,
+                "stop": ["\\n\\n"]
+            }
         else:
             raise ValueError(f"Unsupported interface type: {self.interface_type}")
     
-    def _generate_ollama(self, prompt: str, **kwargs) -> str:
-        """Generate response using Ollama API."""
-        try:
-            response = requests.post(
-                f"{self.endpoint}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": kwargs.get("temperature", self.temperature),
-                        "num_predict": kwargs.get("max_tokens", self.max_tokens)
-                    }
-                },
-                timeout=300
-            )
-            response.raise_for_status()
-            
-            result = response.json()
+    def _parse_result(self, result: Dict[str, Any]) -> str:
+        """Generated text from a response body of the configured interface."""
+        if self.interface_type == "ollama":
             return result.get("response", "")
-            
-        except Exception as e:
-            raise RuntimeError(f"Ollama API error: {str(e)}")
+        return result.get("results", [{}])[0].get("text", "")
     
-    def _generate_textgen_webui(self, prompt: str, **kwargs) -> str:
-        """Generate response using text-generation-webui API."""
-        try:
-            response = requests.post(
-                f"{self.endpoint}/api/v1/generate",
-                json={
-                    "prompt": prompt,
-                    "max_new_tokens": kwargs.get("max_tokens", self.max_tokens),
-                    "temperature": kwargs.get("temperature", self.temperature),
-                    "do_sample": True,
-                    "stop": ["\\n\\n"]
-                },
-                timeout=300
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            return result.get("results", [{}])[0].get("text", "")
-            
-        except Exception as e:
-            raise RuntimeError(f"Text-generation-webui API error: {str(e)}")
+    def _api_name(self) -> str:
+        return "Ollama" if self.interface_type == "ollama" else "Text-generation-webui"
     
     def get_model_name(self) -> str:
         """Get the local model name."""
@@ -90,9 +149,7 @@ class LocalAdapter(BackendAdapter):
         """Test connection to the local model server."""
         try:
             if self.interface_type == "ollama":
-                response = requests.get(f"{self.endpoint}/api/tags", timeout=10)
-                response.raise_for_status()
-                models = response.json().get("models", [])
+                models = self.http.get_json(f"{self.endpoint}/api/tags", timeout=10).get("models", [])
                 available_models = [m["name"] for m in models]
                 
                 return {
@@ -129,4 +186,17 @@ class LocalAdapter(BackendAdapter):
             "endpoint": self.endpoint,
             "max_tokens": self.max_tokens,
             "temperature": self.temperature
-        }
\ No newline at end of file
+        }
+    
+    @property
+    def max_concurrency(self) -> int:
+        """Concurrent requests; defaults to the connection pool size."""
+        return self.config.get("max_concurrency", self.http.pool_size)
+    
+    def close(self):
+        """Close pooled connections."""
+        self.http.close()
+    
+    async def aclose(self):
+        """Close pooled connections, including the async session."""
+        await self.http.aclose()
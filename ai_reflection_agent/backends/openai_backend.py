@@ -1,7 +1,7 @@
 """OpenAI backend adapter using OpenAI's API."""
 
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Iterator
 
 try:
     import openai
@@ -10,6 +10,7 @@ except ImportError:
     OPENAI_AVAILABLE = False
 
 from .base import BackendAdapter
+from .streaming import RESPONSE, StreamChunk
 
 
 class OpenAIAdapter(BackendAdapter):
@@ -28,6 +29,7 @@ class OpenAIAdapter(BackendAdapter):
         
         self.model = model
         self.client = openai.OpenAI(api_key=self.api_key)
+        self._async_client = None
         
         # Default parameters
         self.max_tokens = kwargs.get("max_tokens", 4000)
@@ -36,20 +38,44 @@ class OpenAIAdapter(BackendAdapter):
     def generate_response(self, prompt: str, **kwargs) -> str:
         """Generate a response using OpenAI."""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                max_tokens=kwargs.get("max_tokens", self.max_tokens),
-                temperature=kwargs.get("temperature", self.temperature),
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            response = self.client.chat.completions.create(**self._completion_params(prompt, **kwargs))
             
             return response.choices[0].message.content
             
         except Exception as e:
             raise RuntimeError(f"OpenAI API error: {str(e)}")
     
+    def stream_response(self, prompt: str, **kwargs) -> Iterator[StreamChunk]:
+        """Stream a response from OpenAI."""
+        try:
+            for event in self.client.chat.completions.create(stream=True, **self._completion_params(prompt, **kwargs)):
+                if event.choices and event.choices[0].delta.content:
+                    yield StreamChunk(RESPONSE, event.choices[0].delta.content)
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API error: {str(e)}")
+    
+    async def astream_response(self, prompt: str, **kwargs) -> AsyncIterator[StreamChunk]:
+        """Async version of ``stream_response``."""
+        if self._async_client is None:
+            self._async_client = openai.AsyncOpenAI(api_key=self.api_key)
+        try:
+            stream = await self._async_client.chat.completions.create(stream=True, **self._completion_params(prompt, **kwargs))
+            async for event in stream:
+                if event.choices and event.choices[0].delta.content:
+                    yield StreamChunk(RESPONSE, event.choices[0].delta.content)
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API error: {str(e)}")
+    
+    def _completion_params(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "max_tokens": kwargs.get("max_tokens", self.max_tokens),
+            "temperature": kwargs.get("temperature", self.temperature),
+            "messages": [
+                {"role": "user", "content": prompt}
+            ]
+        }
+    
     def get_model_name(self) -> str:
         """Get the OpenAI model name."""
         return self.model
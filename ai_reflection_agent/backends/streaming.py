@@ -0,0 +1,93 @@
+"""Streamed generation: text deltas split into thinking and response."""
+
+from typing import Dict, Iterable, List, NamedTuple
+
+THINKING = "thinking"
+RESPONSE = "response"
+
+_OPEN_TAG = "<think>"
+_CLOSE_TAG = "</think>"
+
+
+class StreamChunk(NamedTuple):
+    """A piece of generated text; ``kind`` is ``THINKING`` or ``RESPONSE``."""
+    kind: str
+    text: str
+
+
+class ThinkParser:
+    """Incrementally splits streamed text at ``<think>...</think>`` tags.
+
+    Text is fed in arbitrary deltas, so a tag may arrive split across
+    several of them; a trailing fragment that could be the start of a tag is
+    held back until the next delta (or ``close()``) decides it. The output
+    matches ``LMStudioAdapter._parse_thinking_response`` on complete text:
+    the contents of several thinking blocks are joined with newlines and
+    whitespace before the response is dropped. A block left open when the
+    stream ends (e.g. cut off at ``max_tokens``) counts as thinking.
+    """
+
+    def __init__(self):
+        """Initialize the parser outside of any thinking block."""
+        self._thinking = False
+        self._pending = ""
+        self._seen_thinking = False
+        self._response_started = False
+
+    def feed(self, text: str) -> List[StreamChunk]:
+        """Parse the next delta, returning the chunks it completes."""
+        chunks: List[StreamChunk] = []
+        text = self._pending + text
+        self._pending = ""
+        while text:
+            tag = _CLOSE_TAG if self._thinking else _OPEN_TAG
+            position = text.find(tag)
+            if position < 0:
+                held = _partial_tag(text, tag)
+                self._emit(chunks, text[:len(text) - held])
+                self._pending = text[len(text) - held:]
+                break
+            self._emit(chunks, text[:position])
+            text = text[position + len(tag):]
+            self._thinking = not self._thinking
+            if self._thinking and self._seen_thinking:
+                chunks.append(StreamChunk(THINKING, "\n"))
+        return chunks
+
+    def close(self) -> List[StreamChunk]:
+        """Flush text held back at the end of the stream."""
+        chunks: List[StreamChunk] = []
+        self._emit(chunks, self._pending)
+        self._pending = ""
+        return chunks
+
+    def _emit(self, chunks: List[StreamChunk], text: str):
+        if self._thinking:
+            if text:
+                self._seen_thinking = True
+                chunks.append(StreamChunk(THINKING, text))
+            return
+        if not self._response_started:
+            text = text.lstrip()
+            self._response_started = bool(text)
+        if text:
+            chunks.append(StreamChunk(RESPONSE, text))
+
+
+def _partial_tag(text: str, tag: str) -> int:
+    """Length of the longest suffix of ``text`` that is a proper prefix of ``tag``."""
+    for length in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:length]):
+            return length
+    return 0
+
+
+def collect(chunks: Iterable[StreamChunk]) -> Dict[str, str]:
+    """Join streamed chunks into the ``thinking`` and ``response`` texts."""
+    parts: Dict[str, List[str]] = {THINKING: [], RESPONSE: []}
+    for chunk in chunks:
+        parts[chunk.kind].append(chunk.text)
+    return {
+        "thinking": "".join(parts[THINKING]),
+        "response": "".join(parts[RESPONSE]).rstrip(),
+    }
@@ -9,22 +9,31 @@ from typing import Optional, List
 import click
 
 from .core.logger import ResponseLogger, ExplorationLogger
+from .core.sqlite_logger import SQLiteResponseLogger, SQLiteExplorationLogger, migrate_jsonl_to_sqlite
 from .core.scorer import SelfScorer  
 from .core.reviewer import ResponseReviewer
 from .core.explorer import PromptExplorer
+from .core.export import export_parquet
 from .backends.factory import BackendFactory
+from .backends.cache import CachingAdapter
+from .backends.limiter import RateLimitedAdapter
 
 
 class ReflectionAgent:
     """Main class coordinating all reflection functionality."""
     
-    def __init__(self, log_dir: str = "logs"):
+    def __init__(self, log_dir: str = "logs", storage: str = "jsonl"):
         """Initialize the reflection agent."""
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
+        self.storage = storage
         
-        self.response_logger = ResponseLogger(self.log_dir / "responses.jsonl")
-        self.exploration_logger = ExplorationLogger(self.log_dir / "explorations.jsonl")
+        if storage == "sqlite":
+            self.response_logger = SQLiteResponseLogger(self.log_dir / "reflection.db")
+            self.exploration_logger = SQLiteExplorationLogger(self.log_dir / "reflection.db")
+        else:
+            self.response_logger = ResponseLogger(self.log_dir / "responses.jsonl")
+            self.exploration_logger = ExplorationLogger(self.log_dir / "explorations.jsonl")
         self.scorer = SelfScorer()
         self.reviewer = ResponseReviewer(self.response_logger, self.scorer)
         self.explorer = PromptExplorer(self.response_logger, self.exploration_logger)
@@ -58,12 +67,18 @@ class ReflectionAgent:
 @click.option('--api-key', help='API key for the backend')
 @click.option('--model', help='Model name to use')
 @click.option('--endpoint', help='Endpoint URL for local backends')
+@click.option('--storage', default='jsonl', type=click.Choice(['jsonl', 'sqlite']),
+              help='Log storage format (sqlite uses <log-dir>/reflection.db)')
+@click.option('--cache', is_flag=True, help='Answer repeated backend requests from <log-dir>/backend_cache.db')
+@click.option('--rpm', type=float, help='Limit backend requests per minute')
+@click.option('--tpm', type=float, help='Limit backend tokens (estimated) per minute')
+@click.option('--max-in-flight', type=int, help='Limit concurrent backend requests')
 @click.pass_context
-def cli(ctx, log_dir, backend, api_key, model, endpoint):
+def cli(ctx, log_dir, backend, api_key, model, endpoint, storage, cache, rpm, tpm, max_in_flight):
     """AI Reflection Agent - A tool for AI models to reflect on their responses."""
     ctx.ensure_object(dict)
     
-    agent = ReflectionAgent(log_dir)
+    agent = ReflectionAgent(log_dir, storage)
     
     # Setup backend
     backend_kwargs = {}
@@ -76,6 +91,12 @@ def cli(ctx, log_dir, backend, api_key, model, endpoint):
     
     try:
         agent.setup_backend(backend, **backend_kwargs)
+        # Limits apply to requests that reach the backend, so cache hits are free
+        if rpm or tpm or max_in_flight:
+            agent.backend = RateLimitedAdapter(adapter=agent.backend, requests_per_minute=rpm,
+                                               tokens_per_minute=tpm, max_in_flight=max_in_flight)
+        if cache:
+            agent.backend = CachingAdapter(adapter=agent.backend, cache_file=agent.log_dir / "backend_cache.db")
     except Exception as e:
         click.echo(f"Warning: Failed to setup backend: {e}", err=True)
     
@@ -162,9 +183,12 @@ def show(ctx, entry_id, show_thinking):
 
 
 @cli.command()
-@click.argument('entry_id', required=True)
+@click.argument('entry_ids', nargs=-1)
+@click.option('--batch', is_flag=True, help='Review several entries concurrently (the given IDs, or recent unreviewed ones)')
+@click.option('--jobs', type=int, help='Entries reviewed concurrently in batch mode (default: the backend\'s limit)')
+@click.option('--limit', default=10, help='Recent entries to review in batch mode when no IDs are given')
 @click.pass_context
-def review(ctx, entry_id):
+def review(ctx, entry_ids, batch, jobs, limit):
     """Review an entry (score, reflect, and optionally revise)."""
     agent = ctx.obj['agent']
     
@@ -172,6 +196,14 @@ def review(ctx, entry_id):
         click.echo("Error: No backend configured. Use --backend and --api-key options.", err=True)
         return
     
+    if batch:
+        _batch_review(agent, list(entry_ids), jobs, limit)
+        return
+    if len(entry_ids) != 1:
+        click.echo("Error: Give one entry ID, or use --batch to review several.", err=True)
+        return
+    entry_id = entry_ids[0]
+    
     click.echo(f"Reviewing entry {entry_id}...")
     
     try:
@@ -196,6 +228,37 @@ def review(ctx, entry_id):
         click.echo(f"Error during review: {e}", err=True)
 
 
+def _batch_review(agent, entry_ids, jobs, limit):
+    """Review entries concurrently and report one line per entry."""
+    if not entry_ids:
+        entry_ids = [entry.id for entry in agent.reviewer.get_reviewable_entries(limit, unreflected_only=True)]
+    if not entry_ids:
+        click.echo("No entries to review.")
+        return
+    
+    jobs = jobs or agent.backend.max_concurrency
+    click.echo(f"Reviewing {len(entry_ids)} entries ({jobs} at a time)...")
+    
+    try:
+        results = agent.reviewer.batch_review(entry_ids, agent.backend, jobs=jobs)
+    except Exception as e:
+        click.echo(f"Error during review: {e}", err=True)
+        return
+    
+    for entry_id, result in zip(entry_ids, results["results"]):
+        if "error" in result:
+            click.echo(f"[FAILED] {entry_id}: {result['error']}")
+            continue
+        steps = result["steps"]
+        failed = [step for step in steps if not step.get("success")]
+        completed = ", ".join(step.get("step", "unknown") for step in steps if step.get("success")) or "nothing to do"
+        click.echo(f"[{'FAILED' if failed else 'SUCCESS'}] {entry_id}: {completed}")
+        for step in failed:
+            click.echo(f"  {step.get('step', 'unknown').title()} failed: {step.get('error', 'Unknown error')}")
+    
+    click.echo(f"\nUpdated {results['successful']}/{results['total']} entries")
+
+
 @cli.command()
 @click.argument('entry_id', required=True)
 @click.option('--type', 'exploration_type', default='deepen',
@@ -228,8 +291,9 @@ def explore(ctx, entry_id, exploration_type):
 @cli.command()
 @click.option('--limit', default=5, help='Number of recent entries to auto-explore')
 @click.option('--per-entry', default=2, help='Number of explorations per entry')
+@click.option('--jobs', type=int, help='Explorations generated concurrently (default: the backend\'s limit)')
 @click.pass_context
-def auto_explore(ctx, limit, per_entry):
+def auto_explore(ctx, limit, per_entry, jobs):
     """Automatically explore recent entries."""
     agent = ctx.obj['agent']
     
@@ -240,7 +304,7 @@ def auto_explore(ctx, limit, per_entry):
     click.echo(f"Auto-exploring {limit} recent entries...")
     
     try:
-        result = agent.explorer.explore_recent_entries(agent.backend, limit, per_entry)
+        result = agent.explorer.explore_recent_entries(agent.backend, limit, per_entry, jobs=jobs)
         
         click.echo(f"Processed {result['total_entries']} entries")
         click.echo(f"Generated {result['successful_explorations']}/{result['total_explorations']} explorations")
@@ -302,50 +366,163 @@ def test_backend(ctx):
         click.echo(f"[FAILED] Backend connection failed: {result.get('error', 'Unknown error')}", err=True)
 
 
+@cli.command()
+@click.pass_context
+def compact(ctx):
+    """Fold pending entry updates back into the response log."""
+    agent = ctx.obj['agent']
+    folded = agent.response_logger.compact()
+    click.echo(f"Compacted log: folded updates for {folded} entries")
+
+
+@cli.command()
+@click.pass_context
+def reindex(ctx):
+    """Rebuild the offset and full-text search indexes of the logs."""
+    agent = ctx.obj['agent']
+    
+    if agent.storage != "jsonl":
+        click.echo("Reindexing only applies to JSONL log storage.", err=True)
+        return
+    
+    agent.response_logger.rebuild_index()
+    agent.response_logger.rebuild_search_index()
+    agent.exploration_logger.rebuild_index()
+    click.echo("Rebuilt offset, search and exploration indexes")
+
+
+@cli.command()
+@click.option('--repair', is_flag=True, help='Move damaged lines to the .corrupt sidecar and rewrite their segments')
+@click.pass_context
+def fsck(ctx, repair):
+    """Check the logs for undecodable lines and torn tails."""
+    agent = ctx.obj['agent']
+    
+    if agent.storage != "jsonl":
+        click.echo("Checking only applies to JSONL log storage.", err=True)
+        return
+    
+    damaged = False
+    for logger in (agent.response_logger, agent.exploration_logger):
+        report = logger.fsck(repair=repair)
+        for segment in report["segments"]:
+            problems = []
+            if segment["bad_lines"]:
+                problems.append(f"{len(segment['bad_lines'])} bad lines")
+            if segment["torn_bytes"]:
+                problems.append(f"torn tail of {segment['torn_bytes']} bytes")
+            if segment["checksum_ok"] is False:
+                problems.append("checksum mismatch")
+            if problems:
+                damaged = damaged or not repair
+                action = "repaired" if segment["number"] in report["repaired"] else "found"
+                click.echo(f"{segment['file']}: {', '.join(problems)} ({action})")
+        if report["repaired"]:
+            click.echo(f"Damaged lines moved to {report['quarantine_file']}")
+    
+    if damaged:
+        click.echo("Run with --repair to move damaged lines out of the logs.", err=True)
+        ctx.exit(1)
+    click.echo("Logs OK" if not repair else "Logs checked")
+
+
+@cli.command()
+@click.option('--keep-recent', default=1, help='Number of newest sealed segments to leave uncompressed')
+@click.option('--rotate', is_flag=True, help='Seal the active segments before compressing')
+@click.option('--codec', type=click.Choice(['gzip', 'zstd']),
+              help='Compression codec (default: zstd if installed, else gzip)')
+@click.pass_context
+def archive(ctx, keep_recent, rotate, codec):
+    """Compress sealed log segments."""
+    agent = ctx.obj['agent']
+    
+    if agent.storage != "jsonl":
+        click.echo("Archiving only applies to JSONL log storage.", err=True)
+        return
+    
+    if rotate:
+        agent.response_logger.rotate()
+        agent.exploration_logger.rotate()
+    
+    for name, logger in (("responses", agent.response_logger), ("explorations", agent.exploration_logger)):
+        compressed = logger.compress_segments(keep_recent, codec)
+        click.echo(f"Compressed {len(compressed)} {name} segments")
+
+
+@cli.command()
+@click.option('--format', 'export_format', default='parquet', type=click.Choice(['parquet']),
+              help='Export format')
+@click.option('--output', help='Target dataset directory (default: <log-dir>/exports/responses.parquet)')
+@click.option('--append', is_flag=True, help='Only export entries logged since the previous export')
+@click.pass_context
+def export(ctx, export_format, output, append):
+    """Export the response log to a columnar file for analytics."""
+    agent = ctx.obj['agent']
+    
+    if agent.storage != "jsonl":
+        click.echo("Exporting only applies to JSONL log storage.", err=True)
+        return
+    
+    target = Path(output) if output else agent.log_dir / "exports" / "responses.parquet"
+    try:
+        result = export_parquet(agent.response_logger, target, append=append)
+    except (ImportError, ValueError) as e:
+        click.echo(f"Error: {e}", err=True)
+        return
+    click.echo(f"Exported {result['rows']} entries to {result['path']} ({result['total_rows']} in total)")
+
+
+@cli.command()
+@click.option('--db', 'db_file', help='Target database (default: <log-dir>/reflection.db)')
+@click.pass_context
+def migrate_sqlite(ctx, db_file):
+    """Copy the JSONL response and exploration logs into an SQLite database."""
+    agent = ctx.obj['agent']
+    
+    if agent.storage != "jsonl":
+        click.echo("Error: migration reads JSONL logs; run without --storage sqlite.", err=True)
+        return
+    
+    result = migrate_jsonl_to_sqlite(
+        agent.response_logger,
+        agent.exploration_logger,
+        db_file or agent.log_dir / "reflection.db"
+    )
+    click.echo(f"Migrated {result['entries']} entries and {result['explorations']} explorations to {result['db_file']}")
+    click.echo("Use --storage sqlite to work with the migrated database.")
+
+
 @cli.command()
 @click.pass_context
 def stats(ctx):
     """Show statistics about logged entries."""
     agent = ctx.obj['agent']
     
-    entries = list(agent.response_logger.read_entries())
-    explorations = list(agent.exploration_logger.read_explorations())
+    # Both loggers maintain their statistics incrementally
+    entry_stats = agent.response_logger.get_statistics()
+    exploration_stats = agent.exploration_logger.get_statistics()
     
-    if not entries:
+    if not entry_stats["total_entries"]:
         click.echo("No entries found.")
         return
     
-    # Basic stats
-    total_entries = len(entries)
-    scored_entries = sum(1 for e in entries if e.score is not None)
-    reflected_entries = sum(1 for e in entries if e.reflection is not None)
-    revised_entries = sum(1 for e in entries if e.revision is not None)
-    
-    # Model stats
-    models = {}
-    for entry in entries:
-        models[entry.model_name] = models.get(entry.model_name, 0) + 1
-    
-    click.echo(f"Total entries: {total_entries}")
-    click.echo(f"Scored entries: {scored_entries}")
-    click.echo(f"Reflected entries: {reflected_entries}")
-    click.echo(f"Revised entries: {revised_entries}")
-    click.echo(f"Total explorations: {len(explorations)}")
+    click.echo(f"Total entries: {entry_stats['total_entries']}")
+    click.echo(f"Scored entries: {entry_stats['scored_entries']}")
+    click.echo(f"Reflected entries: {entry_stats['reflected_entries']}")
+    click.echo(f"Revised entries: {entry_stats['revised_entries']}")
+    click.echo(f"Total explorations: {exploration_stats['total_explorations']}")
     
     click.echo("\nModels used:")
-    for model, count in models.items():
+    for model, count in entry_stats["models"].items():
         click.echo(f"  {model}: {count}")
     
     # Average scores
-    if scored_entries > 0:
-        total_clarity = sum(e.score.clarity for e in entries if e.score)
-        total_usefulness = sum(e.score.usefulness for e in entries if e.score)
-        total_alignment = sum(e.score.alignment for e in entries if e.score)
-        
+    if entry_stats["average_scores"]:
+        averages = entry_stats["average_scores"]
         click.echo(f"\nAverage scores:")
-        click.echo(f"  Clarity: {total_clarity / scored_entries:.2f}")
-        click.echo(f"  Usefulness: {total_usefulness / scored_entries:.2f}")
-        click.echo(f"  Alignment: {total_alignment / scored_entries:.2f}")
+        click.echo(f"  Clarity: {averages['clarity']:.2f}")
+        click.echo(f"  Usefulness: {averages['usefulness']:.2f}")
+        click.echo(f"  Alignment: {averages['alignment']:.2f}")
 
 
 def main():
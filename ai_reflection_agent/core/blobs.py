@@ -0,0 +1,150 @@
+"""Content-addressed store for chunks of long entry text."""
+
+import hashlib
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+# A rowid table: chunks are too large for WITHOUT ROWID to store compactly
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+"""
+
+# Chunks end after a line whose hash is a multiple of this (once they are
+# at least _MIN_CHUNK_CHARS long), or at _MAX_CHUNK_CHARS
+_BOUNDARY_DIVISOR = 4
+_MIN_CHUNK_CHARS = 512
+_MAX_CHUNK_CHARS = 16 * 1024
+
+
+def split_text(text: str) -> List[str]:
+    """Split text into content-defined chunks.
+
+    Chunk boundaries fall after lines chosen by their content, not their
+    position, so a passage quoted inside a longer text (e.g. an earlier
+    level's thinking embedded in a recursive prompt) splits into mostly the
+    same chunks as the original and those are stored only once.
+    """
+    chunks = []
+    current: List[str] = []
+    size = 0
+    for line in text.splitlines(keepends=True):
+        current.append(line)
+        size += len(line)
+        if size >= _MAX_CHUNK_CHARS or (
+            size >= _MIN_CHUNK_CHARS and line.strip()
+            and zlib.crc32(line.encode('utf-8')) % _BOUNDARY_DIVISOR == 0
+        ):
+            chunks.append("".join(current))
+            current = []
+            size = 0
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def chunk_hash(chunk: str) -> str:
+    """Content address of a chunk."""
+    return hashlib.blake2b(chunk.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class BlobStore:
+    """Text chunks keyed by their hash, in a small SQLite database next to the log.
+
+    Entries of a log written with ``chunk_text=True`` reference their long
+    text fields as lists of chunk hashes; chunks shared by several entries
+    are stored once, zlib-compressed. Chunks are only ever added, and they
+    are written before the lines that reference them. Recently used chunks
+    are kept in memory.
+    """
+
+    def __init__(self, blob_file: Path, cache_chunks: int = 4096):
+        """Initialize the store for the given sidecar path."""
+        self.blob_file = Path(blob_file)
+        self.cache_chunks = cache_chunks
+        self._conn: Optional[sqlite3.Connection] = None
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def exists(self) -> bool:
+        """Whether any chunks have been stored for this log."""
+        return self.blob_file.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Default rollback journal: the database is a single self-contained
+            # file, so copying it next to the log (backups) is enough
+            self._conn = sqlite3.connect(self.blob_file, timeout=30, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def put(self, chunks: Dict[str, str]):
+        """Store chunks (hash -> text); chunks already stored are skipped."""
+        with self._cache_lock:
+            new = [(h, text) for h, text in chunks.items() if h not in self._cache]
+        if not new:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO chunks (hash, data) VALUES (?, ?)",
+                ((h, zlib.compress(text.encode('utf-8'))) for h, text in new)
+            )
+        self._remember(new)
+
+    def get(self, hashes: Iterable[str]) -> Dict[str, str]:
+        """Return the text of the given chunks.
+
+        Raises ValueError if a chunk is missing (e.g. the ``.blobs`` file was
+        not copied along with the log).
+        """
+        found: Dict[str, str] = {}
+        missing = []
+        with self._cache_lock:
+            for h in hashes:
+                text = self._cache.get(h)
+                if text is None:
+                    missing.append(h)
+                else:
+                    self._cache.move_to_end(h)
+                    found[h] = text
+
+        if missing:
+            if not self.exists():
+                raise ValueError(f"Text chunks missing: {self.blob_file} does not exist")
+            conn = self._connect()
+            rows = []
+            for start in range(0, len(missing), 500):
+                batch = missing[start:start + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                rows += [
+                    (h, zlib.decompress(data).decode('utf-8'))
+                    for h, data in conn.execute(
+                        f"SELECT hash, data FROM chunks WHERE hash IN ({placeholders})", batch
+                    )
+                ]
+            found.update(rows)
+            self._remember(rows)
+            lost = [h for h in missing if h not in found]
+            if lost:
+                raise ValueError(f"Text chunks missing from {self.blob_file}: {', '.join(lost[:3])}")
+        return found
+
+    def join(self, hashes: List[str]) -> str:
+        """Reassemble a text from its chunk hashes."""
+        texts = self.get(hashes)
+        return "".join(texts[h] for h in hashes)
+
+    def _remember(self, items):
+        with self._cache_lock:
+            for h, text in items:
+                self._cache[h] = text
+                self._cache.move_to_end(h)
+            while len(self._cache) > self.cache_chunks:
+                self._cache.popitem(last=False)
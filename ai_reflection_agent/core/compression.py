@@ -0,0 +1,94 @@
+"""Compression codecs for log segments (gzip, and zstd when installed)."""
+
+import gzip
+import io
+from pathlib import Path
+from typing import Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+CODEC_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def default_codec() -> str:
+    """zstd if the ``zstandard`` package is installed, otherwise gzip."""
+    return "zstd" if ZSTD_AVAILABLE else "gzip"
+
+
+def codec_for(path: Path) -> Optional[str]:
+    """Return the codec a file is compressed with (from its suffix), or None."""
+    suffix = Path(path).suffix
+    for codec, codec_suffix in CODEC_SUFFIXES.items():
+        if suffix == codec_suffix:
+            return codec
+    return None
+
+
+def open_file(path: Path, mode: str = 'rb', codec: Optional[str] = None):
+    """Open a possibly compressed file for streaming binary reads or writes.
+
+    The codec is taken from the file suffix unless given. Compressed files
+    only support forward seeks when reading.
+    """
+    codec = codec or codec_for(path)
+    if codec is None:
+        return open(path, mode)
+    if codec == "gzip":
+        return gzip.open(path, mode)
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise ImportError("zstandard package is required for zstd-compressed logs")
+        if 'r' in mode:
+            return io.BufferedReader(_ForwardSeekable(zstandard.open(path, mode)), 1024 * 1024)
+        return zstandard.open(path, mode)
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+class _ForwardSeekable(io.RawIOBase):
+    """Raw stream over a zstd reader that supports forward seeks.
+
+    zstd readers cannot be wrapped in ``io.BufferedReader`` (needed for fast
+    line iteration) because they do not report themselves seekable.
+    """
+
+    def __init__(self, reader):
+        self._reader = reader
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._reader.readinto(buffer)
+        self._position += count
+        return count
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("zstd streams can only seek from the start")
+        if offset < self._position:
+            raise io.UnsupportedOperation("zstd streams cannot seek backwards")
+        while self._position < offset:
+            chunk = self._reader.read(min(offset - self._position, 1024 * 1024))
+            if not chunk:
+                break
+            self._position += len(chunk)
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            self._reader.close()
+        super().close()
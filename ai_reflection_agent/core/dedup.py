@@ -0,0 +1,176 @@
+"""Compact storage of entry text that is derivable from other fields or repeated.
+
+Thinking models return ``<think>...</think>`` followed by the answer, which
+is stored as ``full_response`` next to the parsed ``thinking_process`` and
+``response``, so logs hold every thinking text twice. When ``full_response``
+is exactly those fields joined by short literals, the log stores a recipe
+instead::
+
+    "full_response_recipe": ["<think>", "thinking_process", "</think>\\n\\n", "response", ""]
+
+Even positions are literal text, odd positions name the field whose value
+goes there.
+
+Logs written with ``chunk_text=True`` also move long text fields into a
+content-addressed ``BlobStore`` (see ``blobs``) and keep only chunk hashes
+in the line::
+
+    "text_chunks": {"prompt": ["9f2c...", "41d0...", ...]}
+
+Readers rebuild both, so entries look the same as before; entries stored
+plainly are read unchanged. A value present in the data itself (e.g. merged
+in from a patch) always wins over its stored form.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from . import fastjson
+from .blobs import BlobStore, chunk_hash, split_text
+
+
+RECIPE_KEY = "full_response_recipe"
+CHUNKS_KEY = "text_chunks"
+
+# Text fields moved into the blob store once they reach CHUNK_MIN_CHARS
+CHUNKED_FIELDS = ("prompt", "response", "thinking_process", "full_response", "reflection", "revision")
+CHUNK_MIN_CHARS = 1024
+
+# Fields a recipe may reference, in the order they appear in a full response
+SOURCE_FIELDS = ("thinking_process", "response")
+
+# Fields a recipe is worth using for: referencing them must save more than
+# the recipe's own field names cost
+_MIN_SAVED_CHARS = 64
+
+
+def make_recipe(full_response: Optional[str], data: Dict[str, Any]) -> Optional[List[str]]:
+    """Return a recipe rebuilding ``full_response`` from ``data``, or None.
+
+    None means the full response cannot be derived from the source fields
+    (or too little would be saved) and has to be stored as is.
+    """
+    if not full_response:
+        return None
+
+    recipe: List[str] = []
+    position = 0
+    saved = 0
+    for field in SOURCE_FIELDS:
+        value = data.get(field)
+        if not isinstance(value, str) or not value:
+            continue
+        start = full_response.find(value, position)
+        if start < 0:
+            continue
+        recipe += [full_response[position:start], field]
+        position = start + len(value)
+        saved += len(value)
+    recipe.append(full_response[position:])
+
+    if saved < _MIN_SAVED_CHARS:
+        return None
+    return recipe
+
+
+def rebuild(recipe: List[str], data: Dict[str, Any]) -> str:
+    """Rebuild a full response from its recipe and the entry's fields."""
+    return "".join(
+        (data.get(part) or "") if i % 2 else part
+        for i, part in enumerate(recipe)
+    )
+
+
+def stored_value(data: Dict[str, Any], field: str,
+                 blobs: Optional[BlobStore] = None, default: Any = None) -> Any:
+    """Value of a field of a decoded entry, rebuilt if it is stored compactly.
+
+    Raises ValueError if the field is chunked and no blob store is given.
+    """
+    if field in data:
+        return data[field]
+    refs = (data.get(CHUNKS_KEY) or {}).get(field)
+    if refs is not None:
+        if blobs is None:
+            raise ValueError(f"{field} is stored in a blob store")
+        return blobs.join(refs)
+    if field == "full_response" and RECIPE_KEY in data:
+        recipe = data[RECIPE_KEY]
+        return rebuild(recipe, {name: stored_value(data, name, blobs) for name in recipe[1::2]})
+    return default
+
+
+def is_present(data: Dict[str, Any], field: str) -> bool:
+    """Whether a decoded entry has a non-null value for a field, without rebuilding it."""
+    if field in data:
+        return data[field] is not None
+    return field in (data.get(CHUNKS_KEY) or {}) or (field == "full_response" and RECIPE_KEY in data)
+
+
+def expand(data: Dict[str, Any], blobs: Optional[BlobStore] = None) -> Dict[str, Any]:
+    """Replace chunk references and a recipe in a decoded entry with the full text.
+
+    The dict is modified in place and returned.
+    """
+    for field in data.get(CHUNKS_KEY) or ():
+        if field not in data:
+            data[field] = stored_value(data, field, blobs)
+    if RECIPE_KEY in data and "full_response" not in data:
+        data["full_response"] = stored_value(data, "full_response", blobs)
+    data.pop(CHUNKS_KEY, None)
+    data.pop(RECIPE_KEY, None)
+    return data
+
+
+def dump_entry(entry, chunks: Optional[Dict[str, str]] = None) -> str:
+    """Serialize a ``ResponseEntry`` to JSON, storing text compactly when possible.
+
+    A derivable ``full_response`` is stored as a recipe. If ``chunks`` is
+    given, long text fields are split into chunks referenced by hash and the
+    chunks (hash -> text) are added to it; the caller must store them before
+    writing the line.
+    """
+    exclude = set()
+    extra: Dict[str, Any] = {}
+    recipe = make_recipe(entry.full_response, {field: getattr(entry, field) for field in SOURCE_FIELDS})
+    if recipe is not None:
+        exclude.add("full_response")
+        extra[RECIPE_KEY] = recipe
+
+    if chunks is not None:
+        refs = {}
+        for field in CHUNKED_FIELDS:
+            value = getattr(entry, field)
+            if field in exclude or not isinstance(value, str) or len(value) < CHUNK_MIN_CHARS:
+                continue
+            refs[field] = []
+            for chunk in split_text(value):
+                h = chunk_hash(chunk)
+                chunks[h] = chunk
+                refs[field].append(h)
+        if refs:
+            exclude.update(refs)
+            extra[CHUNKS_KEY] = refs
+
+    if not extra:
+        return entry.model_dump_json()
+
+    # Splice the compact forms into pydantic's (fast) serialization of the other fields
+    data = entry.model_dump_json(exclude=exclude)
+    spliced = ",".join(f'"{key}":{json.dumps(value, ensure_ascii=False)}' for key, value in extra.items())
+    return f'{data[:-1]},{spliced}}}'
+
+
+def project(line: Union[bytes, str], fields: Iterable[str] = (),
+            present: Iterable[str] = (), blobs: Optional[BlobStore] = None) -> Dict[str, Any]:
+    """Like ``fastjson.project``, but for entries stored compactly.
+
+    Only the selected fields are rebuilt; presence flags never need the
+    blob store.
+    """
+    data = fastjson.loads(line)
+    if not isinstance(data, dict):
+        raise json.JSONDecodeError("Expecting object", str(line), 0)
+    result = {key: stored_value(data, key, blobs) for key in fields}
+    result.update((key, is_present(data, key)) for key in present)
+    return result
@@ -1,6 +1,7 @@
 """Exploration mode for generating extended and deepening prompts."""
 
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple
 from .models import ResponseEntry, ExplorationPrompt
 from .logger import ResponseLogger, ExplorationLogger
 
@@ -93,8 +94,29 @@ New Prompt:
         if not entry:
             return {"error": "Entry not found"}
         
+        result, record = self._generate(entry, exploration_type, backend_adapter)
+        if record is None:
+            return result
+        
+        try:
+            # Log the exploration
+            exploration_id = self.exploration_logger.log_exploration(*record)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        return {"success": True, "exploration_id": exploration_id, **result}
+    
+    def _generate(self, entry: ResponseEntry, exploration_type: str,
+                  backend_adapter) -> Tuple[Dict[str, Any], Optional[Tuple[str, str, str]]]:
+        """Generate an exploration prompt without logging it.
+        
+        Returns the result (without ``success`` and ``exploration_id`` if it
+        succeeded) and the exploration to log, or None if it failed.
+        """
         if exploration_type not in self.EXPLORATION_TEMPLATES:
-            return {"error": f"Unknown exploration type: {exploration_type}"}
+            return {"error": f"Unknown exploration type: {exploration_type}"}, None
         
         try:
             template = self.EXPLORATION_TEMPLATES[exploration_type]
@@ -108,52 +130,73 @@ New Prompt:
             # Clean up the generated prompt
             cleaned_prompt = self._clean_generated_prompt(generated_prompt)
             
-            # Log the exploration
-            exploration_id = self.exploration_logger.log_exploration(
-                original_entry_id=entry_id,
-                generated_prompt=cleaned_prompt,
-                context=f"Generated using '{exploration_type}' template"
-            )
-            
-            return {
-                "success": True,
-                "exploration_id": exploration_id,
+            result = {
                 "exploration_type": exploration_type,
                 "generated_prompt": cleaned_prompt,
                 "original_entry": entry
             }
+            return result, (entry.id, cleaned_prompt, f"Generated using '{exploration_type}' template")
         
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
+            }, None
+    
+    def _explore(self, tasks: List[Tuple[ResponseEntry, str]], backend_adapter,
+                 jobs: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Generate explorations for ``(entry, exploration_type)`` pairs concurrently.
+        
+        Up to ``jobs`` generations (by default the backend's
+        ``max_concurrency``) run at a time in worker threads. The
+        explorations are logged together in one batched write at the end;
+        if generation is interrupted, those finished so far are still
+        logged. Returns the results in task order.
+        """
+        results: Dict[int, Tuple[Dict[str, Any], Optional[Tuple[str, str, str]]]] = {}
+        pool = ThreadPoolExecutor(max_workers=max(1, jobs or backend_adapter.max_concurrency))
+        try:
+            futures = {
+                pool.submit(self._generate, entry, exploration_type, backend_adapter): i
+                for i, (entry, exploration_type) in enumerate(tasks)
             }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            logged = sorted(i for i, (_, record) in results.items() if record is not None)
+            exploration_ids = self.exploration_logger.log_explorations([results[i][1] for i in logged])
+            for i, exploration_id in zip(logged, exploration_ids):
+                results[i] = ({"success": True, "exploration_id": exploration_id, **results[i][0]}, None)
+        
+        return [results[i][0] for i in range(len(tasks))]
     
     def generate_multiple_explorations(self, entry_id: str, 
                                      exploration_types: List[str], 
-                                     backend_adapter) -> Dict[str, Any]:
-        """Generate multiple exploration prompts for a single entry."""
-        results = {
+                                     backend_adapter,
+                                     jobs: Optional[int] = None) -> Dict[str, Any]:
+        """Generate multiple exploration prompts for a single entry concurrently (see ``_explore``)."""
+        entry = self.response_logger.get_entry(entry_id)
+        if not entry:
+            explorations = [{"error": "Entry not found"} for _ in exploration_types]
+        else:
+            explorations = self._explore([(entry, t) for t in exploration_types], backend_adapter, jobs)
+        return self._entry_results(entry_id, explorations)
+    
+    def _entry_results(self, entry_id: str, explorations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summary of the explorations generated for one entry."""
+        successful = sum(1 for result in explorations if result.get("success"))
+        return {
             "entry_id": entry_id,
-            "total": len(exploration_types),
-            "successful": 0,
-            "failed": 0,
-            "explorations": []
+            "total": len(explorations),
+            "successful": successful,
+            "failed": len(explorations) - successful,
+            "explorations": explorations
         }
-        
-        for exploration_type in exploration_types:
-            result = self.generate_exploration_prompt(entry_id, exploration_type, backend_adapter)
-            results["explorations"].append(result)
-            
-            if result.get("success"):
-                results["successful"] += 1
-            else:
-                results["failed"] += 1
-        
-        return results
     
     def auto_explore_entry(self, entry_id: str, backend_adapter, 
-                          max_explorations: int = 3) -> Dict[str, Any]:
+                          max_explorations: int = 3,
+                          jobs: Optional[int] = None) -> Dict[str, Any]:
         """Automatically generate multiple types of exploration prompts."""
         entry = self.response_logger.get_entry(entry_id)
         if not entry:
@@ -162,42 +205,64 @@ New Prompt:
         # Select exploration types based on response characteristics
         selected_types = self._select_exploration_types(entry, max_explorations)
         
-        return self.generate_multiple_explorations(entry_id, selected_types, backend_adapter)
+        return self._entry_results(
+            entry_id, self._explore([(entry, t) for t in selected_types], backend_adapter, jobs)
+        )
+    
+    def explore_entries(self, entry_ids: List[str], backend_adapter,
+                        explorations_per_entry: int = 2,
+                        jobs: Optional[int] = None) -> Dict[str, Any]:
+        """Automatically explore the given entries.
+        
+        The entries are fetched together and all their explorations are
+        generated concurrently (see ``_explore``).
+        """
+        entries = self.response_logger.get_entries(entry_ids)
+        return self._explore_entries([entries.get(entry_id) for entry_id in entry_ids], entry_ids,
+                                     backend_adapter, explorations_per_entry, jobs)
     
     def explore_recent_entries(self, backend_adapter, 
                              limit: int = 5, 
-                             explorations_per_entry: int = 2) -> Dict[str, Any]:
-        """Explore recent entries automatically."""
+                             explorations_per_entry: int = 2,
+                             jobs: Optional[int] = None) -> Dict[str, Any]:
+        """Explore recent entries automatically (concurrently, see ``explore_entries``)."""
         recent_entries = self.response_logger.get_recent_entries(limit)
+        return self._explore_entries(recent_entries, [entry.id for entry in recent_entries],
+                                     backend_adapter, explorations_per_entry, jobs)
+    
+    def _explore_entries(self, entries: List[Optional[ResponseEntry]], entry_ids: List[str],
+                         backend_adapter, explorations_per_entry: int,
+                         jobs: Optional[int]) -> Dict[str, Any]:
+        """Explore entries (None where an entry was not found) in one concurrent batch."""
+        tasks = []
+        spans = []
+        for entry in entries:
+            types = self._select_exploration_types(entry, explorations_per_entry) if entry else []
+            spans.append((len(tasks), len(tasks) + len(types)))
+            tasks += [(entry, t) for t in types]
+        explorations = self._explore(tasks, backend_adapter, jobs)
         
         results = {
-            "total_entries": len(recent_entries),
+            "total_entries": len(entries),
             "total_explorations": 0,
             "successful_explorations": 0,
             "entry_results": []
         }
         
-        for entry in recent_entries:
-            entry_result = self.auto_explore_entry(
-                entry.id, 
-                backend_adapter, 
-                max_explorations=explorations_per_entry
-            )
+        for entry, entry_id, (start, end) in zip(entries, entry_ids, spans):
+            if entry is None:
+                results["entry_results"].append({"error": "Entry not found"})
+                continue
+            entry_result = self._entry_results(entry_id, explorations[start:end])
             results["entry_results"].append(entry_result)
-            
-            if "explorations" in entry_result:
-                results["total_explorations"] += len(entry_result["explorations"])
-                results["successful_explorations"] += entry_result.get("successful", 0)
+            results["total_explorations"] += entry_result["total"]
+            results["successful_explorations"] += entry_result["successful"]
         
         return results
     
     def get_explorations_for_entry(self, entry_id: str) -> List[ExplorationPrompt]:
-        """Get all exploration prompts generated for a specific entry."""
-        explorations = []
-        for exploration in self.exploration_logger.read_explorations():
-            if exploration.original_entry_id == entry_id:
-                explorations.append(exploration)
-        
+        """Get all exploration prompts generated for a specific entry, newest first."""
+        explorations = self.exploration_logger.get_explorations(entry_id)
         return sorted(explorations, key=lambda x: x.timestamp, reverse=True)
     
     def search_explorations(self, query: str) -> List[ExplorationPrompt]:
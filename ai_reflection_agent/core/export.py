@@ -0,0 +1,153 @@
+"""Columnar export of response logs to Parquet for analytics (requires pyarrow)."""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+SCORE_FIELDS = ("clarity", "usefulness", "alignment", "creativity")
+TEXT_FIELDS = ("prompt", "response", "thinking_process", "full_response", "reflection", "revision")
+
+# Records which entries the part files of a dataset hold; readers skip files
+# starting with "_"
+STATE_FILE = "_export_state.json"
+
+
+def schema() -> "pa.Schema":
+    """Arrow schema of exported entries.
+
+    Scores are flattened into ``score_<name>`` columns, ``metadata["type"]``
+    is lifted into ``experiment_type`` and the rest of the metadata is kept
+    as a JSON string. Model names and experiment types are dictionary-encoded
+    (categoricals in pandas).
+    """
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("id", pa.string()),
+        ("timestamp", pa.timestamp("us")),
+        ("model_name", category),
+        ("experiment_type", category),
+        ("tokens_used", pa.int64()),
+        *[(f"score_{name}", pa.float64()) for name in SCORE_FIELDS],
+        *[(name, pa.string()) for name in TEXT_FIELDS],
+        ("metadata", pa.string()),
+    ])
+
+
+def to_row(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a decoded entry into a row of the export schema."""
+    score = data.get("score") or {}
+    metadata = data.get("metadata") or {}
+    experiment_type = metadata.get("type")
+    return {
+        "id": data.get("id"),
+        "timestamp": _parse_timestamp(data.get("timestamp")),
+        "model_name": data.get("model_name"),
+        "experiment_type": None if experiment_type is None else str(experiment_type),
+        "tokens_used": data.get("tokens_used"),
+        **{f"score_{name}": score.get(name) for name in SCORE_FIELDS},
+        **{name: data.get(name) for name in TEXT_FIELDS},
+        "metadata": json.dumps(metadata, ensure_ascii=False, default=str) if metadata else None,
+    }
+
+
+def export_parquet(logger, target: Path, append: bool = False,
+                   batch_size: int = 10000) -> Dict[str, Any]:
+    """Export a ``ResponseLogger``'s entries to a Parquet dataset directory.
+
+    Entries are streamed in batches of ``batch_size`` rows, each written as a
+    zstd-compressed row group, so memory use does not grow with the log.
+    Every export writes one ``part-NNNNN.parquet`` file; the directory loads
+    as a single table (``pandas.read_parquet(target)``).
+
+    With ``append=True`` only entries logged since the previous export are
+    written, as a new part file. Rows already exported are not updated, so
+    scores or reflections added to them later need a full export, which
+    replaces the dataset. Returns the dataset path and row counts.
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow package is required for Parquet export")
+
+    target = Path(target)
+    target.mkdir(parents=True, exist_ok=True)
+    state_file = target / STATE_FILE
+    state = _load_state(state_file) if append else {}
+    parts: List[str] = state.get("parts", [])
+
+    # Part files not listed in the state are left over from an interrupted
+    # export (or belong to the dataset being replaced)
+    for path in target.glob("part-*.parquet"):
+        if path.name not in parts:
+            path.unlink()
+
+    last_id = state.get("last_id")
+    try:
+        records = logger.read_records(after=last_id) if last_id else logger.read_records()
+        first = next(records, None)
+    except KeyError:
+        raise ValueError(
+            f"Entry {last_id} exported last is no longer in the log; run a full export"
+        ) from None
+
+    rows = 0
+    table_schema = schema()
+    if first is not None:
+        name = f"part-{len(parts):05d}.parquet"
+        tmp_file = target / f".{name}.tmp"
+        with pq.ParquetWriter(tmp_file, table_schema, compression="zstd") as writer:
+            for batch in _batches(_prepend(first, records), batch_size):
+                writer.write_table(pa.Table.from_pylist([to_row(data) for data in batch], schema=table_schema))
+                rows += len(batch)
+                last_id = batch[-1].get("id")
+        os.replace(tmp_file, target / name)
+        parts = parts + [name]
+
+    state = {"parts": parts, "rows": state.get("rows", 0) + rows, "last_id": last_id}
+    tmp_state = state_file.with_name(state_file.name + ".tmp")
+    with open(tmp_state, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_state, state_file)
+
+    return {"path": str(target), "rows": rows, "total_rows": state["rows"]}
+
+
+def _load_state(state_file: Path) -> Dict[str, Any]:
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if not isinstance(value, str):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _prepend(first, rest: Iterator) -> Iterator:
+    yield first
+    yield from rest
+
+
+def _batches(items: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
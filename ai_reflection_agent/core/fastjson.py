@@ -0,0 +1,38 @@
+"""JSON decoding with an optional orjson fast path."""
+
+import json
+from typing import Any, Dict, Iterable, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document, using orjson when it is installed.
+
+    orjson's decode errors subclass ``json.JSONDecodeError``, so callers can
+    keep catching the standard exception.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def project(line: Union[bytes, str], fields: Iterable[str] = (),
+            present: Iterable[str] = ()) -> Dict[str, Any]:
+    """Decode a JSON object and keep only selected top-level keys.
+
+    Values of ``fields`` are kept (None if the key is missing); keys in
+    ``present`` map to whether the value is non-null. The rest of the
+    decoded object is dropped immediately, so callers that hold many
+    projected records only keep the small fields alive.
+    """
+    data = loads(line)
+    if not isinstance(data, dict):
+        raise json.JSONDecodeError("Expecting object", str(line), 0)
+    result = {key: data.get(key) for key in fields}
+    result.update((key, data.get(key) is not None) for key in present)
+    return result
@@ -0,0 +1,370 @@
+"""Sidecar indexes for JSONL log files."""
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import fastjson
+from .segments import Ranges, SegmentedLog
+
+
+# Lines written by the loggers start with a plain ID and timestamp, which can
+# be read without decoding the line
+_LEADING_ID = re.compile(rb'\{"id":"([^"\\]*)"')
+_LEADING_TIMESTAMP = re.compile(rb'\{"id":"[^"\\]*","timestamp":"([^"\\]*)"')
+
+
+class OffsetIndex:
+    """Persistent map from entry ID to the segment, byte offset and length of its log line.
+
+    The index lives next to the log file as an append-only text file with one
+    ``id<TAB>segment<TAB>offset<TAB>length`` record per line. Later records for
+    the same ID win, so re-indexing never requires rewriting the index in
+    place. A record with an empty ID is a watermark that sets how far the
+    segment has been indexed (e.g. past blank or unparseable lines, or after
+    the segment was rewritten).
+
+    Lines are keyed by their entry ID unless another ``key`` function is
+    given; lines it returns None for are not indexed.
+    """
+
+    def __init__(self, index_file: Path, key: Optional[Callable[[bytes], Optional[str]]] = None):
+        """Initialize the index for the given sidecar path."""
+        self.index_file = Path(index_file)
+        self.key = key or _line_id
+        self._offsets: Dict[str, Tuple[int, int, int]] = {}
+        self._covered: Dict[int, int] = {}
+        self._loaded_bytes = 0
+        self._loaded_inode: Optional[int] = None
+
+    def covered(self, segment: int) -> int:
+        """Byte position in a segment up to which every line has been indexed."""
+        return self._covered.get(segment, 0)
+
+    def load(self):
+        """Read any index records appended since the last load."""
+        if not self.index_file.exists():
+            return
+
+        stat = self.index_file.stat()
+        size = stat.st_size
+        if size < self._loaded_bytes or stat.st_ino != self._loaded_inode:
+            # Index was rebuilt by someone else; start over
+            self._clear()
+            self._loaded_bytes = 0
+            self._loaded_inode = stat.st_ino
+        if size == self._loaded_bytes:
+            return
+
+        with open(self.index_file, 'rb') as f:
+            f.seek(self._loaded_bytes)
+            data = f.read()
+
+        # Only consume complete records
+        end = data.rfind(b'\n') + 1
+        for record in data[:end].splitlines():
+            try:
+                key, segment, offset, length = record.decode('utf-8').split('\t')
+                self._store(key, int(segment), int(offset), int(length))
+            except ValueError:
+                continue
+        self._loaded_bytes += end
+
+    def lookup(self, key: str) -> Optional[Tuple[int, int, int]]:
+        """Return ``(segment, offset, length)`` for a key, or None if it is not indexed."""
+        return self._offsets.get(key)
+
+    def keys(self) -> Iterable[str]:
+        """All indexed keys."""
+        return self._offsets.keys()
+
+    def add(self, key: str, segment: int, offset: int, length: int):
+        """Record the location of a newly appended log line."""
+        self._append([(key, segment, offset, length)])
+    
+    def extend(self, records: Iterable[Tuple[str, int, int, int]]):
+        """Record the locations of several appended lines in one write."""
+        self._append(list(records))
+
+    def sync(self, log: SegmentedLog):
+        """Bring the index up to date with the active segment of a log.
+
+        Lines appended without going through the index are picked up from the
+        last covered position; an active segment that shrank is taken as
+        rewritten and re-indexed from the start. Sealed segments never grow,
+        so they are only indexed on ``rebuild`` or ``reindex``.
+        """
+        self.load()
+        if not self.index_file.exists() and log.sealed_segments():
+            self.rebuild(log)
+            return
+
+        segment = log.active_number
+        size = log.log_file.stat().st_size if log.log_file.exists() else 0
+        covered = self.covered(segment)
+
+        if size < covered:
+            self.reindex(log, segment)
+        elif size > covered:
+            records, end = self._scan(log, segment, covered)
+            if end > covered:
+                self._append(records + [("", segment, end, 0)])
+
+    def reindex(self, log: SegmentedLog, segment: int):
+        """Re-index a single segment after it has been rewritten."""
+        records, end = self._scan(log, segment, 0)
+        # The leading watermark resets the segment, so locations in the old
+        # version of it are dropped (see ``GroupIndex``)
+        self._append([("", segment, 0, 0)] + records + [("", segment, end, 0)])
+
+    def rebuild(self, log: SegmentedLog):
+        """Discard the index and rebuild it by scanning every segment."""
+        records = []
+        for segment in log.segment_numbers():
+            segment_records, end = self._scan(log, segment, 0)
+            records += segment_records + [("", segment, end, 0)]
+
+        tmp_file = self.index_file.with_name(self.index_file.name + ".tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(self._encode(records))
+        tmp_file.replace(self.index_file)
+
+        self._clear()
+        for record in records:
+            self._store(*record)
+        stat = self.index_file.stat()
+        self._loaded_bytes = stat.st_size
+        self._loaded_inode = stat.st_ino
+
+    def _append(self, records):
+        if not records:
+            return
+        self.load()
+        with open(self.index_file, 'ab') as f:
+            f.write(self._encode(records))
+            self._loaded_bytes = f.tell()
+            self._loaded_inode = os.fstat(f.fileno()).st_ino
+        for record in records:
+            self._store(*record)
+
+    def _clear(self):
+        self._offsets.clear()
+        self._covered.clear()
+
+    def _store(self, key: str, segment: int, offset: int, length: int):
+        if key:
+            self._offsets[key] = (segment, offset, length)
+            self._covered[segment] = max(self._covered.get(segment, 0), offset + length)
+        else:
+            self._covered[segment] = offset
+
+    @staticmethod
+    def _encode(records) -> bytes:
+        return ''.join(
+            f"{key}\t{segment}\t{offset}\t{length}\n" for key, segment, offset, length in records
+        ).encode('utf-8')
+
+    def _scan(self, log: SegmentedLog, segment: int, start: int) -> Tuple[List[Tuple[str, int, int, int]], int]:
+        """Index every complete line of a segment from ``start``; return records and end position."""
+        records = []
+        offset = start
+        if not log.path_for(segment).exists():
+            return records, offset
+
+        with log.open_segment(segment) as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Torn final line; index it once it is complete
+                if line.strip():
+                    key = self.key(line)
+                    if key:
+                        records.append((key, segment, offset, len(line)))
+                offset += len(line)
+
+        return records, offset
+
+
+class GroupIndex(OffsetIndex):
+    """Persistent map from a key to the locations of every log line with that key.
+
+    Used where many lines share a key, e.g. explorations by the entry they
+    explore. The sidecar format and its maintenance are those of
+    ``OffsetIndex``; a watermark that moves a segment's coverage back (the
+    segment was rewritten) drops the locations in it past that point.
+    """
+
+    def __init__(self, index_file: Path, key: Callable[[bytes], Optional[str]]):
+        """Initialize the index for the given sidecar path and key function."""
+        self._groups: Dict[str, Dict[Tuple[int, int], int]] = {}
+        super().__init__(index_file, key)
+
+    def lookup(self, key: str) -> List[Tuple[int, int, int]]:
+        """Return ``(segment, offset, length)`` of every line with a key, in log order."""
+        locations = self._groups.get(key) or {}
+        return [(segment, offset, length) for (segment, offset), length in sorted(locations.items())]
+
+    def keys(self) -> Iterable[str]:
+        """All indexed keys."""
+        return self._groups.keys()
+
+    def _clear(self):
+        super()._clear()
+        self._groups.clear()
+
+    def _store(self, key: str, segment: int, offset: int, length: int):
+        if key:
+            self._groups.setdefault(key, {})[(segment, offset)] = length
+            self._covered[segment] = max(self._covered.get(segment, 0), offset + length)
+            return
+        if offset < self.covered(segment):
+            for locations in self._groups.values():
+                for location in [l for l in locations if l[0] == segment and l[1] >= offset]:
+                    del locations[location]
+        self._covered[segment] = offset
+
+
+class TimeIndex:
+    """Sparse index of entry timestamps over blocks of log lines.
+
+    Every segment is split into blocks of ``block_entries`` lines, and the
+    sidecar (a JSON file, like the statistics cache) keeps each block's byte
+    range and its smallest and largest timestamp. ``ranges`` turns a time
+    window into the byte ranges of the blocks that may hold entries inside
+    it, so date-bounded reads only decode those. Entries are appended in
+    roughly time order, so a window maps to a few adjacent blocks, but
+    nothing relies on that. The index is caught up on use: lines after the
+    last complete block of the active segment are always read, and a
+    segment whose file was rewritten (see ``SegmentedLog.generation``) or
+    that shrank is indexed again.
+    """
+
+    def __init__(self, log: SegmentedLog, index_file: Path, block_entries: int = 1000):
+        """Initialize the index for a log and its sidecar path."""
+        self.log = log
+        self.index_file = Path(index_file)
+        self.block_entries = block_entries
+
+    def ranges(self, since: Optional[str] = None, until: Optional[str] = None) -> Ranges:
+        """Byte ranges per segment that may hold entries with ``since <= timestamp <= until``.
+
+        Timestamps are compared as ISO strings, so bounds may be prefixes
+        such as ``"2025-06-01"``; an entry without a timestamp counts as
+        ``""``. Either bound may be None.
+        """
+        cached = self._load().get("segments", {})
+        segments = {}
+        ranges: Ranges = {}
+        for number in self.log.segment_numbers():
+            path = self.log.path_for(number)
+            if not path.exists():
+                continue
+            generation = self.log.generation(number)
+            size = self.log.segment_size(number)
+            record = cached.get(str(number))
+            if record is None or record.get("generation") != generation or record["position"] > size:
+                record = {"generation": generation, "position": 0, "blocks": []}
+            if record["position"] < size:
+                record = self._index(number, record, sealed=number != self.log.active_number)
+            segments[str(number)] = record
+
+            spans: List[Tuple[int, Optional[int]]] = []
+            blocks = [
+                (start, end) for start, end, low, high in record["blocks"]
+                if not (since is not None and high < since) and not (until is not None and low > until)
+            ]
+            if record["position"] < size:
+                blocks.append((record["position"], None))  # Not yet in a complete block
+            for start, end in blocks:
+                if spans and spans[-1][1] == start:
+                    spans[-1] = (spans[-1][0], end)
+                else:
+                    spans.append((start, end))
+            if spans:
+                ranges[number] = spans
+
+        if segments != cached:
+            self._save({"segments": segments})
+        return ranges
+
+    def clear(self):
+        """Drop the index so the next call rebuilds it."""
+        self.index_file.unlink(missing_ok=True)
+
+    def _index(self, number: int, record: Dict[str, Any], sealed: bool) -> Dict[str, Any]:
+        """Add the complete blocks of lines appended to a segment since ``record``.
+
+        The final partial block of a sealed segment is added as well, since
+        the segment cannot grow.
+        """
+        blocks = list(record["blocks"])
+        position = start = end = record["position"]
+        low = high = None
+        count = 0
+        for offset, line in self.log.iter_segment(number, position):
+            end = offset + len(line)
+            if line.strip():
+                timestamp = _line_timestamp(line) or ""
+                low = timestamp if low is None or timestamp < low else low
+                high = timestamp if high is None or timestamp > high else high
+                count += 1
+            if count >= self.block_entries:
+                blocks.append([start, end, low, high])
+                start = position = end
+                low = high = None
+                count = 0
+        if sealed:
+            if count:
+                blocks.append([start, end, low, high])
+            position = end
+        return {"generation": record["generation"], "position": position, "blocks": blocks}
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.index_file.exists():
+            return {}
+        try:
+            with open(self.index_file, 'rb') as f:
+                return fastjson.loads(f.read())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, index: Dict[str, Any]):
+        # Saved without the log lock, so concurrent savers need their own temp files
+        tmp_file = self.index_file.with_name(
+            f"{self.index_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        tmp_file.replace(self.index_file)
+
+
+def _line_timestamp(line: bytes) -> Optional[str]:
+    """Timestamp string of a log line, or None if it has none."""
+    match = _LEADING_TIMESTAMP.match(line)
+    if match:
+        try:
+            return match.group(1).decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+    try:
+        timestamp = fastjson.loads(line).get('timestamp')
+    except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+        return None
+    return timestamp if isinstance(timestamp, str) else None
+
+
+def _line_id(line: bytes) -> Optional[str]:
+    """ID of the entry on a log line, or None if the line has none."""
+    match = _LEADING_ID.match(line)
+    if match:
+        try:
+            return match.group(1).decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+    try:
+        return fastjson.loads(line).get('id')
+    except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+        return None
@@ -0,0 +1,74 @@
+"""Advisory file locking for logs shared between processes."""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to locking between threads only
+    fcntl = None
+
+
+class LogLock:
+    """Exclusive, reentrant lock on a ``.lock`` file next to a log.
+
+    Writers (the CLI, the WebUI, experiment scripts) hold it only while
+    appending to or rewriting the log and its sidecars, never while waiting
+    for a model, so many processes can log in parallel without losing or
+    interleaving lines. The lock is reentrant within a thread, and all
+    loggers of the same log in one process share it (see ``log_lock``).
+    Where ``fcntl`` is not available it only excludes other threads.
+    """
+
+    def __init__(self, lock_file: Path):
+        """Initialize the lock for the given lock file path."""
+        self.lock_file = Path(lock_file)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            if self._depth == 0 and fcntl is not None:
+                fcntl.flock(self._file_descriptor(), fcntl.LOCK_EX)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._depth -= 1
+        try:
+            if self._depth == 0 and fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            self._thread_lock.release()
+
+    def _file_descriptor(self) -> int:
+        # A forked child shares the parent's open file description and thus
+        # its flock; it needs a descriptor of its own
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._fd
+
+
+_locks: Dict[str, LogLock] = {}
+_locks_guard = threading.Lock()
+
+
+def log_lock(log_file: Path) -> LogLock:
+    """Return the process-wide lock for a log file (``<log>.lock``)."""
+    log_file = Path(log_file)
+    lock_file = log_file.with_name(log_file.name + ".lock")
+    key = os.path.abspath(lock_file)
+    with _locks_guard:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = LogLock(lock_file)
+        return lock
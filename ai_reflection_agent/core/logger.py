@@ -1,21 +1,80 @@
 """JSONL logging system for AI responses."""
 
+import heapq
 import json
+import os
+import re
+import time
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Iterator
+from typing import Any, Dict, Iterable, List, Optional, Iterator, Sequence, Tuple
 from datetime import datetime
 
-from .models import ResponseEntry, ExplorationPrompt
+from .models import ResponseEntry, ExplorationPrompt, LazyResponseEntry
+from . import dedup, fastjson, prefilter
+from .index import GroupIndex, OffsetIndex, TimeIndex
+from .patches import PatchLog
+from .segments import SegmentedLog, DEFAULT_MAX_SEGMENT_BYTES
+from .search_index import SearchIndex, SEARCHABLE_FIELDS, trigram_supported
+from .stats import StatsCache, Counts, add_counts
+from .locking import log_lock
+from .blobs import BlobStore
+
+
+SCORE_FIELDS = ("clarity", "usefulness", "alignment")
+
+# Fields decoded (and flags) needed to count an entry for ``get_statistics``
+_STATS_FIELDS = ["model_name", "score"]
+_STATS_PRESENT = ["reflection", "revision"]
+
+# Exploration lines start with their own ID and timestamp, followed by the entry they explore
+_LEADING_ORIGINAL_ID = re.compile(
+    rb'\{"id":"[^"\\]*","timestamp":"[^"\\]*","original_entry_id":"([^"\\]*)"'
+)
 
 
 class ResponseLogger:
-    """Handles logging of AI responses to JSONL files."""
+    """Handles logging of AI responses to segmented JSONL files."""
     
-    def __init__(self, log_file: str = "ai_responses.jsonl"):
-        """Initialize the logger with a log file path."""
+    def __init__(self, log_file: str = "ai_responses.jsonl",
+                 max_segment_bytes: Optional[int] = DEFAULT_MAX_SEGMENT_BYTES,
+                 rotate_interval: Optional[float] = None,
+                 fsync: bool = False,
+                 compression: Optional[str] = None,
+                 chunk_text: bool = False):
+        """Initialize the logger with a log file path and rotation policy.
+        
+        With ``fsync=True`` every write (or buffered group of writes) is
+        flushed to disk before ``log_response``/``flush`` returns. With
+        ``compression`` (``"gzip"`` or ``"zstd"``) segments are compressed as
+        soon as they are sealed. With ``chunk_text=True`` long text fields are
+        written to the ``.blobs`` chunk store and only referenced from the
+        log, so text repeated across entries is stored once. Entries written
+        either way are always readable.
+        """
         self.log_file = Path(log_file)
+        self.fsync = fsync
+        self.chunk_text = chunk_text
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self.segments = SegmentedLog(self.log_file, max_segment_bytes, rotate_interval, compression)
+        self.index = OffsetIndex(self.log_file.with_name(self.log_file.name + ".idx"))
+        self.patches = PatchLog(self.log_file.with_name(self.log_file.name + ".patches"))
+        self.search_index = SearchIndex(self.log_file.with_name(self.log_file.name + ".search"))
+        self.blobs = BlobStore(self.log_file.with_name(self.log_file.name + ".blobs"))
+        self.time_index = TimeIndex(self.segments, self.log_file.with_name(self.log_file.name + ".times"))
+        # Held while writing to the log or its sidecars, shared with other processes
+        self.lock = log_lock(self.log_file)
+        self.stats = StatsCache(
+            self.segments, self.log_file.with_name(self.log_file.name + ".stats"),
+            _entry_counts, _STATS_FIELDS, _STATS_PRESENT, project=dedup.project
+        )
+        # Set while inside ``buffered()``
+        self._pending: Optional[List[Tuple[ResponseEntry, bytes]]] = None
+        self._pending_chunks: Dict[str, str] = {}
+        self._pending_bytes = 0
+        self._pending_since = 0.0
+        self._buffer_limits: Dict[str, Any] = {}
     
     def log_response(self, 
                     prompt: str, 
@@ -37,107 +96,808 @@ class ResponseLogger:
             metadata=metadata or {}
         )
         
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(entry.model_dump_json() + '\n')
+        if self._pending is None:
+            chunks: Dict[str, str] = {}
+            self._write_entries([(entry, self._encode(entry, chunks))], chunks)
+            return entry.id
+        
+        line = self._encode(entry, self._pending_chunks)
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append((entry, line))
+        self._pending_bytes += len(line)
+        limits = self._buffer_limits
+        if (len(self._pending) >= limits["max_entries"]
+                or self._pending_bytes >= limits["max_bytes"]
+                or time.monotonic() - self._pending_since >= limits["max_delay"]):
+            self.flush()
         
         return entry.id
     
+    @contextmanager
+    def buffered(self, max_entries: int = 1000, max_bytes: int = 1024 * 1024,
+                 max_delay: float = 1.0):
+        """Buffer ``log_response`` calls and write them in groups.
+        
+        Inside the block, entries are kept in memory and appended with a
+        single write (plus one index and search-index update) once
+        ``max_entries`` or ``max_bytes`` is reached, when an entry is logged
+        more than ``max_delay`` seconds after the oldest buffered one, and on
+        exit. Reads and updates through this logger flush first, so logged
+        entries are always visible to it; other processes see them once
+        flushed. Nested blocks share the outer buffer.
+        """
+        if self._pending is not None:
+            yield self
+            return
+        
+        self._pending = []
+        self._pending_bytes = 0
+        self._buffer_limits = {"max_entries": max_entries, "max_bytes": max_bytes, "max_delay": max_delay}
+        try:
+            yield self
+        finally:
+            try:
+                self.flush()
+            finally:
+                self._pending = None
+    
+    def flush(self):
+        """Write any buffered entries to the log."""
+        if self._pending:
+            pending, self._pending = self._pending, []
+            chunks, self._pending_chunks = self._pending_chunks, {}
+            self._pending_bytes = 0
+            self._write_entries(pending, chunks)
+    
+    def _encode(self, entry: ResponseEntry, chunks: Dict[str, str]) -> bytes:
+        """Encode an entry as a log line, collecting its text chunks if enabled."""
+        return (dedup.dump_entry(entry, chunks if self.chunk_text else None) + '\n').encode('utf-8')
+    
+    def _write_entries(self, pending: List[Tuple[ResponseEntry, bytes]],
+                       chunks: Optional[Dict[str, str]] = None):
+        """Append encoded entries in one write and index them."""
+        with self.lock:
+            if chunks:
+                # Chunks first, so every line written references stored text
+                self.blobs.put(chunks)
+            # A crash mid-append can leave a torn final line; drop it so the new
+            # lines do not get glued onto it
+            self.segments.repair_tail()
+            self.index.sync(self.segments)
+            # New logs get a search index from the start; existing ones opt in via rebuild
+            index_search = self.search_index.exists() or self._is_empty()
+            if index_search:
+                self._sync_search_index()
+            
+            self.segments.maybe_rotate()
+            with open(self.log_file, 'ab') as f:
+                offset = f.tell()
+                f.write(b''.join(line for _, line in pending))
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            segment = self.segments.active_number
+            
+            records = []
+            for entry, line in pending:
+                records.append((entry.id, segment, offset, len(line)))
+                offset += len(line)
+            self.index.extend(records)
+            
+            if index_search:
+                self.search_index.add([self._searchable(entry) for entry, _ in pending], segment, offset)
+    
     def update_entry(self, entry_id: str, **updates) -> bool:
-        """Update an existing entry with new data."""
-        entries = list(self.read_entries())
-        updated = False
-        
-        for i, entry in enumerate(entries):
-            if entry.id == entry_id:
-                for key, value in updates.items():
-                    if hasattr(entry, key):
-                        setattr(entry, key, value)
-                entries[i] = entry
-                updated = True
-                break
-        
-        if updated:
-            self._rewrite_log(entries)
-        
-        return updated
-    
-    def read_entries(self) -> Iterator[ResponseEntry]:
-        """Read all entries from the log file."""
-        if not self.log_file.exists():
+        """Update an existing entry by appending a patch record.
+        
+        The log itself is left untouched; patches are merged into entries on
+        read and folded back into the log by ``compact()``.
+        """
+        return bool(self.update_entries({entry_id: updates}))
+    
+    def update_entries(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """Update several entries (ID -> field updates) in one batched write.
+        
+        All patch records are appended with a single write under the log
+        lock. Returns the number of entries found; unknown IDs are skipped.
+        """
+        found = 0
+        patches = {}
+        for entry_id, fields in updates.items():
+            entry = self.get_entry(entry_id)
+            if not entry:
+                continue
+            found += 1
+            fields = {key: value for key, value in fields.items() if hasattr(entry, key)}
+            if not fields:
+                continue
+            
+            updated = entry.model_copy(update=fields)
+            include = set(fields)
+            if include & set(dedup.SOURCE_FIELDS):
+                # A full_response stored as a recipe would otherwise be rebuilt from the new values
+                include.add("full_response")
+            patches[entry_id] = updated.model_dump(mode='json', include=include)
+        
+        if patches:
+            with self.lock:
+                self.patches.extend(patches)
+                if self.search_index.exists():
+                    self.search_index.add([dict(patch, id=entry_id) for entry_id, patch in patches.items()])
+        return found
+    
+    def read_entries(self, segments: Optional[Iterable[int]] = None,
+                     lazy: bool = False,
+                     fields: Optional[Iterable[str]] = None,
+                     present: Optional[Iterable[str]] = None,
+                     match: Sequence[Optional[prefilter.Prefilter]] = (),
+                     since: Optional[str] = None,
+                     until: Optional[str] = None) -> Iterator[ResponseEntry]:
+        """Read all entries (or those in the given segments), oldest first.
+        
+        With ``lazy=True`` a ``LazyResponseEntry`` is yielded instead, which
+        only converts the fields that are accessed; this is much faster for
+        bulk scans. Pass it to ``validate_entry`` to validate on demand.
+        
+        With ``fields`` and/or ``present``, plain dicts holding only the ``id``
+        and those keys are yielded instead (see ``read_records``); nothing is
+        validated and the other fields, typically the large text ones, are
+        dropped as soon as the line is decoded.
+        
+        ``match`` is a list of prefilters (see ``prefilter``) a line must all
+        match to be decoded; the other lines are skipped in the raw,
+        memory-mapped segment. Entries with pending patches always pass.
+        Prefilters may let through lines that do not match, so callers still
+        check the entries.
+        
+        ``since`` and ``until`` (ISO timestamp strings or prefixes such as
+        ``"2025-06-01"``) restrict the scan to the blocks of the ``.times``
+        index that may hold entries in that window; like ``match`` this only
+        narrows the scan, so callers still check the timestamps.
+        """
+        self.flush()
+        if fields is not None or present is not None:
+            lines = (line for _, _, line in self._scan(match, segments, since, until))
+            yield from self._project_lines(lines, fields, present)
             return
         
-        with open(self.log_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        data = json.loads(line)
-                        yield ResponseEntry(**data)
-                    except (json.JSONDecodeError, ValueError) as e:
-                        print(f"Error parsing line: {e}")
-                        continue
+        patches = self.patches.load()
+        for _, _, line in self._scan(match, segments, since, until):
+            entry = self._decode_line(line, patches, lazy)
+            if entry is not None:
+                yield entry
+    
+    def _scan(self, match: Sequence[Optional[prefilter.Prefilter]],
+              segments: Optional[Iterable[int]] = None,
+              since: Optional[str] = None,
+              until: Optional[str] = None) -> Iterator[Tuple[int, int, bytes]]:
+        """Log lines matching every prefilter within a time window; patched entries always pass.
+        
+        A patch can make any entry match, so patched entries are read via the
+        offset index and merged into the scan in log order.
+        """
+        prefilters = [p for p in match if p is not None]
+        ranges = None
+        if since is not None or until is not None:
+            ranges = self.time_index.ranges(since, until)
+        lines = self.segments.scan(prefilters, segments, ranges)
+        if not prefilters and ranges is None:
+            return lines
+        patched = self._patched_lines(segments)
+        return _merge_lines(lines, patched) if patched else lines
+    
+    def _patched_lines(self, segments: Optional[Iterable[int]] = None) -> List[Tuple[int, int, bytes]]:
+        """``(segment, offset, line)`` of entries with pending patches, in log order."""
+        patches = self.patches.load()
+        if not patches:
+            return []
+        self._sync_index()
+        wanted = None if segments is None else set(segments)
+        locations = sorted(
+            location for location in (self.index.lookup(entry_id) for entry_id in patches)
+            if location is not None and (wanted is None or location[0] in wanted)
+        )
+        return [(segment, offset, self.segments.read_at(segment, offset, length))
+                for segment, offset, length in locations]
+    
+    @staticmethod
+    def validate_entry(entry) -> ResponseEntry:
+        """Fully validate an entry produced by a lazy read."""
+        return entry.validate() if isinstance(entry, LazyResponseEntry) else entry
+    
+    def _decode_line(self, line: bytes, patches: Dict[str, dict],
+                     lazy: bool = False) -> Optional[ResponseEntry]:
+        """Decode a log line into an entry with pending patches merged in."""
+        if not line.strip():
+            return None
+        try:
+            data = fastjson.loads(line)
+            if data.get("id") in patches:
+                data.update(patches[data["id"]])
+            if lazy:
+                return LazyResponseEntry(data, self.blobs)
+            return ResponseEntry(**dedup.expand(data, self.blobs))
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"Error parsing line: {e}")
+            return None
     
     def get_entry(self, entry_id: str) -> Optional[ResponseEntry]:
-        """Get a specific entry by ID."""
-        for entry in self.read_entries():
-            if entry.id == entry_id:
+        """Get a specific entry by ID using the offset index."""
+        self.flush()
+        self._sync_index()
+        entry = self._read_indexed(entry_id)
+        if entry is None and self.index.lookup(entry_id) is not None:
+            # Another process may have just rewritten the segment; catch up first
+            self._sync_index()
+            entry = self._read_indexed(entry_id)
+        if entry is None and self.index.lookup(entry_id) is not None:
+            # Stale index (e.g. log edited by hand): find the line directly
+            # and re-index only the segment it is in
+            entry = self._scan_entry(entry_id)
+        return entry
+    
+    def _scan_entry(self, entry_id: str) -> Optional[ResponseEntry]:
+        """Find an entry by scanning the log for its ID and fix its index record."""
+        patches = self.patches.load()
+        for segment, _, line in self.segments.scan([prefilter.ids([entry_id])]):
+            entry = self._decode_line(line, patches)
+            if entry is not None and entry.id == entry_id:
+                with self.lock:
+                    self.index.reindex(self.segments, segment)
                 return entry
+        # Gone from the log; rebuild so the stale record is dropped
+        self.rebuild_index()
         return None
     
+    def rebuild_index(self):
+        """Rebuild the offset index from all log segments."""
+        self.flush()
+        with self.lock:
+            self.index.rebuild(self.segments)
+    
+    def _sync_index(self):
+        """Catch the offset index up with the log."""
+        with self.lock:
+            self.index.sync(self.segments)
+    
+    def get_entries(self, entry_ids: Iterable[str]) -> Dict[str, ResponseEntry]:
+        """Get several entries by ID, reading each log segment once.
+        
+        Returns the entries found, keyed by ID in the order requested.
+        Entries whose indexed location turns out to be stale are looked up
+        with ``get_entry``.
+        """
+        self.flush()
+        self._sync_index()
+        located = [(entry_id, self.index.lookup(entry_id)) for entry_id in dict.fromkeys(entry_ids)]
+        located = [(entry_id, location) for entry_id, location in located if location is not None]
+        try:
+            lines = self.segments.read_many([location for _, location in located])
+        except (KeyError, OSError):
+            lines = [b""] * len(located)
+        
+        entries = {}
+        for (entry_id, _), line in zip(located, lines):
+            entry = self._decode_indexed(entry_id, line) or self.get_entry(entry_id)
+            if entry is not None:
+                entries[entry_id] = entry
+        return entries
+    
+    def _read_indexed(self, entry_id: str) -> Optional[ResponseEntry]:
+        """Read the entry at the indexed location, if it is still valid."""
+        location = self.index.lookup(entry_id)
+        if location is None:
+            return None
+        
+        try:
+            line = self.segments.read_at(*location)
+        except (KeyError, OSError):
+            return None
+        return self._decode_indexed(entry_id, line)
+    
+    def _decode_indexed(self, entry_id: str, line: bytes) -> Optional[ResponseEntry]:
+        """Decode the line at an entry's indexed location; None if it holds another entry."""
+        try:
+            entry = ResponseEntry(**dedup.expand(self.patches.apply(fastjson.loads(line)), self.blobs))
+        except (KeyError, json.JSONDecodeError, UnicodeDecodeError, ValueError):
+            return None
+        return entry if entry.id == entry_id else None
+    
     def get_recent_entries(self, limit: int = 10) -> List[ResponseEntry]:
-        """Get the most recent entries."""
-        entries = list(self.read_entries())
-        return sorted(entries, key=lambda x: x.timestamp, reverse=True)[:limit]
+        """Get the most recent entries, newest first.
+        
+        The log is append-ordered, so it is read backwards from the end of the
+        newest segment and reading stops after ``limit`` valid entries.
+        """
+        self.flush()
+        entries: List[ResponseEntry] = []
+        if limit <= 0:
+            return entries
+        
+        patches = self.patches.load()
+        for _, _, line in self.segments.iter_lines_reversed():
+            entry = self._decode_line(line, patches)
+            if entry is not None:
+                entries.append(entry)
+                if len(entries) >= limit:
+                    break
+        return entries
     
     def search_entries(self, query: str, field: str = "prompt") -> List[ResponseEntry]:
-        """Search entries by text in a specific field."""
+        """Search entries by text in a specific field.
+        
+        Uses the inverted index when the log has one and the field is
+        indexed; otherwise the log is scanned, skipping lines that cannot
+        contain the query before decoding them.
+        """
+        entry_ids = self.find_entry_ids(query, [field])
+        if entry_ids is None:
+            entries: Iterable[ResponseEntry] = self.read_entries(lazy=True, match=[prefilter.text(query)])
+        else:
+            entries = (LazyResponseEntry(data) for data in self.read_records(entry_ids))
+        
         results = []
-        for entry in self.read_entries():
-            if hasattr(entry, field):
-                field_value = getattr(entry, field)
-                if field_value and query.lower() in field_value.lower():
-                    results.append(entry)
+        for entry in entries:
+            field_value = getattr(entry, field, None)
+            if isinstance(field_value, str) and query.lower() in field_value.lower():
+                # Only matches pay for full validation
+                results.append(self.validate_entry(entry))
         return results
     
-    def _rewrite_log(self, entries: List[ResponseEntry]):
-        """Rewrite the entire log file with updated entries."""
-        with open(self.log_file, 'w', encoding='utf-8') as f:
-            for entry in entries:
-                f.write(entry.model_dump_json() + '\n')
+    def find_entry_ids(self, query: str, fields: Iterable[str]) -> Optional[List[str]]:
+        """Return candidate IDs for a text query from the search index.
+        
+        Candidates may not all match exactly and must be verified. Returns
+        None if the log has no search index or the query cannot use it.
+        """
+        self.flush()
+        if not self.search_index.exists():
+            return None
+        
+        with self.lock:
+            self._sync_search_index()
+        return self.search_index.candidates(query, fields)
+    
+    def read_records(self, entry_ids: Optional[Iterable[str]] = None,
+                     fields: Optional[Iterable[str]] = None,
+                     present: Optional[Iterable[str]] = None,
+                     match: Sequence[Optional[prefilter.Prefilter]] = (),
+                     after: Optional[str] = None,
+                     since: Optional[str] = None,
+                     until: Optional[str] = None) -> Iterator[dict]:
+        """Read raw entry dicts (with patches merged) in log order.
+        
+        With ``entry_ids``, only those entries are read via the offset index.
+        With ``fields``, only the ``id`` and those keys are kept; each key in
+        ``present`` maps to whether the entry has a non-null value for it.
+        ``match``, ``since`` and ``until`` narrow a scan of the whole log as
+        in ``read_entries``. With ``after``, only entries logged after the one with that ID are
+        read (KeyError if it is not in the log), e.g. to resume an export.
+        """
+        self.flush()
+        if after is not None:
+            lines = (line for _, _, line in self._lines_after(after))
+        elif entry_ids is None:
+            lines = (line for _, _, line in self._scan(match, since=since, until=until))
+        else:
+            self._sync_index()
+            locations = sorted(filter(None, (self.index.lookup(i) for i in entry_ids)))
+            lines = (self.segments.read_at(*location) for location in locations)
+        
+        if fields is not None or present is not None:
+            yield from self._project_lines(lines, fields, present)
+            return
+        
+        patches = self.patches.load()
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                data = fastjson.loads(line)
+                if data.get("id") in patches:
+                    data.update(patches[data["id"]])
+                data = dedup.expand(data, self.blobs)
+            except (json.JSONDecodeError, UnicodeDecodeError, ValueError) as e:
+                print(f"Error parsing line: {e}")
+                continue
+            yield data
+    
+    def _lines_after(self, entry_id: str) -> Iterator[Tuple[int, int, bytes]]:
+        """Log lines following an entry's line, in log order."""
+        self._sync_index()
+        location = self.index.lookup(entry_id)
+        if location is None:
+            raise KeyError(entry_id)
+        segment, offset, length = location
+        for number in self.segments.segment_numbers():
+            if number >= segment:
+                start = offset + length if number == segment else 0
+                for line_offset, line in self.segments.iter_segment(number, start):
+                    yield number, line_offset, line
+    
+    def _project_lines(self, lines: Iterable[bytes], fields: Optional[Iterable[str]],
+                       present: Optional[Iterable[str]]) -> Iterator[dict]:
+        """Decode lines keeping only the selected keys, with patches merged."""
+        fields = {"id", *(fields or ())}
+        present = set(present or ()) - fields
+        patches = self.patches.load()
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                data = dedup.project(line, fields, present, self.blobs)
+            except (json.JSONDecodeError, UnicodeDecodeError, ValueError):
+                continue
+            patch = patches.get(data.get("id"))
+            if patch:
+                _apply_projected(data, patch, fields, present)
+            yield data
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Aggregate statistics over all entries, with pending patches applied.
+        
+        Counts are kept per segment in the ``.stats`` sidecar and only the
+        lines appended since the last call are read. Pending patches are
+        accounted for by re-counting just the patched entries, which is
+        cached until the patch log changes.
+        """
+        self.flush()
+        patch_file = self.patches.patch_file
+        if patch_file.exists():
+            st = patch_file.stat()
+            patch_key = [st.st_ino, st.st_size, st.st_mtime_ns]
+        else:
+            patch_key = None
+        return _summarize(self.stats.totals(self._patch_counts, patch_key))
+    
+    def _patch_counts(self) -> Counts:
+        """Difference pending patches make to the counts of the log lines."""
+        delta: Counts = {}
+        patches = self.patches.load()
+        if not patches:
+            return delta
+        
+        self._sync_index()
+        fields = {"id", *_STATS_FIELDS}
+        present = set(_STATS_PRESENT)
+        for entry_id, patch in patches.items():
+            location = self.index.lookup(entry_id)
+            if location is None:
+                continue
+            try:
+                base = dedup.project(self.segments.read_at(*location), fields, present)
+            except (KeyError, OSError, json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if base["id"] != entry_id:
+                continue
+            patched = _apply_projected(dict(base), patch, fields, present)
+            add_counts(delta, _entry_counts(base), -1)
+            add_counts(delta, _entry_counts(patched))
+        return delta
+    
+    def rebuild_search_index(self):
+        """Build (or rebuild) the search index over all segments."""
+        self.flush()
+        with self.lock:
+            self._rebuild_search_index()
+    
+    def _rebuild_search_index(self):
+        self.search_index.clear()
+        for number in self.segments.segment_numbers():
+            self._index_segment(number, 0)
+        patches = self.patches.load()
+        self.search_index.add(dict(fields, id=entry_id) for entry_id, fields in patches.items())
+    
+    def _sync_search_index(self):
+        """Index entries appended since the search index was last updated.
+        
+        An index written in an older format is rebuilt instead.
+        """
+        if not self.search_index.current():
+            if trigram_supported():
+                self._rebuild_search_index()
+            return
+        for number in self.segments.segment_numbers():
+            covered = self.search_index.covered(number)
+            size = self.segments.segment_size(number)
+            if covered != size:
+                self._index_segment(number, covered if covered < size else 0)
+    
+    def _index_segment(self, number: int, start: int, batch_size: int = 1000):
+        """Add entries of a segment from ``start`` to the search index."""
+        batch = []
+        position = start
+        for offset, line in self.segments.iter_segment(number, start):
+            position = offset + len(line)
+            try:
+                batch.append(dedup.expand(fastjson.loads(line), self.blobs))
+            except (json.JSONDecodeError, UnicodeDecodeError, ValueError):
+                continue
+            if len(batch) >= batch_size:
+                self.search_index.add(batch, number, position)
+                batch = []
+        self.search_index.add(batch, number, position)
+    
+    def _is_empty(self) -> bool:
+        """Whether nothing has been logged yet."""
+        return not self.segments.sealed_segments() and self.segments.segment_size(self.segments.active_number) == 0
+    
+    @staticmethod
+    def _searchable(entry: ResponseEntry) -> dict:
+        return entry.model_dump(include={"id", *SEARCHABLE_FIELDS})
+    
+    def compact(self, segments: Optional[Iterable[int]] = None) -> int:
+        """Fold pending patch records into the segments holding the patched entries.
+        
+        Only segments that contain patched entries are rewritten; pass
+        ``segments`` to restrict compaction further. Returns the number of
+        patched entries that were folded in.
+        """
+        self.flush()
+        with self.lock:
+            self.index.sync(self.segments)
+            by_segment: Dict[int, List[str]] = {}
+            for entry_id in list(self.patches.load()):
+                location = self.index.lookup(entry_id)
+                if location is not None:
+                    by_segment.setdefault(location[0], []).append(entry_id)
+            
+            if segments is not None:
+                wanted = set(segments)
+                by_segment = {k: v for k, v in by_segment.items() if k in wanted}
+            
+            folded = []
+            for number, entry_ids in sorted(by_segment.items()):
+                self._rewrite_segment(number)
+                folded.extend(entry_ids)
+            
+            self.patches.discard(folded)
+            return len(folded)
+    
+    def rotate(self) -> Optional[int]:
+        """Seal the active segment now; return its number."""
+        self.flush()
+        with self.lock:
+            self.index.sync(self.segments)
+            return self.segments.rotate()
+    
+    def compress_segments(self, keep_recent: int = 1, codec: Optional[str] = None) -> List[int]:
+        """Compress sealed segments except the ``keep_recent`` newest ones."""
+        with self.lock:
+            return self.segments.compress_sealed(keep_recent, codec)
+    
+    def fsck(self, repair: bool = False) -> Dict[str, Any]:
+        """Check the log for undecodable lines and torn tails (see ``SegmentedLog.fsck``).
+        
+        With ``repair``, damaged lines are moved to the ``.corrupt`` sidecar
+        and the rewritten segments are re-indexed.
+        """
+        self.flush()
+        with self.lock:
+            report = self.segments.fsck(repair)
+            for number in report["repaired"]:
+                self._reindex_segment(number)
+        return report
+    
+    def _rewrite_segment(self, number: int):
+        """Rewrite a single segment with pending patches folded in.
+        
+        Entries are streamed into a temporary file that replaces the segment
+        once complete, and only that segment is re-indexed.
+        """
+        self.segments.replace_segment(number, self._encode_entries(self.read_entries([number])))
+        self._reindex_segment(number)
+    
+    def _reindex_segment(self, number: int):
+        """Re-index a segment whose lines were rewritten but whose entries stay indexed."""
+        self.index.reindex(self.segments, number)
+        if self.search_index.exists():
+            # Folded patches were indexed when written; only positions moved
+            self.search_index.set_covered(number, self.index.covered(number))
+
+    def _encode_entries(self, entries: Iterable[ResponseEntry], batch_size: int = 1000) -> Iterator[bytes]:
+        """Encode entries as log lines, storing their text chunks as they go.
+        
+        The last chunks are stored once the input is exhausted, before the
+        consumer finishes (and e.g. renames a rewritten segment into place).
+        """
+        chunks: Dict[str, str] = {}
+        for entry in entries:
+            yield self._encode(entry, chunks)
+            if len(chunks) >= batch_size:
+                self.blobs.put(chunks)
+                chunks = {}
+        if chunks:
+            self.blobs.put(chunks)
 
 
 class ExplorationLogger:
-    """Handles logging of exploration prompts."""
+    """Handles logging of exploration prompts.
+    
+    A ``.by_entry`` sidecar indexes explorations by the entry they explore,
+    so the explorations of one entry are read without scanning the log.
+    """
     
-    def __init__(self, log_file: str = "explorations.jsonl"):
+    def __init__(self, log_file: str = "explorations.jsonl",
+                 max_segment_bytes: Optional[int] = DEFAULT_MAX_SEGMENT_BYTES,
+                 rotate_interval: Optional[float] = None,
+                 compression: Optional[str] = None):
         """Initialize the exploration logger."""
         self.log_file = Path(log_file)
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self.segments = SegmentedLog(self.log_file, max_segment_bytes, rotate_interval, compression)
+        self.stats = StatsCache(
+            self.segments, self.log_file.with_name(self.log_file.name + ".stats"),
+            lambda data: {"explorations": 1}
+        )
+        self.index = GroupIndex(self.log_file.with_name(self.log_file.name + ".by_entry"),
+                                _exploration_entry_id)
+        self.lock = log_lock(self.log_file)
     
     def log_exploration(self, original_entry_id: str, generated_prompt: str, context: str) -> str:
         """Log an exploration prompt."""
-        exploration = ExplorationPrompt(
-            id=str(uuid.uuid4()),
-            original_entry_id=original_entry_id,
-            generated_prompt=generated_prompt,
-            context=context
-        )
+        return self.log_explorations([(original_entry_id, generated_prompt, context)])[0]
+    
+    def log_explorations(self, explorations: Iterable[Tuple[str, str, str]]) -> List[str]:
+        """Log several exploration prompts in one write.
+        
+        Each is given as ``(original_entry_id, generated_prompt, context)``;
+        returns their IDs in the same order.
+        """
+        records = [
+            ExplorationPrompt(
+                id=str(uuid.uuid4()),
+                original_entry_id=original_entry_id,
+                generated_prompt=generated_prompt,
+                context=context
+            )
+            for original_entry_id, generated_prompt, context in explorations
+        ]
+        if not records:
+            return []
         
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(exploration.model_dump_json() + '\n')
+        lines = [(exploration.model_dump_json() + '\n').encode('utf-8') for exploration in records]
+        with self.lock:
+            self.segments.repair_tail()
+            self.index.sync(self.segments)
+            self.segments.maybe_rotate()
+            with open(self.log_file, 'ab') as f:
+                offset = f.tell()
+                f.write(b"".join(lines))
+            locations = []
+            for exploration, line in zip(records, lines):
+                locations.append((exploration.original_entry_id, self.segments.active_number, offset, len(line)))
+                offset += len(line)
+            self.index.extend(locations)
         
-        return exploration.id
+        return [exploration.id for exploration in records]
     
-    def read_explorations(self) -> Iterator[ExplorationPrompt]:
-        """Read all exploration prompts."""
-        if not self.log_file.exists():
-            return
+    def get_explorations(self, entry_id: str) -> List[ExplorationPrompt]:
+        """Exploration prompts generated for an entry, oldest first.
         
-        with open(self.log_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        data = json.loads(line)
-                        yield ExplorationPrompt(**data)
-                    except (json.JSONDecodeError, ValueError) as e:
-                        print(f"Error parsing exploration line: {e}")
-                        continue
\ No newline at end of file
+        Only the lines listed for the entry in the ``.by_entry`` index are read.
+        """
+        with self.lock:
+            self.index.sync(self.segments)
+        explorations = self._read_indexed(entry_id)
+        if explorations is None:
+            # A location no longer holds the exploration (e.g. the log was replaced)
+            with self.lock:
+                self.index.rebuild(self.segments)
+            explorations = self._read_indexed(entry_id) or []
+        return explorations
+    
+    def _read_indexed(self, entry_id: str) -> Optional[List[ExplorationPrompt]]:
+        """Read an entry's explorations at their indexed locations; None if any is stale."""
+        explorations = []
+        for location in self.index.lookup(entry_id):
+            try:
+                exploration = ExplorationPrompt(**fastjson.loads(self.segments.read_at(*location)))
+            except (OSError, json.JSONDecodeError, UnicodeDecodeError, ValueError):
+                return None
+            if exploration.original_entry_id != entry_id:
+                return None
+            explorations.append(exploration)
+        return explorations
+    
+    def rebuild_index(self):
+        """Rebuild the ``.by_entry`` index from all log segments."""
+        with self.lock:
+            self.index.rebuild(self.segments)
+    
+    def read_explorations(self) -> Iterator[ExplorationPrompt]:
+        """Read all exploration prompts, oldest first."""
+        for _, _, line in self.segments.iter_lines():
+            if line.strip():
+                try:
+                    data = fastjson.loads(line)
+                    yield ExplorationPrompt(**data)
+                except (json.JSONDecodeError, ValueError) as e:
+                    print(f"Error parsing exploration line: {e}")
+                    continue
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Exploration counts, maintained incrementally in the ``.stats`` sidecar."""
+        return {"total_explorations": self.stats.totals().get("explorations", 0)}
+    
+    def compress_segments(self, keep_recent: int = 1, codec: Optional[str] = None) -> List[int]:
+        """Compress sealed segments except the ``keep_recent`` newest ones."""
+        with self.lock:
+            return self.segments.compress_sealed(keep_recent, codec)
+    
+    def rotate(self) -> Optional[int]:
+        """Seal the active segment now; return its number."""
+        with self.lock:
+            return self.segments.rotate()
+    
+    def fsck(self, repair: bool = False) -> Dict[str, Any]:
+        """Check the log for undecodable lines and torn tails (see ``SegmentedLog.fsck``)."""
+        with self.lock:
+            report = self.segments.fsck(repair)
+            for number in report["repaired"]:
+                self.index.reindex(self.segments, number)
+        return report
+
+
+def _apply_projected(data: dict, patch: dict, fields, present) -> dict:
+    """Merge a patch into a projected record, respecting the projection."""
+    for key, value in patch.items():
+        if key in fields:
+            data[key] = value
+        elif key in present:
+            data[key] = value is not None
+    return data
+
+
+def _entry_counts(data: dict) -> Counts:
+    """Statistics counts contributed by one projected entry."""
+    counts: Counts = {"entries": 1, "models": {data.get("model_name") or "unknown": 1}}
+    score = data.get("score")
+    if score:
+        counts["scored"] = 1
+        counts["score_sums"] = {field: score.get(field) or 0 for field in SCORE_FIELDS}
+    if data.get("reflection"):
+        counts["reflected"] = 1
+    if data.get("revision"):
+        counts["revised"] = 1
+    return counts
+
+
+def _summarize(counts: Counts) -> Dict[str, Any]:
+    """Turn summed entry counts into the statistics reported by ``get_statistics``."""
+    scored = counts.get("scored", 0)
+    sums = counts.get("score_sums", {})
+    return {
+        "total_entries": counts.get("entries", 0),
+        "scored_entries": scored,
+        "reflected_entries": counts.get("reflected", 0),
+        "revised_entries": counts.get("revised", 0),
+        "models": counts.get("models", {}),
+        "average_scores": {
+            field: sums.get(field, 0) / scored for field in SCORE_FIELDS
+        } if scored else {}
+    }
+
+
+def _exploration_entry_id(line: bytes) -> Optional[str]:
+    """ID of the entry an exploration log line explores, or None."""
+    match = _LEADING_ORIGINAL_ID.match(line)
+    if match:
+        try:
+            return match.group(1).decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+    try:
+        return fastjson.loads(line).get('original_entry_id')
+    except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+        return None
+
+
+def _merge_lines(*sources: Iterable[Tuple[int, int, bytes]]) -> Iterator[Tuple[int, int, bytes]]:
+    """Merge ``(segment, offset, line)`` streams in log order, dropping duplicates."""
+    last = None
+    for item in heapq.merge(*sources, key=lambda item: item[:2]):
+        if item[:2] != last:
+            last = item[:2]
+            yield item
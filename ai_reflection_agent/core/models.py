@@ -4,6 +4,8 @@ from datetime import datetime
 from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field
 
+from . import dedup
+
 
 class Score(BaseModel):
     """Scoring model for AI responses."""
@@ -37,4 +39,64 @@ class ExplorationPrompt(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
     original_entry_id: str = Field(description="ID of the original entry this explores")
     generated_prompt: str = Field(description="The generated exploration prompt")
-    context: str = Field(description="Context or reasoning for this exploration")
\ No newline at end of file
+    context: str = Field(description="Context or reasoning for this exploration")
+
+
+class LazyResponseEntry:
+    """Read-only view of a logged entry that converts fields only when accessed.
+    
+    Bulk scans (statistics, searches) usually touch a couple of fields per
+    entry, so building and validating a full ``ResponseEntry`` for every line
+    is wasted work. Attribute access mirrors ``ResponseEntry``: the timestamp
+    is parsed and the score validated on first access, text stored compactly
+    (see ``dedup``) is rebuilt on first access, and ``validate()`` returns
+    the fully validated model on demand.
+    """
+    
+    __slots__ = ("_data", "_converted", "_blobs")
+    
+    def __init__(self, data: Dict[str, Any], blobs=None):
+        self._data = data
+        self._converted: Dict[str, Any] = {}
+        self._blobs = blobs
+    
+    def __getattr__(self, name: str) -> Any:
+        converted = self._converted
+        if name in converted:
+            return converted[name]
+        
+        value = dedup.stored_value(self._data, name, self._blobs, _MISSING)
+        if value is _MISSING:
+            if name not in _ENTRY_FIELDS:
+                raise AttributeError(name)
+            value = _ENTRY_FIELDS[name].get_default(call_default_factory=True)
+        elif name not in _ENTRY_FIELDS:
+            raise AttributeError(name)
+        
+        if name == "timestamp" and isinstance(value, str):
+            value = datetime.fromisoformat(value) if _is_plain_isoformat(value) else self.validate().timestamp
+        elif name == "score" and isinstance(value, dict):
+            value = Score(**value)
+        
+        converted[name] = value
+        return value
+    
+    def validate(self) -> ResponseEntry:
+        """Return the fully validated entry."""
+        return ResponseEntry(**dedup.expand(dict(self._data), self._blobs))
+    
+    def model_dump(self, **kwargs) -> Dict[str, Any]:
+        """Dump via the validated model, like ``ResponseEntry.model_dump``."""
+        return self.validate().model_dump(**kwargs)
+    
+    def __repr__(self) -> str:
+        return f"LazyResponseEntry(id={self._data.get('id')!r})"
+
+
+_ENTRY_FIELDS = dict(ResponseEntry.model_fields)
+_MISSING = object()
+
+
+def _is_plain_isoformat(value: str) -> bool:
+    """Whether ``datetime.fromisoformat`` parses the value on every Python version."""
+    return len(value) >= 19 and value[10] == "T" and not value.endswith("Z")
@@ -0,0 +1,118 @@
+"""Append-only update records for JSONL log files."""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import fastjson
+
+
+class PatchLog:
+    """Sidecar log of field updates that are merged into entries on read.
+
+    Each update is appended as ``{"id": ..., "timestamp": ..., "fields": {...}}``
+    so updating an entry costs one small write instead of a rewrite of the whole
+    log. Patches for the same ID are applied in order; ``clear()`` is called once
+    they have been folded back into the log by a compaction.
+    """
+
+    def __init__(self, patch_file: Path):
+        """Initialize the patch log for the given sidecar path."""
+        self.patch_file = Path(patch_file)
+        self._patches: Dict[str, Dict[str, Any]] = {}
+        self._loaded_bytes = 0
+        self._loaded_inode: Optional[int] = None
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Read patches appended since the last load and return the merged view."""
+        if not self.patch_file.exists():
+            self._patches.clear()
+            self._loaded_bytes = 0
+            return self._patches
+
+        stat = self.patch_file.stat()
+        size = stat.st_size
+        if size < self._loaded_bytes or stat.st_ino != self._loaded_inode:
+            # Patches were compacted away by someone else; start over
+            self._patches.clear()
+            self._loaded_bytes = 0
+            self._loaded_inode = stat.st_ino
+        if size == self._loaded_bytes:
+            return self._patches
+
+        with open(self.patch_file, 'rb') as f:
+            f.seek(self._loaded_bytes)
+            data = f.read()
+
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = fastjson.loads(line)
+                self._patches.setdefault(record["id"], {}).update(record["fields"])
+            except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError) as e:
+                print(f"Error parsing patch line: {e}")
+        self._loaded_bytes += end
+        return self._patches
+
+    def get(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        """Return the merged field updates for an entry, if any."""
+        return self.load().get(entry_id)
+
+    def apply(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge any pending updates into a decoded log record in place."""
+        patch = self.load().get(data.get("id"))
+        if patch:
+            data.update(patch)
+        return data
+
+    def append(self, entry_id: str, fields: Dict[str, Any]):
+        """Append an update record for an entry."""
+        self.extend({entry_id: fields})
+
+    def extend(self, updates: Dict[str, Dict[str, Any]]):
+        """Append update records for several entries (ID -> fields) in one write."""
+        if not updates:
+            return
+        now = datetime.now().isoformat()
+        data = b"".join(
+            (json.dumps({"id": entry_id, "timestamp": now, "fields": fields}, ensure_ascii=False) + '\n').encode('utf-8')
+            for entry_id, fields in updates.items()
+        )
+        self.load()
+        with open(self.patch_file, 'ab') as f:
+            f.write(data)
+            self._loaded_bytes = f.tell()
+            self._loaded_inode = os.fstat(f.fileno()).st_ino
+        for entry_id, fields in updates.items():
+            self._patches.setdefault(entry_id, {}).update(fields)
+
+    def discard(self, entry_ids):
+        """Drop the patches for the given entries after they have been folded in."""
+        entry_ids = set(entry_ids)
+        self.load()
+        remaining = {k: v for k, v in self._patches.items() if k not in entry_ids}
+        if not remaining:
+            self.clear()
+            return
+
+        tmp_file = self.patch_file.with_name(self.patch_file.name + ".tmp")
+        now = datetime.now().isoformat()
+        with open(tmp_file, 'wb') as f:
+            for entry_id, fields in remaining.items():
+                record = {"id": entry_id, "timestamp": now, "fields": fields}
+                f.write((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+        tmp_file.replace(self.patch_file)
+        self._patches = remaining
+        stat = self.patch_file.stat()
+        self._loaded_bytes = stat.st_size
+        self._loaded_inode = stat.st_ino
+
+    def clear(self):
+        """Drop all patches after they have been folded into the log."""
+        self.patch_file.unlink(missing_ok=True)
+        self._patches.clear()
+        self._loaded_bytes = 0
@@ -0,0 +1,96 @@
+"""Byte-level prefilters that rule out log lines before they are decoded.
+
+A ``Prefilter`` matches every log line which *may* satisfy a condition;
+lines it does not match certainly do not. Callers still check the decoded
+entries, so prefilters only need to be cheap and never miss. They are plain
+byte strings searched for directly in memory-mapped segments (see
+``SegmentedLog.scan``), which runs at memory speed; regular expressions are
+avoided because ``re`` has no fast path for case-insensitive or alternative
+literals. Lines are assumed to be written by a JSON encoder such as the
+loggers' (compact, or with ``": "`` separators as ``json.dumps`` writes them).
+"""
+
+import json
+from typing import Iterable, List, Optional
+
+from . import dedup
+
+
+# Lines keeping text outside the line (see ``dedup``) can never be ruled out by text
+_COMPACT_MARKERS = (
+    f'"{dedup.CHUNKS_KEY}"'.encode('utf-8'),
+    f'"{dedup.RECIPE_KEY}"'.encode('utf-8'),
+)
+
+# Non-ASCII characters whose lowercase form contains an ASCII letter, as UTF-8
+# and as JSON escapes; lines containing one are never ruled out
+_CASE_FOLDS = {
+    "i": (b"\xc4\xb0", b"\\u0130"),      # LATIN CAPITAL LETTER I WITH DOT ABOVE
+    "k": (b"\xe2\x84\xaa", b"\\u212a"),  # KELVIN SIGN
+}
+
+# Characters a JSON encoder escapes in ASCII text
+_ESCAPED = set('"\\') | {chr(c) for c in range(0x20)} | {"\x7f"}
+
+
+class Prefilter:
+    """Byte strings of which every matching line contains at least one.
+
+    With ``ignore_case`` the needles are lower-case and are searched for in
+    ASCII-lowercased text.
+    """
+
+    def __init__(self, needles: Iterable[bytes], ignore_case: bool = False):
+        """Initialize the prefilter from its needles."""
+        self.ignore_case = ignore_case
+        self.needles: List[bytes] = sorted({n.lower() if ignore_case else n for n in needles})
+
+    def matches(self, line: bytes) -> bool:
+        """Whether a single line may match."""
+        if self.ignore_case:
+            line = line.lower()
+        return any(n in line for n in self.needles)
+
+    def __repr__(self) -> str:
+        return f"Prefilter({self.needles!r}, ignore_case={self.ignore_case})"
+
+
+def text(query: str) -> Optional[Prefilter]:
+    """Lines whose text fields may contain ``query``, compared case-insensitively.
+
+    Returns None if the query cannot be prefiltered (non-ASCII, or characters
+    JSON escapes), in which case every line has to be decoded.
+    """
+    query = query.lower()
+    if not query or not query.isascii() or _ESCAPED & set(query):
+        return None
+
+    needles = [query.encode('ascii'), *_COMPACT_MARKERS]
+    if "/" in query:
+        needles.append(query.replace("/", "\\/").encode('ascii'))
+    for char, folds in _CASE_FOLDS.items():
+        if char in query:
+            needles += folds
+    return Prefilter(needles, ignore_case=True)
+
+
+def field_value(field: str, *values) -> Optional[Prefilter]:
+    """Lines that may have a ``field`` key equal to one of the JSON ``values``.
+
+    The key may be at any depth (e.g. ``type`` inside ``metadata``). Returns
+    None if no values are given.
+    """
+    needles = []
+    for value in values:
+        for ensure_ascii in (False, True):
+            key = json.dumps(field, ensure_ascii=ensure_ascii)
+            encoded = json.dumps(value, ensure_ascii=ensure_ascii)
+            for separator in (":", ": "):
+                needles.append(f"{key}{separator}{encoded}".encode('utf-8'))
+    return Prefilter(needles) if needles else None
+
+
+def ids(entry_ids: Iterable[str]) -> Optional[Prefilter]:
+    """Lines that may be the entries with the given IDs; None if there are none."""
+    return field_value("id", *entry_ids)
+
@@ -1,6 +1,7 @@
 """Review mode for reflection and revision of AI responses."""
 
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Dict, Any, Tuple
 from .models import ResponseEntry, Score
 from .logger import ResponseLogger
 from .scorer import SelfScorer
@@ -35,11 +36,25 @@ class ResponseReviewer:
     
     def review_entry(self, entry_id: str, backend_adapter) -> Dict[str, Any]:
         """Perform a complete review of an entry including scoring and reflection."""
-        entry = self.logger.get_entry(entry_id)
+        results, updates = self._review(entry_id, self.logger.get_entry(entry_id), backend_adapter)
+        
+        # Update the entry in the log
+        if updates:
+            self.logger.update_entry(entry_id, **updates)
+        
+        return results
+    
+    def _review(self, entry_id: str, entry: Optional[ResponseEntry],
+                backend_adapter) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Run the review steps of an entry without writing to the log.
+        
+        Returns the review results and the field updates they produced.
+        """
         if not entry:
-            return {"error": "Entry not found"}
+            return {"error": "Entry not found"}, {}
         
         results = {"entry_id": entry_id, "steps": []}
+        updates = {}
         
         # Step 1: Score the response if not already scored
         if entry.score is None:
@@ -47,7 +62,7 @@ class ResponseReviewer:
             results["steps"].append(score_result)
             
             if score_result.get("success"):
-                entry.score = score_result["score"]
+                entry.score = updates["score"] = score_result["score"]
         
         # Step 2: Generate reflection if not already done
         if entry.reflection is None:
@@ -55,7 +70,7 @@ class ResponseReviewer:
             results["steps"].append(reflection_result)
             
             if reflection_result.get("success"):
-                entry.reflection = reflection_result["reflection"]
+                entry.reflection = updates["reflection"] = reflection_result["reflection"]
         
         # Step 3: Generate revision if reflection indicates issues
         if entry.revision is None and entry.reflection:
@@ -63,18 +78,10 @@ class ResponseReviewer:
             results["steps"].append(revision_result)
             
             if revision_result.get("success"):
-                entry.revision = revision_result["revision"]
-        
-        # Update the entry in the log
-        self.logger.update_entry(
-            entry_id,
-            score=entry.score,
-            reflection=entry.reflection,
-            revision=entry.revision
-        )
+                entry.revision = updates["revision"] = revision_result["revision"]
         
         results["entry"] = entry
-        return results
+        return results, updates
     
     def score_response(self, entry: ResponseEntry, backend_adapter) -> Dict[str, Any]:
         """Score a response using the AI backend."""
@@ -143,8 +150,17 @@ class ResponseReviewer:
                 "error": str(e)
             }
     
-    def batch_review(self, entry_ids: List[str], backend_adapter) -> Dict[str, Any]:
-        """Review multiple entries in batch."""
+    def batch_review(self, entry_ids: List[str], backend_adapter,
+                     jobs: Optional[int] = None) -> Dict[str, Any]:
+        """Review multiple entries in batch.
+        
+        The entries are fetched together, then up to ``jobs`` of them (by
+        default the backend's ``max_concurrency``) are reviewed at a time,
+        each in a worker thread, so their backend calls overlap. The updates of all reviews
+        are written together in one batched ``update_entries`` call at the
+        end; if the batch is interrupted, the reviews finished so far are
+        still written.
+        """
         results = {
             "total": len(entry_ids),
             "successful": 0,
@@ -152,8 +168,24 @@ class ResponseReviewer:
             "results": []
         }
         
+        reviews: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        entries = self.logger.get_entries(entry_ids)
+        pool = ThreadPoolExecutor(max_workers=max(1, jobs or backend_adapter.max_concurrency))
+        try:
+            futures = {
+                pool.submit(self._review, entry_id, entries.get(entry_id), backend_adapter): entry_id
+                for entry_id in entry_ids
+            }
+            for future in as_completed(futures):
+                reviews[futures[future]] = future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            updates = {entry_id: review[1] for entry_id, review in reviews.items() if review[1]}
+            if updates:
+                self.logger.update_entries(updates)
+        
         for entry_id in entry_ids:
-            result = self.review_entry(entry_id, backend_adapter)
+            result = reviews[entry_id][0]
             results["results"].append(result)
             
             if any(step.get("success", False) for step in result.get("steps", [])):
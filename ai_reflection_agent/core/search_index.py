@@ -0,0 +1,171 @@
+"""On-disk trigram index for full-text search over log entries."""
+
+import functools
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+
+SEARCHABLE_FIELDS = ("prompt", "response", "thinking_process", "reflection", "revision")
+
+# Bumped when the index layout changes; indexes of another version are rebuilt
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    entry_id TEXT NOT NULL,
+    field TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS texts USING fts5(
+    text, content='', tokenize='trigram case_sensitive 1', detail='none'
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    segment INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def trigram_supported() -> bool:
+    """Whether the SQLite library has FTS5 with the trigram tokenizer (3.34+)."""
+    try:
+        sqlite3.connect(":memory:").execute(
+            "CREATE VIRTUAL TABLE t USING fts5(text, tokenize='trigram')"
+        )
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def trigrams(text: str) -> Set[str]:
+    """All three-character substrings of the lower-cased text."""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Trigram index from the text fields of entries to their IDs.
+
+    Field values are indexed lower-cased in an SQLite FTS5 table with the
+    trigram tokenizer (contentless, so the text is not stored twice). An
+    entry containing the query as a substring contains every trigram of it,
+    so the entries holding all of the query's trigrams are a superset of
+    the matches, including matches in the middle of a word; callers verify
+    the exact match on the candidates.
+
+    The index also records, per log segment, the byte position up to which
+    entries have been indexed so appends made without it can be caught up.
+    """
+
+    def __init__(self, index_file: Path):
+        """Initialize the index for the given sidecar path."""
+        self.index_file = Path(index_file)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def exists(self) -> bool:
+        """Whether the index has been created for this log."""
+        return self.index_file.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.index_file, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            if not self._conn.execute("SELECT 1 FROM sqlite_master").fetchone():
+                self._create()
+        return self._conn
+
+    def _create(self):
+        """Create the tables, unless SQLite lacks the trigram tokenizer."""
+        if trigram_supported():
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def current(self) -> bool:
+        """Whether the index is usable: created by this version, with trigram support.
+
+        Indexes written by older versions (word terms) need a rebuild.
+        """
+        return self._connect().execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+    def add(self, entries: Iterable[Dict], segment: Optional[int] = None, position: Optional[int] = None):
+        """Index the searchable fields of decoded entries (dicts).
+
+        If ``segment`` and ``position`` are given, the segment is recorded as
+        indexed up to that byte position in the same transaction. Does
+        nothing if the index is not ``current()``.
+        """
+        if not self.current():
+            return
+        with self._connect() as conn:
+            for data in entries:
+                entry_id = data.get("id")
+                if not entry_id:
+                    continue
+                for field in SEARCHABLE_FIELDS:
+                    value = data.get(field)
+                    if isinstance(value, str) and value:
+                        document = conn.execute(
+                            "INSERT INTO documents (entry_id, field) VALUES (?, ?)", (entry_id, field)
+                        ).lastrowid
+                        conn.execute(
+                            "INSERT INTO texts (rowid, text) VALUES (?, ?)", (document, value.lower())
+                        )
+            if segment is not None and position is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO coverage (segment, position) VALUES (?, ?)",
+                    (segment, position)
+                )
+
+    def covered(self, segment: int) -> int:
+        """Byte position up to which a segment has been indexed."""
+        if not self.current():
+            return 0
+        row = self._connect().execute(
+            "SELECT position FROM coverage WHERE segment = ?", (segment,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def set_covered(self, segment: int, position: int):
+        """Record how far a segment has been indexed."""
+        if not self.current():
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO coverage (segment, position) VALUES (?, ?)",
+                (segment, position)
+            )
+
+    def candidates(self, query: str, fields: Iterable[str]) -> Optional[Set[str]]:
+        """Return IDs of entries that may contain ``query`` in any of ``fields``.
+
+        Returns None when the query cannot be answered from the index
+        (shorter than a trigram, a field that is not indexed, or an index
+        that is not ``current()``).
+        """
+        fields = list(fields)
+        terms = trigrams(query)
+        if not terms or any(field not in SEARCHABLE_FIELDS for field in fields) or not self.current():
+            return None
+
+        match = " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        placeholders = ", ".join("?" for _ in fields)
+        rows = self._connect().execute(
+            f"SELECT DISTINCT documents.entry_id FROM texts "
+            f"JOIN documents ON documents.id = texts.rowid "
+            f"WHERE texts MATCH ? AND documents.field IN ({placeholders})",
+            [match] + fields
+        )
+        return {row[0] for row in rows}
+
+    def clear(self):
+        """Remove all documents and coverage information, upgrading an older index."""
+        conn = self._connect()
+        conn.executescript(
+            "DROP TABLE IF EXISTS postings; DROP TABLE IF EXISTS texts; "
+            "DROP TABLE IF EXISTS documents; DROP TABLE IF EXISTS coverage; "
+            "PRAGMA user_version = 0;"
+        )
+        self._create()
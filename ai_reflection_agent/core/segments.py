@@ -0,0 +1,639 @@
+"""Segmented, rotating storage for JSONL log files."""
+
+import heapq
+import json
+import mmap
+import os
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import compression, fastjson
+
+if TYPE_CHECKING:
+    from .prefilter import Prefilter
+
+
+DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+
+# Byte ranges ``(start, end)`` of lines to read per segment number; an end of
+# None means the end of the segment
+Ranges = Dict[int, List[Tuple[int, Optional[int]]]]
+
+
+class SegmentedLog:
+    """A JSONL log split into numbered segment files described by a manifest.
+
+    New lines are always appended to the active segment, which keeps the
+    configured log path (e.g. ``responses.jsonl``) so existing tools keep
+    working. When it grows past ``max_segment_bytes`` (or is older than
+    ``rotate_interval`` seconds) it is renamed to a sealed, numbered segment
+    such as ``responses.000001.jsonl`` and a fresh active file is started.
+    Sealed segments are immutable apart from per-segment compaction and can be
+    compressed in place (gzip, or zstd when ``zstandard`` is installed); with
+    ``compression`` set they are compressed as soon as they are sealed. Reads
+    decompress transparently while streaming.
+
+    The manifest (``responses.jsonl.manifest``) records the active segment
+    number and, for every sealed segment, its file name, size, entry count,
+    first/last timestamps and a CRC-32 of its (uncompressed) contents, which
+    ``fsck`` uses to recognize segments it has already checked. It also
+    counts how often each segment's file has been rewritten (see
+    ``generation``), so caches keyed by byte positions can tell a rewritten
+    segment from one that was only appended to.
+    """
+
+    def __init__(self, log_file: Path,
+                 max_segment_bytes: Optional[int] = DEFAULT_MAX_SEGMENT_BYTES,
+                 rotate_interval: Optional[float] = None,
+                 compression: Optional[str] = None):
+        """Initialize the segmented log rooted at the active log file path."""
+        self.log_file = Path(log_file)
+        self.manifest_file = self.log_file.with_name(self.log_file.name + ".manifest")
+        self.quarantine_file = self.log_file.with_name(self.log_file.name + ".corrupt")
+        self.max_segment_bytes = max_segment_bytes
+        self.rotate_interval = rotate_interval
+        self.compression = compression
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._manifest_mtime = None
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        """The current manifest, reloaded if another process changed it."""
+        mtime = self.manifest_file.stat().st_mtime_ns if self.manifest_file.exists() else None
+        if self._manifest is None or mtime != self._manifest_mtime:
+            if mtime is not None:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    self._manifest = json.load(f)
+            else:
+                self._manifest = {"active": 1, "active_started": None, "segments": []}
+            self._manifest_mtime = mtime
+        return self._manifest
+
+    @property
+    def active_number(self) -> int:
+        """Segment number of the active (appendable) file."""
+        return self.manifest["active"]
+
+    def sealed_segments(self) -> List[Dict[str, Any]]:
+        """Manifest records for sealed segments, oldest first."""
+        return list(self.manifest["segments"])
+
+    def segment_numbers(self) -> List[int]:
+        """All segment numbers including the active one, oldest first."""
+        return [s["number"] for s in self.manifest["segments"]] + [self.active_number]
+
+    def path_for(self, number: int) -> Path:
+        """Return the file holding the given segment."""
+        if number == self.active_number:
+            return self.log_file
+        for segment in self.manifest["segments"]:
+            if segment["number"] == number:
+                return self.log_file.with_name(segment["file"])
+        raise KeyError(f"Unknown log segment: {number}")
+
+    def generation(self, number: int) -> int:
+        """How often a segment's file has been replaced (compaction, compression, repair).
+
+        Byte positions recorded for an older generation no longer apply.
+        Sealing the active segment keeps its generation, since its lines do
+        not move.
+        """
+        if number == self.active_number:
+            return self.manifest.get("active_generation", 0)
+        return self._record(number).get("generation", 0)
+
+    def is_compressed(self, number: int) -> bool:
+        """Whether the given segment is stored compressed."""
+        return compression.codec_for(self.path_for(number)) is not None
+
+    def files(self) -> List[Path]:
+        """All files belonging to this log (segments and manifest) that exist."""
+        paths = [self.log_file.with_name(s["file"]) for s in self.manifest["segments"]]
+        paths += [self.log_file, self.manifest_file]
+        return [p for p in paths if p.exists()]
+
+    def open_segment(self, number: int):
+        """Open a segment for binary reading, decompressing transparently."""
+        return compression.open_file(self.path_for(number))
+
+    def iter_lines(self, numbers: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, int, bytes]]:
+        """Yield ``(segment, offset, line)`` for every complete line, oldest first."""
+        for number in (self.segment_numbers() if numbers is None else numbers):
+            for offset, line in self.iter_segment(number):
+                yield number, offset, line
+
+    def iter_segment(self, number: int, start: int = 0,
+                     end: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+        """Yield ``(offset, line)`` for complete lines of one segment from ``start`` up to ``end``."""
+        if not self.path_for(number).exists():
+            return
+        with self.open_segment(number) as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b'\n') or (end is not None and offset >= end):
+                    break  # Torn final line, or past the range
+                yield offset, line
+                offset += len(line)
+
+    def iter_ranges(self, ranges: Ranges) -> Iterator[Tuple[int, int, bytes]]:
+        """Yield ``(segment, offset, line)`` for complete lines within byte ranges, in log order."""
+        for number, spans in sorted(ranges.items()):
+            for start, end in spans:
+                for offset, line in self.iter_segment(number, start, end):
+                    yield number, offset, line
+
+    def scan(self, prefilters: Sequence["Prefilter"],
+             numbers: Optional[Iterable[int]] = None,
+             ranges: Optional[Ranges] = None) -> Iterator[Tuple[int, int, bytes]]:
+        """Yield ``(segment, offset, line)`` for complete lines matching every prefilter.
+        
+        With ``ranges``, only lines within those byte ranges (and segments) are
+        scanned.
+        
+        Uncompressed segments are memory-mapped and searched for the first
+        prefilter's needles directly, so lines without a match are skipped
+        without being split, copied or decoded; only lines around a hit are
+        sliced out and checked against the other prefilters. Case-insensitive
+        needles are searched in line-aligned blocks lowercased in one go.
+        Compressed segments are streamed and every line is checked.
+        """
+        if ranges is not None:
+            wanted = None if numbers is None else set(numbers)
+            ranges = {n: spans for n, spans in ranges.items() if wanted is None or n in wanted}
+            numbers = sorted(ranges)
+        if not prefilters:
+            yield from (self.iter_lines(numbers) if ranges is None else self.iter_ranges(ranges))
+            return
+        
+        first, rest = prefilters[0], prefilters[1:]
+        for number in (self.segment_numbers() if numbers is None else numbers):
+            path = self.path_for(number)
+            if not path.exists():
+                continue
+            spans = [(0, None)] if ranges is None else ranges[number]
+            if self.is_compressed(number):
+                for start, end in spans:
+                    for offset, line in self.iter_segment(number, start, end):
+                        if all(p.matches(line) for p in prefilters):
+                            yield number, offset, line
+                continue
+            
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    for start, end in spans:
+                        for offset, line in _scan_buffer(buffer, first, start, end):
+                            if all(p.matches(line) for p in rest):
+                                yield number, offset, line
+
+    def segment_size(self, number: int) -> int:
+        """Uncompressed size in bytes of a segment."""
+        if number == self.active_number:
+            return self.log_file.stat().st_size if self.log_file.exists() else 0
+        for segment in self.manifest["segments"]:
+            if segment["number"] == number:
+                return segment["bytes"]
+        raise KeyError(f"Unknown log segment: {number}")
+
+    def iter_lines_reversed(self, numbers: Optional[Iterable[int]] = None,
+                            block_size: int = 64 * 1024) -> Iterator[Tuple[int, int, bytes]]:
+        """Yield ``(segment, offset, line)`` for every complete line, newest first.
+
+        Uncompressed segments are read backwards in ``block_size`` blocks from
+        the end of the file, so a caller that stops early only touches the tail.
+        Compressed segments cannot be read backwards and are decoded whole.
+        """
+        numbers = self.segment_numbers() if numbers is None else list(numbers)
+        for number in reversed(numbers):
+            path = self.path_for(number)
+            if not path.exists():
+                continue
+            if self.is_compressed(number):
+                yield from reversed(list(self.iter_lines([number])))
+                continue
+            with open(path, 'rb') as f:
+                f.seek(0, 2)
+                for offset, line in _read_lines_reversed(f, f.tell(), block_size):
+                    yield number, offset, line
+
+    def read_at(self, number: int, offset: int, length: int) -> bytes:
+        """Read ``length`` bytes at an (uncompressed) offset within a segment."""
+        with self.open_segment(number) as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def read_many(self, locations: Sequence[Tuple[int, int, int]]) -> List[bytes]:
+        """Read several ``(segment, offset, length)`` locations, in the order given.
+
+        Each segment is opened once and read front to back, so a compressed
+        segment is decompressed once instead of once per location.
+        """
+        lines: List[bytes] = [b""] * len(locations)
+        order = sorted(range(len(locations)), key=lambda i: locations[i][:2])
+        f = None
+        number = None
+        try:
+            for i in order:
+                if locations[i][0] != number:
+                    if f is not None:
+                        f.close()
+                    number = locations[i][0]
+                    f = self.open_segment(number)
+                _, offset, length = locations[i]
+                f.seek(offset)
+                lines[i] = f.read(length)
+        finally:
+            if f is not None:
+                f.close()
+        return lines
+
+    def repair_tail(self, block_size: int = 64 * 1024) -> int:
+        """Truncate an incomplete final line of the active segment.
+
+        A crash in the middle of an append can leave a line without its
+        trailing newline; the next append would be glued onto it and both
+        lines would be unreadable. Returns the number of bytes removed.
+        """
+        if not self.log_file.exists():
+            return 0
+
+        with open(self.log_file, 'r+b') as f:
+            size = f.seek(0, 2)
+            if size == 0:
+                return 0
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return 0
+
+            end = pos = size
+            while pos > 0:
+                start = max(pos - block_size, 0)
+                f.seek(start)
+                newline = f.read(pos - start).rfind(b'\n')
+                if newline != -1:
+                    end = start + newline + 1
+                    break
+                pos = start
+            else:
+                end = 0
+            f.truncate(end)
+
+        print(f"Warning: discarded {size - end} bytes of an incomplete line at the end of {self.log_file}")
+        return size - end
+
+    def maybe_rotate(self) -> bool:
+        """Rotate the active segment if it has reached a size or age limit."""
+        if not self.log_file.exists():
+            return False
+
+        size = self.log_file.stat().st_size
+        if size == 0:
+            return False
+
+        if self.max_segment_bytes and size >= self.max_segment_bytes:
+            self.rotate()
+            return True
+
+        if self.rotate_interval:
+            started = self.manifest.get("active_started")
+            if started is None:
+                self._update_manifest(active_started=time.time())
+            elif time.time() - started >= self.rotate_interval:
+                self.rotate()
+                return True
+
+        return False
+
+    def rotate(self) -> Optional[int]:
+        """Seal the active segment and start a new one; return the sealed number."""
+        if not self.log_file.exists() or self.log_file.stat().st_size == 0:
+            return None
+
+        number = self.active_number
+        sealed = self.log_file.with_name(f"{self.log_file.stem}.{number:06d}{self.log_file.suffix}")
+        self.log_file.replace(sealed)
+
+        record = {
+            "number": number, "file": sealed.name, "sealed_at": datetime.now().isoformat(),
+            "generation": self.manifest.get("active_generation", 0)
+        }
+        record.update(self._describe(sealed))
+        record["verified"] = self.manifest.get("active_verified", 0) >= record["bytes"]
+
+        manifest = dict(self.manifest)
+        manifest["segments"] = manifest["segments"] + [record]
+        manifest["active"] = number + 1
+        manifest["active_started"] = time.time() if self.rotate_interval else None
+        manifest["active_verified"] = 0
+        manifest["active_generation"] = 0
+        self._write_manifest(manifest)
+
+        if self.compression:
+            self.compress_segment(number, self.compression)
+        return number
+
+    def compress_segment(self, number: int, codec: Optional[str] = None) -> bool:
+        """Compress a sealed segment in place; return False if not applicable.
+
+        ``codec`` is ``"gzip"`` or ``"zstd"``; it defaults to zstd when
+        available.
+        """
+        if number == self.active_number or self.is_compressed(number):
+            return False
+
+        codec = codec or compression.default_codec()
+        path = self.path_for(number)
+        compressed = path.with_name(path.name + compression.CODEC_SUFFIXES[codec])
+        tmp_file = compressed.with_name(compressed.name + ".tmp")
+        with open(path, 'rb') as src, compression.open_file(tmp_file, 'wb', codec) as dst:
+            while True:
+                chunk = src.read(1024 * 1024)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        tmp_file.replace(compressed)
+
+        self._update_segment(number, file=compressed.name, compressed_bytes=compressed.stat().st_size,
+                             generation=self.generation(number) + 1)
+        path.unlink()
+        return True
+
+    def compress_sealed(self, keep_recent: int = 1, codec: Optional[str] = None) -> List[int]:
+        """Compress all sealed segments except the ``keep_recent`` newest ones."""
+        sealed = [s["number"] for s in self.manifest["segments"]]
+        targets = sealed[:max(len(sealed) - keep_recent, 0)]
+        return [number for number in targets if self.compress_segment(number, codec)]
+
+    def replace_segment(self, number: int, lines: Iterable[bytes]):
+        """Atomically replace a segment's contents with the given lines.
+
+        ``lines`` may be a generator reading the segment being replaced.
+        """
+        path = self.path_for(number)
+        tmp_file = path.with_name(path.name + ".tmp")
+        with compression.open_file(tmp_file, 'wb', compression.codec_for(path)) as f:
+            for line in lines:
+                f.write(line)
+        tmp_file.replace(path)
+
+        generation = self.generation(number) + 1
+        if number != self.active_number:
+            self._update_segment(number, generation=generation, **self._describe(path))
+        else:
+            self._update_manifest(active_verified=0, active_generation=generation)
+
+    def fsck(self, repair: bool = False) -> Dict[str, Any]:
+        """Check that every line of every segment decodes as a JSON object.
+
+        A sealed segment that was checked before and whose CRC-32 still
+        matches the manifest is not decoded again, and the active segment is
+        only checked from its verified high-water mark (``active_verified``
+        in the manifest), so repeated checks cost a checksum pass over
+        sealed data plus decoding the lines appended since.
+
+        Returns per-segment results: offsets of bad lines, bytes of a torn
+        (unterminated) final line, and whether the checksum matched (None
+        if the manifest has none). With ``repair``, bad lines and torn tails
+        are moved to the ``.corrupt`` sidecar and the segments are rewritten
+        without them; their numbers are listed under ``repaired``.
+        """
+        results = []
+        repaired = []
+        for number in self.segment_numbers():
+            result = self._check_segment(number)
+            if result is None:
+                continue
+            results.append(result)
+            damaged = bool(result["bad_lines"] or result["torn_bytes"])
+            if damaged and repair:
+                self._quarantine(number, set(result["bad_lines"]))
+                repaired.append(number)
+            if not damaged or repair:
+                self._mark_verified(number)
+        return {"segments": results, "repaired": repaired, "quarantine_file": str(self.quarantine_file)}
+
+    def _check_segment(self, number: int) -> Optional[Dict[str, Any]]:
+        """Check the lines of one segment that have not been verified yet."""
+        path = self.path_for(number)
+        if not path.exists():
+            return None
+
+        result: Dict[str, Any] = {
+            "number": number, "file": path.name, "checked_from": 0,
+            "bad_lines": [], "torn_bytes": 0, "checksum_ok": None
+        }
+        start = 0
+        if number == self.active_number:
+            start = self.manifest.get("active_verified", 0)
+            if start > path.stat().st_size:
+                start = 0  # Rewritten since it was verified
+        else:
+            record = self._record(number)
+            if "crc32" in record:
+                result["checksum_ok"] = self._checksum(number) == record["crc32"]
+                if record.get("verified") and result["checksum_ok"]:
+                    result["checked_from"] = record["bytes"]
+                    return result
+
+        result["checked_from"] = offset = start
+        with self.open_segment(number) as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    result["torn_bytes"] = len(line)
+                    break
+                if line.strip() and not _is_valid_line(line):
+                    result["bad_lines"].append(offset)
+                offset += len(line)
+        return result
+
+    def _quarantine(self, number: int, bad_offsets: set):
+        """Move bad lines and a torn tail of a segment to the ``.corrupt`` sidecar."""
+        with open(self.quarantine_file, 'ab') as quarantine:
+            def good_lines():
+                with self.open_segment(number) as f:
+                    offset = 0
+                    for line in f:
+                        if offset in bad_offsets or not line.endswith(b'\n'):
+                            quarantine.write(line if line.endswith(b'\n') else line + b'\n')
+                        else:
+                            yield line
+                        offset += len(line)
+
+            self.replace_segment(number, good_lines())
+
+    def _mark_verified(self, number: int):
+        if number == self.active_number:
+            size = self.log_file.stat().st_size if self.log_file.exists() else 0
+            self._update_manifest(active_verified=size)
+            return
+        record = self._record(number)
+        if "crc32" not in record:
+            record = dict(record, crc32=self._checksum(number))
+        self._update_segment(number, verified=True, crc32=record["crc32"])
+
+    def _checksum(self, number: int) -> int:
+        """CRC-32 of a segment's uncompressed contents."""
+        crc = 0
+        with self.open_segment(number) as f:
+            while True:
+                chunk = f.read(1024 * 1024)
+                if not chunk:
+                    return crc
+                crc = zlib.crc32(chunk, crc)
+
+    def _record(self, number: int) -> Dict[str, Any]:
+        for segment in self.manifest["segments"]:
+            if segment["number"] == number:
+                return segment
+        raise KeyError(f"Unknown log segment: {number}")
+
+    def _describe(self, path: Path) -> Dict[str, Any]:
+        """Compute manifest statistics for a segment file."""
+        size = entries = crc = 0
+        first_timestamp = last_timestamp = None
+        with compression.open_file(path) as f:
+            for line in f:
+                size += len(line)
+                crc = zlib.crc32(line, crc)
+                if not line.strip():
+                    continue
+                entries += 1
+                timestamp = _extract_timestamp(line)
+                if timestamp:
+                    first_timestamp = first_timestamp or timestamp
+                    last_timestamp = timestamp
+
+        description = {
+            "bytes": size,
+            "entries": entries,
+            "first_timestamp": first_timestamp,
+            "last_timestamp": last_timestamp,
+            "crc32": crc
+        }
+        if compression.codec_for(path):
+            description["compressed_bytes"] = path.stat().st_size
+        return description
+
+    def _update_segment(self, number: int, **fields):
+        manifest = dict(self.manifest)
+        manifest["segments"] = [
+            dict(s, **fields) if s["number"] == number else s
+            for s in manifest["segments"]
+        ]
+        self._write_manifest(manifest)
+
+    def _update_manifest(self, **fields):
+        manifest = dict(self.manifest)
+        manifest.update(fields)
+        self._write_manifest(manifest)
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        tmp_file = self.manifest_file.with_name(self.manifest_file.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        tmp_file.replace(self.manifest_file)
+        self._manifest = manifest
+        self._manifest_mtime = self.manifest_file.stat().st_mtime_ns
+
+
+def _is_valid_line(line: bytes) -> bool:
+    """Whether a log line decodes as a JSON object."""
+    try:
+        return isinstance(fastjson.loads(line), dict)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return False
+
+
+def _extract_timestamp(line: bytes) -> Optional[str]:
+    """Return the timestamp string of a JSONL record, or None."""
+    try:
+        return fastjson.loads(line).get("timestamp")
+    except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+        return None
+
+
+def _read_lines_reversed(f, end: int, block_size: int) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(offset, line)`` for complete lines of ``f[:end]``, last line first.
+
+    Bytes after the final newline belong to a torn (incomplete) line and are
+    skipped.
+    """
+    pos = end
+    tail = b''
+    torn = True
+    while pos > 0:
+        size = min(block_size, pos)
+        pos -= size
+        f.seek(pos)
+        data = f.read(size) + tail
+
+        if torn:
+            last_newline = data.rfind(b'\n')
+            if last_newline == -1:
+                tail = b''
+                continue
+            data = data[:last_newline + 1]
+            torn = False
+
+        if pos > 0:
+            # The first line in the block may have started before ``pos``
+            first_newline = data.find(b'\n')
+            if first_newline == -1 or first_newline == len(data) - 1:
+                tail = data
+                continue
+            tail, data = data[:first_newline + 1], data[first_newline + 1:]
+            base = pos + first_newline + 1
+        else:
+            tail, base = b'', 0
+
+        lines = []
+        offset = base
+        for line in data.split(b'\n')[:-1]:
+            lines.append((offset, line + b'\n'))
+            offset += len(line) + 1
+        yield from reversed(lines)
+
+
+def _scan_buffer(buffer: mmap.mmap, prefilter: "Prefilter", start: int = 0,
+                 end: Optional[int] = None,
+                 block_size: int = 4 * 1024 * 1024) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(offset, line)`` for complete lines of a mapped file containing a needle.
+    
+    Only lines between ``start`` and ``end`` (line boundaries) are searched.
+    """
+    end = buffer.rfind(b'\n', start, len(buffer) if end is None else end) + 1  # Complete lines only
+    block_start = start
+    while block_start < end:
+        block_end = buffer.rfind(b'\n', block_start, min(block_start + block_size, end)) + 1
+        if block_end <= block_start:  # A line longer than a block
+            block_end = buffer.find(b'\n', block_start, end) + 1
+        
+        if prefilter.ignore_case:
+            haystack, base = buffer[block_start:block_end].lower(), block_start
+        else:
+            haystack, base = buffer, 0
+        position, limit = block_start - base, block_end - base
+        # Next hit of each needle; a needle is only searched for again once the
+        # scan has moved past its hit, so a rare needle is not searched per line
+        hits = [(haystack.find(needle, position, limit), needle) for needle in prefilter.needles]
+        hits = [(hit, needle) for hit, needle in hits if hit != -1]
+        heapq.heapify(hits)
+        while hits:
+            hit, needle = hits[0]
+            if hit < position:
+                hit = haystack.find(needle, position, limit)
+                if hit == -1:
+                    heapq.heappop(hits)
+                else:
+                    heapq.heapreplace(hits, (hit, needle))
+                continue
+            start = haystack.rfind(b'\n', position, hit) + 1 or position
+            position = haystack.find(b'\n', hit, limit) + 1
+            yield base + start, buffer[base + start:base + position]
+        block_start = block_end
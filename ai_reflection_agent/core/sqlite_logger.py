@@ -0,0 +1,408 @@
+"""SQLite storage backend with the same interface as the JSONL loggers."""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .models import ResponseEntry, ExplorationPrompt
+from .logger import SCORE_FIELDS
+from . import dedup, fastjson
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    model_name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_timestamp ON responses (timestamp);
+CREATE INDEX IF NOT EXISTS idx_responses_model_name ON responses (model_name);
+
+CREATE TABLE IF NOT EXISTS explorations (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    original_entry_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_explorations_timestamp ON explorations (timestamp);
+CREATE INDEX IF NOT EXISTS idx_explorations_original ON explorations (original_entry_id, timestamp);
+"""
+
+
+class _SQLiteStore:
+    """Shared connection handling for the SQLite loggers.
+
+    Each thread gets its own connection. The database runs in WAL mode so the
+    CLI, the WebUI and experiment scripts can read while another process
+    writes.
+    """
+
+    def __init__(self, db_file: str):
+        """Open (and if needed create) the database."""
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+
+class SQLiteResponseLogger(_SQLiteStore):
+    """Stores AI responses in an SQLite database instead of JSONL files."""
+
+    def log_response(self,
+                    prompt: str,
+                    response: str,
+                    model_name: str,
+                    tokens_used: Optional[int] = None,
+                    thinking_process: Optional[str] = None,
+                    full_response: Optional[str] = None,
+                    metadata: Optional[dict] = None) -> str:
+        """Log a prompt-response pair and return the entry ID."""
+        entry = ResponseEntry(
+            id=str(uuid.uuid4()),
+            prompt=prompt,
+            response=response,
+            model_name=model_name,
+            tokens_used=tokens_used,
+            thinking_process=thinking_process,
+            full_response=full_response,
+            metadata=metadata or {}
+        )
+
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO responses (id, timestamp, model_name, data) VALUES (?, ?, ?, ?)",
+            self._row(entry)
+        )
+        batch = getattr(self._local, "batch", None)
+        if batch is None:
+            conn.commit()
+        else:
+            if not batch["count"]:
+                batch["since"] = time.monotonic()
+            batch["count"] += 1
+            if batch["count"] >= batch["max_entries"] or time.monotonic() - batch["since"] >= batch["max_delay"]:
+                self.flush()
+
+        return entry.id
+
+    @contextmanager
+    def buffered(self, max_entries: int = 1000, max_bytes: int = 1024 * 1024,
+                 max_delay: float = 1.0):
+        """Group inserts into one transaction per batch.
+
+        Mirrors ``ResponseLogger.buffered``; ``max_bytes`` is accepted for
+        interface compatibility. Uncommitted rows are visible to this thread's
+        connection, so reads and updates need no explicit flush.
+        """
+        if getattr(self._local, "batch", None) is not None:
+            yield self
+            return
+
+        self._local.batch = {"count": 0, "since": 0.0, "max_entries": max_entries, "max_delay": max_delay}
+        try:
+            yield self
+        finally:
+            try:
+                self.flush()
+            finally:
+                self._local.batch = None
+
+    def flush(self):
+        """Commit inserts buffered by ``buffered()``."""
+        self._connect().commit()
+        batch = getattr(self._local, "batch", None)
+        if batch is not None:
+            batch["count"] = 0
+
+    def update_entry(self, entry_id: str, **updates) -> bool:
+        """Update an existing entry in place."""
+        return bool(self.update_entries({entry_id: updates}))
+
+    def update_entries(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """Update several entries (ID -> field updates) in one transaction.
+
+        Returns the number of entries found; unknown IDs are skipped.
+        """
+        found = 0
+        rows = []
+        for entry_id, fields in updates.items():
+            entry = self.get_entry(entry_id)
+            if not entry:
+                continue
+            found += 1
+            fields = {key: value for key, value in fields.items() if hasattr(entry, key)}
+            if fields:
+                updated = ResponseEntry(**entry.model_copy(update=fields).model_dump())
+                rows.append(self._row(updated)[1:] + (entry_id,))
+
+        if rows:
+            with self._connect() as conn:
+                conn.executemany(
+                    "UPDATE responses SET timestamp = ?, model_name = ?, data = ? WHERE id = ?", rows
+                )
+        return found
+
+    def read_entries(self, lazy: bool = False,
+                     fields: Optional[Iterable[str]] = None,
+                     present: Optional[Iterable[str]] = None) -> Iterator[ResponseEntry]:
+        """Read all entries in insertion order.
+
+        Rows are validated on insert, so ``lazy`` is accepted for interface
+        compatibility only. With ``fields`` and/or ``present``, plain dicts
+        are yielded as by ``ResponseLogger.read_entries``; the keys are
+        extracted inside SQLite so the other fields never reach Python.
+        """
+        if fields is not None or present is not None:
+            yield from self._read_projected(fields, present)
+            return
+
+        cursor = self._connect().execute("SELECT data FROM responses ORDER BY rowid")
+        for (data,) in cursor:
+            entry = self._decode(data)
+            if entry is not None:
+                yield entry
+
+    def _read_projected(self, fields: Optional[Iterable[str]],
+                        present: Optional[Iterable[str]]) -> Iterator[Dict[str, Any]]:
+        """Yield dicts holding only the ``id``, ``fields`` and presence flags."""
+        fields = ["id"] + [field for field in (fields or ()) if field != "id"]
+        present = [field for field in (present or ()) if field not in fields]
+        # A full_response stored as a recipe is rebuilt from its source fields
+        rebuild = "full_response" in fields or "full_response" in present
+        read_fields = fields
+        if rebuild:
+            extra = (dedup.RECIPE_KEY, *dedup.SOURCE_FIELDS, "full_response")
+            read_fields = fields + [field for field in extra if field not in fields]
+        read_present = [field for field in present if field not in read_fields]
+
+        paths = [self._json_path(field) for field in read_fields]
+        # json_extract with several paths returns the values as one JSON array
+        columns = ["json_extract(data, " + ", ".join("?" for _ in paths) + ")"]
+        columns += ["COALESCE(json_type(data, ?), 'null') != 'null'" for _ in read_present]
+        query = f"SELECT {', '.join(columns)} FROM responses ORDER BY rowid"
+        cursor = self._connect().execute(query, paths + [self._json_path(f) for f in read_present])
+        for values, *flags in cursor:
+            decoded = fastjson.loads(values) if len(read_fields) > 1 else [values]
+            data = dict(zip(read_fields, decoded))
+            data.update((field, bool(flag)) for field, flag in zip(read_present, flags))
+            if rebuild:
+                # json_extract gives null for absent keys; only stored values may shadow the recipe
+                data = dedup.expand({key: value for key, value in data.items() if value is not None})
+                projected = {field: data.get(field) for field in fields}
+                projected.update(
+                    (field, data[field] if field in read_present else data.get(field) is not None)
+                    for field in present
+                )
+                data = projected
+            yield data
+
+    @staticmethod
+    def _json_path(field: str) -> str:
+        return '$."' + field.replace('"', '\\"') + '"'
+
+    def get_entry(self, entry_id: str) -> Optional[ResponseEntry]:
+        """Get a specific entry by ID."""
+        row = self._connect().execute(
+            "SELECT data FROM responses WHERE id = ?", (entry_id,)
+        ).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def get_entries(self, entry_ids: Iterable[str]) -> Dict[str, ResponseEntry]:
+        """Get several entries by ID; returns those found, keyed by ID in the order requested."""
+        entry_ids = list(dict.fromkeys(entry_ids))
+        conn = self._connect()
+        found = {}
+        for start in range(0, len(entry_ids), 500):
+            batch = entry_ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            found.update(conn.execute(f"SELECT id, data FROM responses WHERE id IN ({placeholders})", batch))
+        entries = {}
+        for entry_id in entry_ids:
+            entry = self._decode(found[entry_id]) if entry_id in found else None
+            if entry is not None:
+                entries[entry_id] = entry
+        return entries
+
+    def get_recent_entries(self, limit: int = 10) -> List[ResponseEntry]:
+        """Get the most recent entries, newest first."""
+        cursor = self._connect().execute(
+            "SELECT data FROM responses ORDER BY timestamp DESC, rowid DESC LIMIT ?", (limit,)
+        )
+        entries = [self._decode(data) for (data,) in cursor]
+        return [entry for entry in entries if entry is not None]
+
+    def search_entries(self, query: str, field: str = "prompt") -> List[ResponseEntry]:
+        """Search entries by text in a specific field."""
+        if field not in ResponseEntry.model_fields:
+            return []
+
+        results = []
+        query = query.lower()
+        cursor = self._connect().execute(
+            "SELECT data, json_extract(data, ?) FROM responses ORDER BY rowid", (f"$.{field}",)
+        )
+        for data, field_value in cursor:
+            if field == "full_response" and field_value is None:
+                field_value = dedup.expand(fastjson.loads(data)).get(field)
+            if isinstance(field_value, str) and query in field_value.lower():
+                entry = self._decode(data)
+                if entry is not None:
+                    results.append(entry)
+        return results
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Aggregate statistics over all entries, computed by SQLite."""
+        conn = self._connect()
+        total, scored, reflected, revised, *sums = conn.execute(
+            "SELECT COUNT(*), "
+            "COALESCE(SUM(json_type(data, '$.score') = 'object'), 0), "
+            "COALESCE(SUM(COALESCE(json_type(data, '$.reflection'), 'null') != 'null'), 0), "
+            "COALESCE(SUM(COALESCE(json_type(data, '$.revision'), 'null') != 'null'), 0), "
+            + ", ".join(f"SUM(json_extract(data, '$.score.{field}'))" for field in SCORE_FIELDS)
+            + " FROM responses"
+        ).fetchone()
+        models = dict(conn.execute(
+            "SELECT model_name, COUNT(*) FROM responses GROUP BY model_name ORDER BY MIN(rowid)"
+        ))
+        return {
+            "total_entries": total,
+            "scored_entries": scored,
+            "reflected_entries": reflected,
+            "revised_entries": revised,
+            "models": models,
+            "average_scores": {
+                field: (value or 0) / scored for field, value in zip(SCORE_FIELDS, sums)
+            } if scored else {}
+        }
+
+    def compact(self) -> int:
+        """Updates are applied in place, so there is never anything to fold in."""
+        return 0
+
+    @staticmethod
+    def _row(entry: ResponseEntry) -> tuple:
+        return (entry.id, entry.timestamp.isoformat(), entry.model_name, dedup.dump_entry(entry))
+
+    @staticmethod
+    def _decode(data: str) -> Optional[ResponseEntry]:
+        try:
+            return ResponseEntry(**dedup.expand(fastjson.loads(data)))
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"Error parsing entry: {e}")
+            return None
+
+
+class SQLiteExplorationLogger(_SQLiteStore):
+    """Stores exploration prompts in an SQLite database."""
+
+    def log_exploration(self, original_entry_id: str, generated_prompt: str, context: str) -> str:
+        """Log an exploration prompt."""
+        return self.log_explorations([(original_entry_id, generated_prompt, context)])[0]
+
+    def log_explorations(self, explorations: Iterable[Tuple[str, str, str]]) -> List[str]:
+        """Log several exploration prompts in one transaction.
+
+        Each is given as ``(original_entry_id, generated_prompt, context)``;
+        returns their IDs in the same order.
+        """
+        records = [
+            ExplorationPrompt(
+                id=str(uuid.uuid4()),
+                original_entry_id=original_entry_id,
+                generated_prompt=generated_prompt,
+                context=context
+            )
+            for original_entry_id, generated_prompt, context in explorations
+        ]
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO explorations (id, timestamp, original_entry_id, data) VALUES (?, ?, ?, ?)",
+                [self._row(exploration) for exploration in records]
+            )
+
+        return [exploration.id for exploration in records]
+
+    def read_explorations(self) -> Iterator[ExplorationPrompt]:
+        """Read all exploration prompts in insertion order."""
+        cursor = self._connect().execute("SELECT data FROM explorations ORDER BY rowid")
+        for (data,) in cursor:
+            try:
+                yield ExplorationPrompt(**fastjson.loads(data))
+            except (json.JSONDecodeError, ValueError) as e:
+                print(f"Error parsing exploration: {e}")
+                continue
+
+    def get_explorations(self, entry_id: str) -> List[ExplorationPrompt]:
+        """Exploration prompts generated for an entry, oldest first."""
+        cursor = self._connect().execute(
+            "SELECT data FROM explorations WHERE original_entry_id = ? ORDER BY timestamp, rowid",
+            (entry_id,)
+        )
+        explorations = []
+        for (data,) in cursor:
+            try:
+                explorations.append(ExplorationPrompt(**fastjson.loads(data)))
+            except (json.JSONDecodeError, ValueError) as e:
+                print(f"Error parsing exploration: {e}")
+        return explorations
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Exploration counts."""
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM explorations").fetchone()
+        return {"total_explorations": count}
+
+    @staticmethod
+    def _row(exploration: ExplorationPrompt) -> tuple:
+        return (
+            exploration.id,
+            exploration.timestamp.isoformat(),
+            exploration.original_entry_id,
+            exploration.model_dump_json()
+        )
+
+
+def migrate_jsonl_to_sqlite(response_logger, exploration_logger, db_file: str) -> Dict[str, Any]:
+    """Copy every entry and exploration from the JSONL loggers into an SQLite database.
+
+    Pending patch records are merged before copying. Existing rows with the
+    same ID are replaced, so the migration can safely be re-run.
+    """
+    responses = SQLiteResponseLogger(db_file)
+    explorations = SQLiteExplorationLogger(db_file)
+
+    with responses._connect() as conn:
+        cursor = conn.executemany(
+            "INSERT OR REPLACE INTO responses (id, timestamp, model_name, data) VALUES (?, ?, ?, ?)",
+            (SQLiteResponseLogger._row(entry) for entry in response_logger.read_entries())
+        )
+        entry_count = cursor.rowcount
+
+    with explorations._connect() as conn:
+        cursor = conn.executemany(
+            "INSERT OR REPLACE INTO explorations (id, timestamp, original_entry_id, data) VALUES (?, ?, ?, ?)",
+            (SQLiteExplorationLogger._row(e) for e in exploration_logger.read_explorations())
+        )
+        exploration_count = cursor.rowcount
+
+    return {
+        "db_file": str(responses.db_file),
+        "entries": entry_count,
+        "explorations": exploration_count
+    }
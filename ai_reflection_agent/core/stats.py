@@ -0,0 +1,143 @@
+"""Incrementally maintained aggregate statistics for segmented logs."""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from . import fastjson
+from .segments import SegmentedLog
+
+
+Counts = Dict[str, Any]
+
+
+def add_counts(total: Counts, counts: Counts, sign: int = 1) -> Counts:
+    """Add (or with ``sign=-1`` subtract) nested numeric counts into ``total``.
+
+    Counters that drop to zero are removed so subtracting a record's counts
+    leaves no trace of it.
+    """
+    for key, value in counts.items():
+        if isinstance(value, dict):
+            nested = add_counts(total.get(key) or {}, value, sign)
+            if nested:
+                total[key] = nested
+            else:
+                total.pop(key, None)
+        else:
+            result = total.get(key, 0) + sign * value
+            if result:
+                total[key] = result
+            else:
+                total.pop(key, None)
+    return total
+
+
+class StatsCache:
+    """Per-segment aggregate counts of a segmented log, kept in a sidecar file.
+
+    ``describe`` turns one projected record (``fields`` decoded, ``present``
+    as flags) into nested numeric counts; the cache sums them per segment and
+    remembers how far each segment has been read. On the next call only the
+    lines appended since then are read, so an unchanged log costs a few
+    ``stat`` calls and a grown one costs time proportional to the new data.
+    A segment whose file was rewritten (compaction, compression, repair; see
+    ``SegmentedLog.generation``) or that shrank is recounted from the start. ``project`` decodes a line into the
+    projected record (``fastjson.project`` by default).
+    """
+
+    def __init__(self, log: SegmentedLog, cache_file: Path,
+                 describe: Callable[[Dict[str, Any]], Counts],
+                 fields: Iterable[str] = (), present: Iterable[str] = (),
+                 project: Callable[..., Dict[str, Any]] = fastjson.project):
+        """Initialize the cache for a log and a per-record count function."""
+        self.log = log
+        self.cache_file = Path(cache_file)
+        self.describe = describe
+        self.fields = list(fields)
+        self.present = list(present)
+        self.project = project
+
+    def totals(self, overlay: Optional[Callable[[], Counts]] = None,
+               overlay_key: Any = None) -> Counts:
+        """Return the summed counts over all segments.
+
+        ``overlay`` computes an adjustment added on top of the segment
+        counts (e.g. for pending patches). Its result is cached under
+        ``overlay_key`` and recomputed only when the key changes or a segment
+        had to be recounted. The key must be JSON-serializable.
+        """
+        overlay_key = json.loads(json.dumps(overlay_key))
+        cache = self._load()
+        cached_segments = cache.get("segments", {})
+        segments = {}
+        recounted = False
+
+        for number in self.log.segment_numbers():
+            path = self.log.path_for(number)
+            if not path.exists():
+                continue
+            generation = self.log.generation(number)
+            size = self.log.segment_size(number)
+            record = cached_segments.get(str(number))
+            if record is None or record.get("generation") != generation or record["position"] > size:
+                record = {"generation": generation, "position": 0, "counts": {}}
+                recounted = True
+            if record["position"] < size:
+                record = self._count(number, record)
+            segments[str(number)] = record
+
+        recounted = recounted or bool(set(cached_segments) - set(segments))
+        total: Counts = {}
+        for record in segments.values():
+            add_counts(total, record["counts"])
+
+        cached_overlay = cache.get("overlay")
+        if overlay is not None:
+            if recounted or not cached_overlay or cached_overlay["key"] != overlay_key:
+                cached_overlay = {"key": overlay_key, "counts": overlay()}
+            add_counts(total, cached_overlay["counts"])
+
+        updated = {"segments": segments, "overlay": cached_overlay}
+        if updated != cache:
+            self._save(updated)
+        return total
+
+    def clear(self):
+        """Drop the cache so the next call recounts everything."""
+        self.cache_file.unlink(missing_ok=True)
+
+    def _count(self, number: int, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the counts of lines appended to a segment since ``record``."""
+        counts = add_counts({}, record["counts"])
+        position = record["position"]
+        for offset, line in self.log.iter_segment(number, position):
+            position = offset + len(line)
+            if not line.strip():
+                continue
+            try:
+                data = self.project(line, self.fields, self.present)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            add_counts(counts, self.describe(data))
+        return {"generation": record["generation"], "position": position, "counts": counts}
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, 'rb') as f:
+                return fastjson.loads(f.read())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, cache: Dict[str, Any]):
+        # Saved without the log lock, so concurrent savers need their own temp files
+        tmp_file = self.cache_file.with_name(
+            f"{self.cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        tmp_file.replace(self.cache_file)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark compressed and chunk-deduplicated log storage against plain JSONL.
+
+Builds a response log from the recursive consciousness experiments in
+experiments/data/ (thinking, response and the raw full_response of every
+level, repeated ``--copies`` times), seals it into segments stored plain,
+gzip- and zstd-compressed, each with and without ``chunk_text`` (long text
+in the ``.blobs`` chunk store), and reports bytes on disk (including the
+chunk store) and full-scan throughput for each.
+
+Usage:
+    python benchmarks/bench_compression.py --copies 200
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_reflection_agent.core import compression
+from ai_reflection_agent.core.logger import ResponseLogger
+
+DATA_DIR = Path(__file__).parent.parent / "experiments" / "data"
+
+
+def load_levels():
+    """All experiment levels from experiments/data/."""
+    levels = []
+    for path in sorted(DATA_DIR.glob("consciousness_experiment_consciousness_exp_*.json")):
+        with open(path, 'r', encoding='utf-8') as f:
+            experiment = json.load(f)
+        for level in experiment.get("levels", []):
+            levels.append((experiment.get("model", "qwen3"), level))
+    return levels
+
+
+def build_log(log_file: Path, levels, copies: int, codec, chunk_text: bool):
+    """Log every level ``copies`` times and seal the log into segments."""
+    logger = ResponseLogger(log_file, max_segment_bytes=8 * 1024 * 1024,
+                            compression=codec, chunk_text=chunk_text)
+    with logger.buffered():
+        for _ in range(copies):
+            for model, level in levels:
+                thinking = level.get("thinking") or ""
+                response = level.get("response") or ""
+                logger.log_response(
+                    prompt=level.get("prompt") or "",
+                    response=response,
+                    model_name=model,
+                    thinking_process=thinking,
+                    # Raw thinking-model output as stored by the LM Studio backend
+                    full_response=f"<think>{thinking}</think>\n\n{response}",
+                    metadata={"type": "consciousness_exploration", "level": level.get("level")}
+                )
+    logger.rotate()
+    # A fresh logger, so nothing is served from the writer's chunk cache
+    return ResponseLogger(log_file)
+
+
+def measure(label: str, logger: ResponseLogger, baseline_bytes=None):
+    size = sum(p.stat().st_size for p in logger.segments.files() if p != logger.segments.manifest_file)
+    if logger.blobs.exists():
+        size += logger.blobs.blob_file.stat().st_size
+
+    start = time.perf_counter()
+    count = sum(1 for _ in logger.read_entries(lazy=True))
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sum(1 for _ in logger.read_records(fields=["model_name", "timestamp"]))
+    projected = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sum(len(entry.prompt) for entry in logger.read_entries(lazy=True))
+    prompts = time.perf_counter() - start
+
+    ratio = f"{baseline_bytes / size:5.1f}x" if baseline_bytes else "  1.0x"
+    print(f"{label:<14} {size / 1024 / 1024:9.2f} MB {ratio} "
+          f"{count / elapsed:>10,.0f} entries/sec {count / projected:>10,.0f} projected/sec "
+          f"{count / prompts:>10,.0f} prompts/sec")
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--copies', type=int, default=200, help='Times each experiment level is logged')
+    args = parser.parse_args()
+
+    levels = load_levels()
+    codecs = [None, "gzip"] + (["zstd"] if compression.ZSTD_AVAILABLE else [])
+    print(f"{len(levels)} experiment levels x {args.copies} copies "
+          f"(zstandard available: {compression.ZSTD_AVAILABLE})\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = None
+        for chunk_text in (False, True):
+            for codec in codecs:
+                label = (codec or "plain") + (" + chunks" if chunk_text else "")
+                log_file = Path(tmp) / label.replace(" + ", "_") / "responses.jsonl"
+                logger = build_log(log_file, levels, args.copies, codec, chunk_text)
+                size = measure(label, logger, baseline)
+                baseline = baseline or size
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark full scans of a response log.
+
+Generates a synthetic responses.jsonl and measures entries/sec for:
+- the original read path (json.loads + full ResponseEntry validation)
+- orjson decoding with full validation
+- stdlib json with lazy (unvalidated) construction
+- orjson with lazy construction (ResponseLogger.read_entries(lazy=True))
+- field projection of the stats fields (read_entries(fields=[...]))
+- an unindexed search_entries and a model filter, with and without the
+  byte-level prefilter over memory-mapped segments
+- a one-hour date filter, with and without the sparse time index (the
+  first indexed run builds the index)
+
+Usage:
+    python benchmarks/bench_log_scan.py --entries 1000000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_reflection_agent.core import fastjson, prefilter
+from ai_reflection_agent.core.logger import ResponseLogger
+from ai_reflection_agent.core.models import ResponseEntry, LazyResponseEntry
+
+
+def generate_log(path: Path, count: int, text_size: int):
+    """Write ``count`` synthetic entries, a third of them scored."""
+    start = datetime(2025, 1, 1)
+    filler = ("lorem ipsum dolor sit amet " * (text_size // 27 + 1))[:text_size]
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            record = {
+                "id": str(uuid.uuid4()),
+                "timestamp": (start + timedelta(seconds=i)).isoformat(),
+                "prompt": f"Prompt {i}: {filler}",
+                "response": f"Response {i}: {filler}",
+                "model_name": f"model-{i % 5}",
+                "tokens_used": 100 + i % 50,
+                "score": {"clarity": 7.5, "usefulness": 8.0, "alignment": 6.5, "creativity": None} if i % 3 == 0 else None,
+                "reflection": None,
+                "revision": None,
+                "thinking_process": None,
+                "full_response": None,
+                "metadata": {"type": "benchmark"}
+            }
+            f.write(json.dumps(record) + '\n')
+
+
+def scan_original(path: Path) -> int:
+    """The read path before the fast path existed."""
+    count = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                ResponseEntry(**json.loads(line))
+                count += 1
+    return count
+
+
+def scan_validated(log: ResponseLogger) -> int:
+    return sum(1 for _ in log.read_entries())
+
+
+def scan_lazy(log: ResponseLogger) -> int:
+    return sum(1 for _ in log.read_entries(lazy=True))
+
+
+def stats_lazy(log: ResponseLogger) -> int:
+    """A stats-style scan that touches model_name and score on each entry."""
+    count = 0
+    for entry in log.read_entries(lazy=True):
+        entry.model_name
+        if entry.score:
+            entry.score.clarity
+        count += 1
+    return count
+
+
+def stats_projected(log: ResponseLogger) -> int:
+    """The same stats scan, decoding only model_name and score."""
+    count = 0
+    for data in log.read_entries(fields=["model_name", "score"], present=["reflection"]):
+        data["model_name"]
+        if data["score"]:
+            data["score"]["clarity"]
+        count += 1
+    return count
+
+
+def search_unfiltered(log: ResponseLogger, query: str, total: int) -> int:
+    """search_entries on a log without a search index, decoding every line."""
+    [e for e in log.read_entries(lazy=True) if query.lower() in e.prompt.lower()]
+    return total
+
+
+def search_prefiltered(log: ResponseLogger, query: str, total: int) -> int:
+    """The same search, skipping lines without the query before decoding."""
+    log.search_entries(query, "prompt")
+    return total
+
+
+def model_unfiltered(log: ResponseLogger, model: str, total: int) -> int:
+    """A FileManager-style model filter, decoding every line."""
+    [r for r in log.read_records(fields=["model_name"]) if r["model_name"] == model]
+    return total
+
+
+def model_prefiltered(log: ResponseLogger, model: str, total: int) -> int:
+    """The same filter with a model_name prefilter."""
+    match = [prefilter.field_value("model_name", model)]
+    [r for r in log.read_records(fields=["model_name"], match=match) if r["model_name"] == model]
+    return total
+
+
+def date_unfiltered(log: ResponseLogger, since: str, until: str, total: int) -> int:
+    """A FileManager-style date filter, decoding every line."""
+    [r for r in log.read_records(fields=["timestamp"]) if since <= r["timestamp"] <= until]
+    return total
+
+
+def date_indexed(log: ResponseLogger, since: str, until: str, total: int) -> int:
+    """The same filter, decoding only the time index blocks inside the window."""
+    records = log.read_records(fields=["timestamp"], since=since, until=until)
+    [r for r in records if since <= r["timestamp"] <= until]
+    return total
+
+
+def scan_json_lazy(path: Path) -> int:
+    count = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                LazyResponseEntry(json.loads(line))
+                count += 1
+    return count
+
+
+def timed(label: str, func, *args):
+    start = time.perf_counter()
+    count = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {count:>9} entries {elapsed:8.2f}s {count / elapsed:>12,.0f} entries/sec")
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--entries', type=int, default=1_000_000, help='Number of log entries')
+    parser.add_argument('--text-size', type=int, default=200, help='Characters per prompt/response')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "responses.jsonl"
+        print(f"Generating {args.entries:,} entries...")
+        generate_log(path, args.entries, args.text_size)
+        print(f"Log size: {path.stat().st_size / 1024 / 1024:.1f} MB (orjson available: {fastjson.ORJSON_AVAILABLE})\n")
+
+        log = ResponseLogger(path, max_segment_bytes=None)
+        baseline = timed("json + validation (original)", scan_original, path)
+        timed("fastjson + validation", scan_validated, log)
+        timed("json + lazy construction", scan_json_lazy, path)
+        fast = timed("fastjson + lazy (read_entries)", scan_lazy, log)
+        timed("fastjson + lazy, stats fields", stats_lazy, log)
+        timed("projection, stats fields", stats_projected, log)
+        query = f"Prompt {args.entries // 2}:"
+        timed("search, no prefilter", search_unfiltered, log, query, args.entries)
+        timed("search, prefiltered", search_prefiltered, log, query, args.entries)
+        timed("model filter, no prefilter", model_unfiltered, log, "model-3", args.entries)
+        timed("model filter, prefiltered", model_prefiltered, log, "model-3", args.entries)
+        middle = datetime(2025, 1, 1) + timedelta(seconds=args.entries // 2)
+        window = (middle.isoformat(), (middle + timedelta(hours=1)).isoformat(), args.entries)
+        timed("date filter, no index", date_unfiltered, log, *window)
+        timed("date filter, building index", date_indexed, log, *window)
+        timed("date filter, time index", date_indexed, log, *window)
+        print(f"\nSpeedup of lazy fast path over original: {fast / baseline:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -41,7 +41,7 @@ def safe_print(text, label=""):
 
 # Initialize logging system
 print("[INIT] Initializing logging system...")
-logger = ResponseLogger("consciousness_exploration.jsonl")
+logger = ResponseLogger("consciousness_exploration.jsonl", chunk_text=True)
 print("[OK] Logger initialized")
 
 print("[INIT] Creating backend adapter...")
@@ -26,7 +26,7 @@ from colored_print import log
 import json
 
 # Initialize logging system
-logger = ResponseLogger("responses.jsonl")
+logger = ResponseLogger("responses.jsonl", chunk_text=True)
 
 backend = BackendFactory.create_adapter(
     "lmstudio",
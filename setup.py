@@ -13,6 +13,11 @@ setup(
         "python-dateutil>=2.8.0",
         "requests>=2.28.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.0.0"],
+        "zstd": ["zstandard>=0.20.0"],
+        "parquet": ["pyarrow>=10.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "ai-reflect=ai_reflection_agent.cli:main",
@@ -2,7 +2,7 @@
 
 import gradio as gr
 import asyncio
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 
 from ai_reflection_agent.backends.factory import BackendFactory
 from ..scripts.consciousness_scripts.default import DefaultConsciousnessScript
@@ -228,8 +228,12 @@ class ConsciousnessExperimentComponent:
         is_thinking_model: bool,
         base_prompt: str,
         final_question: str
-    ) -> tuple[str, str, str, str, dict]:
-        """Start the consciousness exploration experiment."""
+    ) -> AsyncIterator[tuple[str, str, str, str, dict]]:
+        """Start the consciousness exploration experiment.
+        
+        Yields the outputs repeatedly while the experiment runs, so thinking
+        and responses appear as the model streams them.
+        """
         
         try:
             # Ensure backend is connected
@@ -238,13 +242,14 @@ class ConsciousnessExperimentComponent:
                     backend_type, model_name, endpoint_url, api_key, is_thinking_model
                 )
                 if "❌" in connection_result:
-                    return (
+                    yield (
                         f"Backend connection failed: {connection_result}",
                         "",
                         "",
                         "",
                         {}
                     )
+                    return
             
             # Create and configure script
             script = DefaultConsciousnessScript()
@@ -262,30 +267,49 @@ class ConsciousnessExperimentComponent:
             
             script.set_progress_callback(progress_callback)
             
-            # Run experiment
-            results = await script.run_experiment(self.current_backend)
+            # Text of the levels as it streams in: index -> {"thinking": [...], "response": [...]}
+            streamed: Dict[int, Dict[str, List[str]]] = {}
             
-            # Compile outputs
-            thinking_parts = []
-            response_parts = []
+            def stream_callback(step_index: int, kind: str, text: str):
+                streamed.setdefault(step_index, {"thinking": [], "response": []})[kind].append(text)
             
-            for i, result in enumerate(results):
-                if result.success:
-                    thinking_parts.append(f"=== LEVEL {i}: {result.step.name.upper()} ===\n{result.thinking}\n")
-                    response_parts.append(f"=== LEVEL {i}: {result.step.name.upper()} ===\n{result.response}\n")
-                else:
-                    thinking_parts.append(f"=== LEVEL {i}: FAILED ===\nError: {result.error}\n")
-                    response_parts.append(f"=== LEVEL {i}: FAILED ===\nError: {result.error}\n")
+            script.set_stream_callback(stream_callback)
+            
+            def render(kind: str) -> str:
+                parts = []
+                for i, step in enumerate(script.steps):
+                    if i < len(script.results):
+                        result = script.results[i]
+                        if result.success:
+                            parts.append(f"=== LEVEL {i}: {result.step.name.upper()} ===\n{getattr(result, kind)}\n")
+                        else:
+                            parts.append(f"=== LEVEL {i}: FAILED ===\nError: {result.error}\n")
+                    elif i in streamed:
+                        parts.append(f"=== LEVEL {i}: {step.name.upper()} ===\n{''.join(streamed[i][kind])}\n")
+                return "\n".join(parts)
+            
+            # Run experiment, refreshing the outputs while it streams
+            task = asyncio.create_task(script.run_experiment(self.current_backend))
+            while not task.done():
+                await asyncio.wait({task}, timeout=0.25)
+                yield (
+                    f"⏳ Running: {len(script.results)}/{len(script.steps)} steps",
+                    progress_log,
+                    render("thinking"),
+                    render("response"),
+                    {}
+                )
+            task.result()
             
-            thinking_output = "\n".join(thinking_parts)
-            response_output = "\n".join(response_parts)
+            thinking_output = render("thinking")
+            response_output = render("response")
             
             # Get analysis
             analysis = script.get_summary()
             
             status = f"✅ Experiment completed: {analysis['completed_steps']}/{analysis['total_steps']} steps"
             
-            return (
+            yield (
                 status,
                 progress_log,
                 thinking_output,
@@ -294,7 +318,7 @@ class ConsciousnessExperimentComponent:
             )
             
         except Exception as e:
-            return (
+            yield (
                 f"❌ Experiment failed: {str(e)}",
                 f"Error: {str(e)}",
                 "",
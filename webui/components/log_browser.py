@@ -1,12 +1,23 @@
-"""Log browser component - placeholder for future implementation."""
+"""Log browser component for searching and inspecting logged responses."""
 
 import gradio as gr
 from typing import List, Dict, Any
 
+from ..utils.file_manager import file_manager
+
 
 class LogBrowserComponent:
     """Component for browsing and analyzing logged responses."""
     
+    # Maps the "Search In" choices to entry fields (None = default text fields)
+    SEARCH_FIELDS = {
+        "All Fields": None,
+        "Prompt": ["prompt"],
+        "Response": ["response"],
+        "Thinking": ["thinking_process"],
+        "Model": ["model_name"]
+    }
+    
     def create_interface(self) -> gr.Interface:
         """Create the Gradio interface for log browsing."""
         
@@ -147,16 +158,39 @@ class LogBrowserComponent:
         model: str, 
         exp_type: str
     ) -> tuple[str, List[List[str]]]:
-        """Search logs - placeholder implementation."""
+        """Search logs using the full-text index where available."""
         
-        # Placeholder data
-        sample_data = [
-            ["abc123", "2024-01-15 10:30", "qwen3", "consciousness", "A man was walking...", "The man's experience raises..."],
-            ["def456", "2024-01-15 11:45", "claude-3", "single_prompt", "What is consciousness?", "Consciousness is a complex..."],
-            ["ghi789", "2024-01-16 09:15", "qwen3", "consciousness", "Reality and imagination...", "This philosophical question..."]
-        ]
+        filters = {
+            'model': model,
+            'experiment_type': exp_type
+        }
+        if query:
+            filters['search_query'] = query
+            filters['search_fields'] = self.SEARCH_FIELDS.get(field)
+        if date_from:
+            filters['date_from'] = date_from
+        if date_to:
+            filters['date_to'] = date_to
+        
+        entries = file_manager.load_log_entries(
+            filters=filters,
+            fields=['timestamp', 'model_name', 'metadata', 'prompt', 'response']
+        )
+        
+        rows = []
+        for entry in entries:
+            prompt = entry.get('prompt') or ''
+            response = entry.get('response') or ''
+            rows.append([
+                entry.get('id', ''),
+                str(entry.get('timestamp', ''))[:16].replace('T', ' '),
+                entry.get('model_name', ''),
+                (entry.get('metadata') or {}).get('type', ''),
+                prompt[:40] + "..." if len(prompt) > 40 else prompt,
+                response[:40] + "..." if len(response) > 40 else response
+            ])
         
-        return f"Found {len(sample_data)} entries (placeholder data)", sample_data
+        return f"Found {len(rows)} entries", rows
     
     def _load_entry_details(self, entry_id: str) -> tuple[str, str, str, dict]:
         """Load entry details - placeholder implementation."""
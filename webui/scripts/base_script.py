@@ -1,10 +1,12 @@
 """Base classes for experiment scripts."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
+from ai_reflection_agent.backends.streaming import collect
+
 
 @dataclass
 class ScriptConfig:
@@ -61,6 +63,7 @@ class BaseExperimentScript(ABC):
         self.steps = self.define_steps()
         self.results: List[ExperimentResult] = []
         self.progress_callback: Optional[Callable] = None
+        self.stream_callback: Optional[Callable] = None
         
     @abstractmethod
     def get_config(self) -> ScriptConfig:
@@ -81,6 +84,32 @@ class BaseExperimentScript(ABC):
         if self.progress_callback:
             self.progress_callback(current_step, len(self.steps), message)
             
+    def set_stream_callback(self, callback: Callable[[int, str, str], None]):
+        """Set callback for generated text as it arrives: (step_index, kind, text)
+        
+        ``kind`` is "thinking" or "response".
+        """
+        self.stream_callback = callback
+        
+    async def generate(self, step: ExperimentStep, prompt: str, backend) -> Tuple[str, str]:
+        """Generate the thinking and response for a step's prompt.
+        
+        With a stream callback set, the response is streamed and each piece
+        of text is passed to the callback as it arrives.
+        """
+        if self.stream_callback and hasattr(backend, 'astream_response'):
+            step_index = self.steps.index(step)
+            chunks = []
+            async for chunk in backend.astream_response(prompt):
+                chunks.append(chunk)
+                self.stream_callback(step_index, chunk.kind, chunk.text)
+            result_data = collect(chunks)
+        elif hasattr(backend, 'generate_with_thinking'):
+            result_data = backend.generate_with_thinking(prompt)
+        else:
+            return "", backend.generate_response(prompt)
+        return result_data.get('thinking', ''), result_data.get('response', '')
+            
     def format_prompt(self, template: str, context: Dict[str, Any]) -> str:
         """Format a prompt template with context variables."""
         try:
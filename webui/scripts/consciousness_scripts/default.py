@@ -155,14 +155,7 @@ Consider: Through this exploration, have you discovered something about the natu
             formatted_prompt = self.format_prompt(step.prompt_template, context)
             
             # Generate response using thinking model
-            if hasattr(backend, 'generate_with_thinking'):
-                result_data = backend.generate_with_thinking(formatted_prompt)
-                thinking = result_data.get('thinking', '')
-                response = result_data.get('response', '')
-            else:
-                # Fallback for non-thinking models
-                response = backend.generate(formatted_prompt)
-                thinking = ""
+            thinking, response = await self.generate(step, formatted_prompt, backend)
             
             duration = time.time() - start_time
             
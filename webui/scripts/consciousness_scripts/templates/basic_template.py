@@ -54,13 +54,7 @@ class BasicConsciousnessTemplate(BaseExperimentScript):
         try:
             formatted_prompt = self.format_prompt(step.prompt_template, context)
             
-            if hasattr(backend, 'generate_with_thinking'):
-                result_data = backend.generate_with_thinking(formatted_prompt)
-                thinking = result_data.get('thinking', '')
-                response = result_data.get('response', '')
-            else:
-                response = backend.generate(formatted_prompt)
-                thinking = ""
+            thinking, response = await self.generate(step, formatted_prompt, backend)
             
             duration = time.time() - start_time
             
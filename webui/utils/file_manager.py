@@ -7,6 +7,11 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 import os
 
+from ai_reflection_agent.core import compression, dedup, export, fastjson, prefilter
+from ai_reflection_agent.core.blobs import BlobStore
+from ai_reflection_agent.core.logger import ResponseLogger
+from ai_reflection_agent.core.segments import SegmentedLog
+
 
 class FileManager:
     """Handles file operations for the WebUI."""
@@ -79,36 +84,90 @@ class FileManager:
     def load_log_entries(
         self,
         log_file: str = "consciousness_exploration.jsonl",
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
-        """Load and filter log entries."""
+        """Load and filter log entries.
+        
+        With ``fields``, each returned entry holds only its ``id`` and those
+        keys, and the other fields are dropped while reading instead of being
+        kept in memory for every entry. Logs whose segments are compressed are
+        read transparently, and ``log_file`` may also name a standalone
+        ``.jsonl.gz`` or ``.jsonl.zst`` file.
+        """
         
         log_path = self.base_dir / log_file
-        if not log_path.exists():
-            return []
+        
+        # Filters and sorting need their own fields even if the caller did not ask for them
+        read_fields = None
+        if fields is not None:
+            read_fields = ['timestamp', *fields, *self._filter_fields(filters)]
+        
+        # Prefilters that rule out most non-matching lines before they are decoded
+        match = self._filter_prefilters(filters)
+        
+        if compression.codec_for(log_path):
+            if not log_path.exists():
+                return []
+            records = self._read_compressed_records(log_path, read_fields, match)
+        else:
+            logger = ResponseLogger(log_path)
+            if not logger.segments.files():
+                return []
+            
+            # Narrow text searches down to index candidates when the log has a search index
+            candidate_ids = None
+            search_query = (filters or {}).get('search_query')
+            if search_query:
+                candidate_ids = logger.find_entry_ids(search_query, self._search_fields(filters))
+            # Date filters only decode the blocks of the time index inside the window
+            records = logger.read_records(
+                candidate_ids, fields=read_fields, match=match,
+                since=(filters or {}).get('date_from') or None,
+                until=(filters or {}).get('date_to') or None
+            )
         
         entries = []
         
         try:
-            with open(log_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            entry = json.loads(line)
-                            if self._matches_filters(entry, filters):
-                                entries.append(entry)
-                        except json.JSONDecodeError:
-                            continue  # Skip malformed lines
+            for entry in records:
+                if self._matches_filters(entry, filters):
+                    entries.append(entry)
         
         except Exception as e:
             print(f"Error loading log entries: {e}")
             return []
         
         # Sort by timestamp (newest first)
-        entries.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+        entries.sort(key=lambda x: x.get('timestamp') or '', reverse=True)
+        
+        if fields is not None:
+            keep = {'id', *fields}
+            entries = [{k: v for k, v in entry.items() if k in keep} for entry in entries]
         return entries
     
+    def _read_compressed_records(self, log_path: Path, fields: Optional[List[str]], match=()):
+        """Stream entries from a standalone compressed JSONL file.
+        
+        Chunked text is read from the blob store of the uncompressed log
+        name (``responses.jsonl.blobs`` for ``responses.jsonl.gz``) if there
+        is one; lines that cannot be decoded or rebuilt are skipped.
+        """
+        
+        blob_file = log_path.with_suffix('.blobs') if log_path.suffix else None
+        blobs = BlobStore(blob_file) if blob_file and blob_file.exists() else None
+        with compression.open_file(log_path) as f:
+            for line in f:
+                if not line.strip() or not all(p.matches(line) for p in match):
+                    continue
+                try:
+                    if fields is None:
+                        yield dedup.expand(fastjson.loads(line), blobs)
+                    else:
+                        yield dedup.project(line, ['id', *fields], blobs=blobs)
+                except (json.JSONDecodeError, UnicodeDecodeError, ValueError):
+                    continue
+    
     def get_entry_by_id(self, entry_id: str, log_file: str = "consciousness_exploration.jsonl") -> Optional[Dict[str, Any]]:
         """Get a specific entry by ID."""
         
@@ -119,6 +178,27 @@ class FileManager:
         
         return None
     
+    def export_log(
+        self,
+        log_file: str = "consciousness_exploration.jsonl",
+        format_type: str = "parquet",
+        append: bool = False
+    ) -> str:
+        """Export a log to a columnar dataset under ``exports/`` for analytics.
+        
+        With ``append``, only entries logged since the previous export are
+        added. Returns the dataset directory (load it with
+        ``pandas.read_parquet``).
+        """
+        
+        if format_type.lower() != "parquet":
+            raise ValueError(f"Unsupported export format: {format_type}")
+        
+        log_path = self.base_dir / log_file
+        target = self.base_dir / "exports" / f"{log_path.name.split('.')[0]}.parquet"
+        export.export_parquet(ResponseLogger(log_path), target, append=append)
+        return str(target)
+    
     def backup_logs(self, backup_name: Optional[str] = None) -> str:
         """Create a backup of current logs."""
         
@@ -137,11 +217,15 @@ class FileManager:
         
         copied_files = []
         for log_file in log_files:
-            source_path = self.base_dir / log_file
-            if source_path.exists():
-                dest_path = backup_dir / log_file
+            # Include sealed segments and the manifest of segmented logs, and
+            # the text chunks of logs written with chunk_text=True
+            log_path = self.base_dir / log_file
+            blob_file = log_path.with_name(log_path.name + ".blobs")
+            source_paths = SegmentedLog(log_path).files() + ([blob_file] if blob_file.exists() else [])
+            for source_path in source_paths:
+                dest_path = backup_dir / source_path.name
                 dest_path.write_bytes(source_path.read_bytes())
-                copied_files.append(log_file)
+                copied_files.append(source_path.name)
         
         # Create backup info file
         backup_info = {
@@ -181,12 +265,12 @@ class FileManager:
         
         for key, value in filters.items():
             if key == 'date_from':
-                entry_date = entry.get('timestamp', '')
+                entry_date = entry.get('timestamp') or ''
                 if entry_date < value:
                     return False
             
             elif key == 'date_to':
-                entry_date = entry.get('timestamp', '')
+                entry_date = entry.get('timestamp') or ''
                 if entry_date > value:
                     return False
             
@@ -196,17 +280,15 @@ class FileManager:
             
             elif key == 'experiment_type':
                 if value != "All Types":
-                    entry_type = entry.get('metadata', {}).get('type', '')
+                    entry_type = (entry.get('metadata') or {}).get('type', '')
                     if entry_type != value:
                         return False
             
             elif key == 'search_query' and value:
-                # Search in prompt, response, and thinking
+                # Search in prompt, response, and thinking unless fields are given
                 search_text = value.lower()
                 searchable_fields = [
-                    entry.get('prompt', ''),
-                    entry.get('response', ''),
-                    entry.get('thinking_process', '')
+                    entry.get(field) or '' for field in self._search_fields(filters)
                 ]
                 
                 if not any(search_text in field.lower() for field in searchable_fields):
@@ -214,10 +296,42 @@ class FileManager:
         
         return True
     
+    def _filter_fields(self, filters: Optional[Dict[str, Any]]) -> List[str]:
+        """Entry fields the given filters look at."""
+        
+        needed = []
+        for key, value in (filters or {}).items():
+            if key == 'model':
+                needed.append('model_name')
+            elif key == 'experiment_type':
+                needed.append('metadata')
+            elif key == 'search_query' and value:
+                needed.extend(self._search_fields(filters))
+        return needed
+    
+    def _filter_prefilters(self, filters: Optional[Dict[str, Any]]) -> List:
+        """Prefilters (see ``prefilter``) that every line matching the filters matches."""
+        
+        prefilters = []
+        for key, value in (filters or {}).items():
+            if key == 'model' and value and value != "All Models":
+                prefilters.append(prefilter.field_value('model_name', value))
+            elif key == 'experiment_type' and value and value != "All Types":
+                prefilters.append(prefilter.field_value('type', value))
+            elif key == 'search_query' and value:
+                prefilters.append(prefilter.text(value))
+        return [p for p in prefilters if p is not None]
+    
+    def _search_fields(self, filters: Optional[Dict[str, Any]]) -> List[str]:
+        """Fields a search query applies to."""
+        return (filters or {}).get('search_fields') or ['prompt', 'response', 'thinking_process']
+    
     def get_log_statistics(self, log_file: str = "consciousness_exploration.jsonl") -> Dict[str, Any]:
         """Get statistics about log entries."""
         
-        entries = self.load_log_entries(log_file)
+        entries = self.load_log_entries(
+            log_file, fields=['model_name', 'metadata', 'thinking_process', 'response']
+        )
         
         if not entries:
             return {"total_entries": 0}
@@ -231,11 +345,11 @@ class FileManager:
         
         for entry in entries:
             # Model statistics
-            model = entry.get('model_name', 'unknown')
+            model = entry.get('model_name') or 'unknown'
             models[model] = models.get(model, 0) + 1
             
             # Experiment type statistics
-            exp_type = entry.get('metadata', {}).get('type', 'unknown')
+            exp_type = (entry.get('metadata') or {}).get('type', 'unknown')
             experiment_types[exp_type] = experiment_types.get(exp_type, 0) + 1
             
             # Character counts